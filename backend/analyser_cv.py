@@ -1,52 +1,292 @@
 """
 Script pour extraire les informations d'un CV
+
+Utilisé en ligne de commande, il retraite un dossier complet de CV (PDF et DOCX)
+avec le pipeline de l'API (lecture, extraction, structuration + spaCy). Chaque
+processus reçoit des lots de CV dont le passage spaCy est groupé (nlp.pipe) :
+
+    python analyser_cv.py [data/input] [-o data/output/batch] [-j 8] [--shard-size 1000] [--batch-size 16]
+
+Les résultats sont écrits en JSONL (un CV par ligne, éventuellement en plusieurs
+fichiers). Chaque CV traité est noté dans manifest.jsonl : une exécution
+interrompue reprend là où elle s'était arrêtée.
 """
 import os
+import sys
 import json
+import time
+import argparse
+from pathlib import Path
 from docx import Document
-from extractors.extracteur import extraire_dates, extraire_email, extraire_telephone, extraire_adresse
+# extraire_infos_cv est partagée avec l'API (importée ici pour les scripts existants)
+from extractors.extracteur import extraire_infos_cv
+from extractors.cv_context import AnalysisContext
+
+EXTENSIONS_CV = (".pdf", ".docx")
+
 
 def lire_cv_docx(chemin_fichier):
     """Lit le contenu d'un fichier .docx"""
     doc = Document(chemin_fichier)
     return "\n".join([paragraph.text for paragraph in doc.paragraphs])
 
-def extraire_infos_cv(texte_cv):
-    """Retourne les données brutes extraites d'un texte de CV."""
-    return {
-        "dates": extraire_dates(texte_cv),
-        "emails": extraire_email(texte_cv),
-        "telephones": extraire_telephone(texte_cv),
-        "adresses": extraire_adresse(texte_cv)
-    }
 
+# =============================================================================
+# TRAITEMENT D'UN LOT DE CV (exécuté dans les workers)
+# =============================================================================
+
+# CV envoyés ensemble à un worker : leur passage spaCy est groupé (nlp.pipe)
+TAILLE_LOT = int(os.environ.get("CV_CLI_BATCH_SIZE", "16"))
+
+
+def analyser_fichier_cv(chemin):
+    """
+    Pipeline complet d'un CV, identique à process_cv() de l'API (sans sauvegarde).
+    Retourne (chemin, résultat, erreur, durées par étape en secondes).
+    """
+    return analyser_lot_cv([chemin])[0]
+
+
+def analyser_lot_cv(chemins):
+    """
+    Pipeline complet d'une liste de CV : lecture et extraction CV par CV, puis
+    structuration de tout le lot avec un seul passage spaCy groupé
+    (build_structured_json_batch). Retourne, dans l'ordre des chemins,
+    (chemin, résultat, erreur, durées par étape en secondes) ; les durées du
+    passage groupé sont réparties entre les CV du lot.
+    """
+    # Imports tardifs : extraire_infos_cv() reste utilisable sans spaCy
+    from extractors.document_reader import lire_document
+    from extractors.section_classifier import build_structured_json, build_structured_json_batch
+    from extractors.tracing import stage, start_trace
+
+    sorties = {}
+    lot = []
+    for chemin in chemins:
+        with start_trace() as trace:
+            try:
+                with stage("lecture"):
+                    texte_cv = lire_document(chemin)
+
+                # Un contexte par CV : les dates ne sont repérées qu'une fois
+                ctx = AnalysisContext(texte_cv)
+                with stage("extraction"):
+                    infos_brutes = extraire_infos_cv(ctx)
+                lot.append((chemin, dict(infos_brutes, texte_cv=ctx)))
+                erreur = None
+            except Exception as e:
+                erreur = str(e)
+        sorties[chemin] = [None, erreur, trace.durations()]
+
+    if lot:
+        with start_trace() as trace:
+            try:
+                with stage("structuration"):
+                    resultats = build_structured_json_batch([item for _, item in lot], batch_size=len(lot))
+            except Exception:
+                resultats = None
+        if resultats is not None:
+            for (chemin, _), resultat in zip(lot, resultats):
+                sorties[chemin][0] = resultat
+                durees = sorties[chemin][2]
+                for etape, d in trace.durations().items():
+                    durees[etape] = durees.get(etape, 0.0) + d / len(lot)
+        else:
+            # Un CV du lot a échoué : chacun est repris seul pour isoler l'erreur
+            for chemin, item in lot:
+                with start_trace() as trace:
+                    try:
+                        with stage("structuration"):
+                            sorties[chemin][0] = build_structured_json(**item)
+                    except Exception as e:
+                        sorties[chemin][1] = str(e)
+                durees = sorties[chemin][2]
+                for etape, d in trace.durations().items():
+                    durees[etape] = durees.get(etape, 0.0) + d
+
+    return [(chemin, *sorties[chemin]) for chemin in chemins]
+
+
+# =============================================================================
+# SORTIE JSONL + MANIFESTE DE REPRISE
+# =============================================================================
+
+def empreinte_fichier(chemin):
+    """Identifie une version d'un fichier (un CV modifié depuis est retraité)."""
+    st = os.stat(chemin)
+    return f"{st.st_size}:{int(st.st_mtime)}"
+
+
+class SortieBatch:
+    """
+    Résultats en JSONL (results.jsonl, ou results-00000.jsonl... si shard_size > 0)
+    et manifeste des CV traités. Chaque ligne est écrite et vidée sur disque avant
+    la suivante : un arrêt brutal perd au plus le CV en cours.
+    """
+
+    def __init__(self, dossier, shard_size=0):
+        self.dossier = Path(dossier)
+        self.dossier.mkdir(parents=True, exist_ok=True)
+        self.shard_size = shard_size
+        self.chemin_manifeste = self.dossier / "manifest.jsonl"
+        # Une reprise commence un nouveau fichier : les précédents ne sont jamais réécrits
+        self._shard = len(list(self.dossier.glob("results*.jsonl")))
+        self._dans_shard = 0
+        self._resultats = None
+        self._manifeste = open(self.chemin_manifeste, "a", encoding="utf-8")
+
+    def deja_traites(self, inclure_erreurs=True):
+        """{chemin: empreinte} des CV présents dans le manifeste."""
+        traites = {}
+        if not self.chemin_manifeste.exists():
+            return traites
+        with open(self.chemin_manifeste, encoding="utf-8") as f:
+            for ligne in f:
+                try:
+                    entree = json.loads(ligne)
+                except ValueError:
+                    continue  # dernière ligne tronquée par une interruption
+                if entree.get("status") == "ok" or inclure_erreurs:
+                    traites[entree["file"]] = entree.get("fingerprint")
+                else:
+                    traites.pop(entree["file"], None)
+        return traites
+
+    def _fichier_resultats(self):
+        if self._resultats is None or (self.shard_size and self._dans_shard >= self.shard_size):
+            if self._resultats is not None:
+                self._resultats.close()
+                self._shard += 1
+            nom = f"results-{self._shard:05d}.jsonl" if self.shard_size else "results.jsonl"
+            self._resultats = open(self.dossier / nom, "a", encoding="utf-8")
+            self._dans_shard = 0
+        return self._resultats
+
+    def ecrire(self, fichier, empreinte, resultats, erreur, durees):
+        entree = {"file": fichier, "fingerprint": empreinte, "status": "error" if erreur else "ok"}
+        if erreur:
+            entree["error"] = erreur
+        else:
+            sortie = self._fichier_resultats()
+            sortie.write(json.dumps({"file": fichier, "result": resultats}, ensure_ascii=False) + "\n")
+            sortie.flush()
+            self._dans_shard += 1
+            entree["output"] = Path(sortie.name).name
+        entree["timings"] = {etape: round(d, 4) for etape, d in durees.items()}
+        self._manifeste.write(json.dumps(entree, ensure_ascii=False) + "\n")
+        self._manifeste.flush()
+
+    def fermer(self):
+        if self._resultats is not None:
+            self._resultats.close()
+        self._manifeste.close()
+
+
+# =============================================================================
+# TRAITEMENT PAR LOTS
+# =============================================================================
+
+def lister_cv(dossier_input):
+    """Fichiers PDF/DOCX du dossier (récursif), hors fichiers temporaires de Word."""
+    return sorted(
+        p for p in Path(dossier_input).rglob("*")
+        if p.suffix.lower() in EXTENSIONS_CV and not p.name.startswith("~$") and p.is_file()
+    )
+
+
+def analyser_cv(dossier_input="data/input", dossier_output="data/output/batch",
+                workers=None, shard_size=0, reprise=True, reessayer_erreurs=False, taille_lot=None):
+    """
+    Analyse tous les CV de dossier_input avec `workers` processus (1 = sur place),
+    par lots de `taille_lot` CV (CV_CLI_BATCH_SIZE par défaut), et écrit les résultats
+    dans dossier_output. Retourne les statistiques du lot.
+    """
+    workers = workers or os.cpu_count() or 1
+    sortie = SortieBatch(dossier_output, shard_size)
+
+    fichiers = lister_cv(dossier_input)
+    if not fichiers:
+        print(f"Aucun CV (.pdf/.docx) trouvé dans {dossier_input}")
+        sortie.fermer()
+        return None
+
+    traites = sortie.deja_traites(inclure_erreurs=not reessayer_erreurs) if reprise else {}
+    a_traiter = []
+    empreintes = {}
+    for chemin in fichiers:
+        cle = str(chemin.relative_to(dossier_input))
+        empreintes[str(chemin)] = (cle, empreinte_fichier(chemin))
+        if traites.get(cle) != empreintes[str(chemin)][1]:
+            a_traiter.append(str(chemin))
+
+    print(f"{len(fichiers)} CV trouvés, {len(fichiers) - len(a_traiter)} déjà traités, "
+          f"{len(a_traiter)} à analyser ({workers} processus)")
 
-def analyser_cv():
-    dossier_input = "data/input"
-    dossier_output = "data/output"
+    stats = {"total": len(a_traiter), "ok": 0, "erreurs": 0, "durees": {}}
+    debut = time.perf_counter()
+    pool = None
+    taille_lot = max(1, taille_lot or TAILLE_LOT)
+    # Pas plus de lots que nécessaire pour occuper tous les processus
+    taille_lot = min(taille_lot, -(-len(a_traiter) // workers)) if a_traiter else taille_lot
+    lots = [a_traiter[i:i + taille_lot] for i in range(0, len(a_traiter), taille_lot)]
+    try:
+        if workers > 1 and len(lots) > 1:
+            from worker_pool import WorkerPool
+            pool = WorkerPool(min(workers, len(lots)))
+            resultats_lots = pool.imap_unordered(analyser_lot_cv, lots)
+        else:
+            resultats_lots = map(analyser_lot_cv, lots)
+        resultats = (r for resultats_lot in resultats_lots for r in resultats_lot)
 
-    os.makedirs(dossier_output, exist_ok=True)
+        for n, (chemin, resultat, erreur, durees) in enumerate(resultats, 1):
+            cle, empreinte = empreintes[chemin]
+            sortie.ecrire(cle, empreinte, resultat, erreur, durees)
+            stats["erreurs" if erreur else "ok"] += 1
+            for etape, d in durees.items():
+                stats["durees"][etape] = stats["durees"].get(etape, 0.0) + d
+            if erreur:
+                print(f"  ✗ {cle} : {erreur}")
+            if n % 50 == 0 or n == len(a_traiter):
+                ecoule = time.perf_counter() - debut
+                print(f"[{n}/{len(a_traiter)}] {n / ecoule:.2f} CV/s")
+    finally:
+        if pool is not None:
+            pool.close()
+        sortie.fermer()
 
-    fichiers_cv = [f for f in os.listdir(dossier_input) if f.endswith('.docx')]
-    if not fichiers_cv:
-        print("Aucun CV (.docx) trouvé dans data/input")
-        return
+    stats["duree"] = time.perf_counter() - debut
+    afficher_stats(stats)
+    return stats
 
-    for fichier in fichiers_cv:
-        chemin_cv = os.path.join(dossier_input, fichier)
-        texte_cv = lire_cv_docx(chemin_cv)
 
-        # ➜ On utilise la fonction unique
-        resultats = extraire_infos_cv(texte_cv)
+def afficher_stats(stats):
+    traites = stats["ok"] + stats["erreurs"]
+    print(f"\n{stats['ok']} CV analysés, {stats['erreurs']} erreur(s) en {stats['duree']:.1f} s"
+          + (f" — {traites / stats['duree']:.2f} CV/s" if stats["duree"] > 0 and traites else ""))
+    if traites:
+        print("Temps moyen par étape (par CV, cumulé sur les processus) :")
+        for etape, total in stats["durees"].items():
+            print(f"  {etape:<14} {1000 * total / traites:8.1f} ms")
 
-        nom_json = os.path.splitext(fichier)[0] + "_resultats.json"
-        chemin_sortie = os.path.join(dossier_output, nom_json)
 
-        with open(chemin_sortie, 'w', encoding='utf-8') as f:
-            json.dump(resultats, f, indent=2, ensure_ascii=False)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyse par lots d'un dossier de CV (PDF/DOCX)")
+    parser.add_argument("input", nargs="?", default="data/input", help="dossier des CV (défaut: data/input)")
+    parser.add_argument("-o", "--output", default="data/output/batch", help="dossier des résultats JSONL")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="processus (défaut: nombre de cœurs)")
+    parser.add_argument("--shard-size", type=int, default=0, help="CV par fichier de résultats (0 = un seul fichier)")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help=f"CV par passage spaCy groupé dans un processus (défaut: {TAILLE_LOT})")
+    parser.add_argument("--no-resume", action="store_true", help="retraite tous les CV, même déjà présents dans le manifeste")
+    parser.add_argument("--retry-errors", action="store_true", help="retraite les CV en erreur lors d'une exécution précédente")
+    args = parser.parse_args(argv)
 
-        print("Analyse OK →", chemin_sortie)
+    stats = analyser_cv(
+        args.input, args.output, workers=args.workers, shard_size=args.shard_size,
+        reprise=not args.no_resume, reessayer_erreurs=args.retry_errors, taille_lot=args.batch_size,
+    )
+    return 1 if stats and stats["erreurs"] else 0
 
 
 if __name__ == "__main__":
-    analyser_cv()
\ No newline at end of file
+    sys.exit(main())
@@ -1,12 +1,18 @@
 import sys
+import shutil
 from pathlib import Path
 import os
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file, stream_with_context
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 from generators.pdf_sopra_profile import generate_sopra_profile_pdf
 import json
+import time
+import zipfile
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from datetime import datetime
 logging.basicConfig(level=logging.DEBUG)
 
@@ -15,62 +21,84 @@ logging.basicConfig(level=logging.DEBUG)
 # Ajoute le dossier parent au PYTHONPATH pour trouver analyser_cv.py
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from extractors.pdf_to_docx import convert_pdf_to_docx
-from analyser_cv import lire_cv_docx, extraire_infos_cv
-from extractors.section_classifier import build_structured_json
-from extractors.version_mapper import normalize_old_cv_to_new, convert_v2_to_old_format
+from extractors.document_reader import lire_document
+from extractors.extracteur import extraire_infos_cv
+from extractors.section_classifier import build_structured_json, json_file_sink
+from extractors.cv_context import AnalysisContext
+from extractors.version_mapper import normalize_old_cv_to_new, convert_v2_to_old_format, normalize_batch_item
+from extractors.model_registry import warm_up, model_stats
+from extractors.tracing import stage, start_trace, merge_trace
+from result_cache import get_result_cache
+from jobs import get_job_manager
+from worker_pool import get_worker_pool, start_worker_pool, iter_completed, map_ordered
+from metrics import REQUEST_METRICS, CONTENT_TYPE as METRICS_CONTENT_TYPE, render_metrics
 
 app = Flask(__name__)
 CORS(app)  # Autorise les requêtes cross-origin
+REQUEST_METRICS.install(app)
 
 UPLOAD_FOLDER = Path('data/input')
 ALLOWED_EXTENSIONS = {'pdf', 'docx'}
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
+# Analyse en masse : fichiers traités simultanément et taille max d'un fichier
+BULK_WORKERS = int(os.environ.get("CV_BULK_WORKERS", "4"))
+BULK_MAX_FILE_MB = float(os.environ.get("CV_BULK_MAX_FILE_MB", "20"))
 
-def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+# Préchargement des modèles spaCy à l'import (ex: gunicorn --preload)
+if os.environ.get("CV_PRELOAD_MODELS") == "1":
+    warm_up()
 
 
-def process_cv(file_path):
-    try:
-        # Conversion si PDF → DOCX
-        if file_path.suffix.lower() == '.pdf':
-            temp_docx = file_path.parent / f"{file_path.stem}_temp.docx"
-            if not convert_pdf_to_docx(str(file_path), str(temp_docx)):
-                return None, "Erreur PDF -> DOCX"
-            file_path = temp_docx
-
-        # Lecture du DOCX
-        texte_cv = lire_cv_docx(str(file_path))
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-        # Appel de la même fonction que le script CLI
-        infos_brutes = extraire_infos_cv(texte_cv)
 
-        # Build complet + classification + SpaCy
-        resultats = build_structured_json(
-            emails=infos_brutes["emails"],
-            telephones=infos_brutes["telephones"],
-            adresses=infos_brutes["adresses"],
-            dates=infos_brutes["dates"],
-            texte_cv=texte_cv
-        )
+def cv_json_filename(resultats):
+    nom_candidat = (resultats.get("contact", {}).get("nom") or "Inconnu").replace(" ", "_")
+    return f"CV_{nom_candidat}.json"
 
-        # Sauvegarde JSON propre
-        nom_candidat = (resultats.get("contact", {}).get("nom") or "Inconnu").replace(" ", "_")
-        json_filename = f"CV_{nom_candidat}.json"
-        json_path = Path("data/output") / json_filename
 
-        os.makedirs("data/output", exist_ok=True) 
+def _no_progress(stage):
+    pass
 
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(resultats, f, ensure_ascii=False, indent=2)
 
-        resultats["json_filename"] = json_filename
+def process_cv(source, extension=None, progress=_no_progress):
+    """
+    Analyse d'un CV : `source` est le chemin du fichier, ou ses octets avec
+    leur `extension` (".pdf" / ".docx"). Retourne (résultats, erreur).
+    """
+    try:
+        # Lecture du texte en mémoire (PDF ou DOCX), sans DOCX temporaire
+        progress("lecture")
+        if extension is None:
+            extension = Path(source).suffix
+        try:
+            with stage("lecture"):
+                texte_cv = lire_document(source, extension)
+        except Exception as e:
+            return None, f"Erreur lecture {extension.lower().lstrip('.').upper()}: {e}"
+
+        # Appel de la même fonction que le script CLI, avec un contexte partagé
+        # par l'extraction et la structuration (dates repérées une seule fois)
+        ctx = AnalysisContext(texte_cv)
+        progress("extraction")
+        with stage("extraction"):
+            infos_brutes = extraire_infos_cv(ctx)
 
+        # Build complet + classification + SpaCy
+        with stage("structuration"):
+            resultats = build_structured_json(
+                emails=infos_brutes["emails"],
+                telephones=infos_brutes["telephones"],
+                adresses=infos_brutes["adresses"],
+                dates=infos_brutes["dates"],
+                texte_cv=ctx,
+                # Sauvegarde JSON propre (une seule écriture par analyse)
+                sinks=[json_file_sink("data/output", filename=cv_json_filename, indent=2)]
+            )
 
-        if str(file_path).endswith('_temp.docx'):
-            os.remove(file_path)
+        resultats["json_filename"] = cv_json_filename(resultats)
 
         return resultats, None
 
@@ -79,6 +107,21 @@ def process_cv(file_path):
 
 
 
+def restore_cached_outputs(results, cache_key, cache):
+    """Recrée dans data/output le JSON et le PDF d'un résultat en cache s'ils ont été supprimés."""
+    output_dir = Path("data/output")
+    os.makedirs(output_dir, exist_ok=True)
+
+    json_filename = results.get("json_filename")
+    if json_filename and not (output_dir / json_filename).exists():
+        json_file_sink(str(output_dir), filename=json_filename, indent=2)(results)
+
+    pdf_filename = results.get("pdf_filename")
+    cached_pdf = cache.get_pdf(cache_key)
+    if pdf_filename and cached_pdf and not (output_dir / pdf_filename).exists():
+        shutil.copyfile(cached_pdf, output_dir / pdf_filename)
+
+
 @app.route('/api/cv/analyze', methods=['POST'])
 def analyze_cv():
     if 'file' not in request.files:
@@ -92,48 +135,335 @@ def analyze_cv():
         return jsonify({'success': False, 'error': 'Type de fichier non autorisé (PDF ou DOCX uniquement)'}), 400
 
     try:
-        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-
-        filename = secure_filename(file.filename)
-        file_path = Path(app.config['UPLOAD_FOLDER']) / filename
-        file.save(str(file_path))
-
-        results, error = process_cv(file_path)
-
+        with start_trace() as trace:
+            results, error = run_analysis(file.read(), file.filename)
         if error:
             return jsonify({'success': False, 'error': error}), 500
+        if timings_requested():
+            results["timings"] = trace.to_dict()
+        return jsonify(results)
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
 
-        # ----------------------
-        # Génération automatique du PDF dynamique
-        # ----------------------
 
-        # Récupération du nom du candidat
-        nom_candidat = (
-            results.get("contact", {}).get("nom") or
-            results.get("Nom") or
-            results.get("nom") or
-            "Inconnu"
-        )
+def analyser_fichier(data, original_filename, progress=_no_progress):
+    """
+    Analyse complète d'un CV envoyé (octets du fichier) : cache, extraction,
+    génération du PDF Sopra Steria. Retourne (résultats, erreur).
+    Utilisée par /api/cv/analyze et par les tâches asynchrones.
+    """
+    # Cache par contenu : un CV déjà analysé est renvoyé sans retraitement
+    progress("cache")
+    with stage("cache"):
+        cache = get_result_cache()
+        cache_key = cache.key_for(data) if cache else None
+        cached = cache.get(cache_key) if cache else None
+    if cached is not None:
+        restore_cached_outputs(cached, cache_key, cache)
+        cached["cache_hit"] = True
+        return cached, None
+
+    # Lecture depuis les octets : pas de fichier data/input/<nom> partagé entre
+    # deux analyses simultanées d'un même nom de fichier ("cv.pdf")
+    extension = Path(original_filename).suffix
+    results, error = process_cv(data, extension, progress=progress)
+
+    if error:
+        return None, error
+
+    # ----------------------
+    # Génération automatique du PDF dynamique
+    # ----------------------
+    progress("pdf")
+
+    # Récupération du nom du candidat
+    nom_candidat = (
+        results.get("contact", {}).get("nom") or
+        results.get("Nom") or
+        results.get("nom") or
+        "Inconnu"
+    )
 
-        # Nettoyage pour créer un nom de fichier valide
-        nom_candidat = nom_candidat.replace(" ", "_").replace("/", "_")
+    # Nettoyage pour créer un nom de fichier valide
+    nom_candidat = nom_candidat.replace(" ", "_").replace("/", "_")
 
-        pdf_filename = f"CV_{nom_candidat}.pdf"
-        pdf_path = Path("data/output") / pdf_filename
+    pdf_filename = f"CV_{nom_candidat}.pdf"
+    pdf_path = Path("data/output") / pdf_filename
 
 
-        os.makedirs("data/output", exist_ok=True)
+    os.makedirs("data/output", exist_ok=True)
 
-        # Génération du PDF Sopra Steria
+    # Génération du PDF Sopra Steria
+    with stage("pdf"):
         generate_sopra_profile_pdf(results, str(pdf_path))
 
-        # Ajouter le nom du PDF dans la réponse
-        results["pdf_filename"] = pdf_filename
+    # Ajouter le nom du PDF dans la réponse
+    results["pdf_filename"] = pdf_filename
+
+    if cache:
+        cache.put(cache_key, results, pdf_path=pdf_path)
+    results["cache_hit"] = False
+
+    return results, None
+
+
+def _analyser_fichier_trace(data, original_filename):
+    # Exécutée dans un worker : les durées des étapes reviennent avec le résultat
+    with start_trace() as trace:
+        results, error = analyser_fichier(data, original_filename)
+    return results, error, trace.to_dict()
+
+
+def run_analysis(data, original_filename, progress=_no_progress):
+    """analyser_fichier() dans un worker du pool de processus s'il est démarré, sinon sur place."""
+    pool = get_worker_pool()
+    if pool is None:
+        results, error = analyser_fichier(data, original_filename, progress=progress)
+    else:
+        progress("worker")
+        with stage("worker"):
+            results, error, breakdown = pool.run(_analyser_fichier_trace, data, original_filename)
+        merge_trace(breakdown)
+
+    # Comptage dans le processus du serveur (le cache a pu être lu dans un worker)
+    cache = get_result_cache()
+    if cache and results is not None:
+        cache.record(results.get("cache_hit", False))
+    return results, error
 
-        return jsonify(results)
 
+def timings_requested():
+    """Détail des durées par étape demandé (?timings=1 ou en-tête X-CV-Timings: 1)."""
+    return request.args.get('timings') == '1' or request.headers.get('X-CV-Timings') == '1'
+
+
+# -------------------------------------------------
+#           ANALYSE EN MASSE (NDJSON)
+# -------------------------------------------------
+_bulk_executor = None
+_bulk_lock = threading.Lock()
+
+
+def get_bulk_executor():
+    """Threads de l'analyse en masse (chacun délègue à run_analysis, donc au pool de processus s'il existe)."""
+    global _bulk_executor
+    if _bulk_executor is None:
+        with _bulk_lock:
+            if _bulk_executor is None:
+                _bulk_executor = ThreadPoolExecutor(max_workers=BULK_WORKERS, thread_name_prefix="cv-bulk")
+    return _bulk_executor
+
+
+def iter_bulk_files(uploads, archive):
+    """
+    Produit (nom, octets, erreur) pour chaque fichier envoyé puis chaque fichier
+    de l'archive. Les octets ne sont lus qu'à la demande : seuls les fichiers en
+    cours d'analyse sont en mémoire, quelle que soit la taille de l'archive.
+    Les noms sont gardés tels quels : l'analyse lit les octets, sans fichier
+    dans data/input, donc deux fichiers de même nom ne s'écrasent pas.
+    """
+    max_bytes = int(BULK_MAX_FILE_MB * 1024 * 1024)
+
+    for file in uploads:
+        if not allowed_file(file.filename):
+            yield file.filename, None, 'Type de fichier non autorisé (PDF ou DOCX uniquement)'
+            continue
+        yield file.filename, file.read(), None
+
+    if archive is None:
+        return
+    for info in archive.infolist():
+        if info.is_dir() or Path(info.filename).name.startswith(('.', '~$')):
+            continue
+        if not allowed_file(info.filename):
+            yield info.filename, None, 'Type de fichier non autorisé (PDF ou DOCX uniquement)'
+        elif info.file_size > max_bytes:
+            yield info.filename, None, f'Fichier trop volumineux (> {BULK_MAX_FILE_MB:g} Mo)'
+        else:
+            yield info.filename, archive.read(info), None
+
+
+def _analyse_bulk_item(entry, timings=False):
+    name, data, error = entry
+    if error:
+        return name, None, error
+    try:
+        with start_trace() as trace:
+            results, error = run_analysis(data, name)
+        if results is not None and timings:
+            results["timings"] = trace.to_dict()
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        results, error = None, str(e)
+    return name, results, error
+
+
+@app.route('/api/cv/analyze-bulk', methods=['POST'])
+def analyze_cv_bulk():
+    """
+    Endpoint: POST /api/cv/analyze-bulk
+    FormData: files (PDF/DOCX, plusieurs) et/ou archive (.zip de PDF/DOCX)
+    Paramètres optionnels: concurrency (fichiers analysés simultanément),
+    timings=1 (durées par étape dans chaque résultat)
+
+    Analyse chaque fichier avec le même pipeline que /api/cv/analyze et renvoie
+    un flux NDJSON : une ligne par fichier dès qu'il est terminé
+    {"index", "filename", "success", "result" | "error"}, puis une ligne
+    {"summary": {...}}. Un nouveau fichier n'est lu que lorsqu'une place se
+    libère et que le client a consommé les lignes précédentes (contre-pression).
+    """
+    uploads = [f for f in request.files.getlist('files') if f.filename]
+    archive_file = request.files.get('archive')
+
+    if not uploads and archive_file is None:
+        return jsonify({'success': False, 'error': 'Aucun fichier envoyé'}), 400
+
+    archive = None
+    if archive_file is not None:
+        try:
+            archive = zipfile.ZipFile(archive_file.stream)
+        except zipfile.BadZipFile:
+            return jsonify({'success': False, 'error': 'Archive ZIP invalide'}), 400
+
+    try:
+        concurrency = int(request.values.get('concurrency', BULK_WORKERS))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Paramètre "concurrency" invalide'}), 400
+
+    analyse = partial(_analyse_bulk_item, timings=timings_requested())
+
+    def generate():
+        started = time.perf_counter()
+        summary = {'total': 0, 'success': 0, 'errors': 0}
+        items = iter_bulk_files(uploads, archive)
+        try:
+            for index, (name, results, error) in iter_completed(
+                analyse, items, concurrency, executor=get_bulk_executor()
+            ):
+                summary['total'] += 1
+                if error:
+                    summary['errors'] += 1
+                    line = {'index': index, 'filename': name, 'success': False, 'error': error}
+                else:
+                    summary['success'] += 1
+                    line = {'index': index, 'filename': name, 'success': True, 'result': results}
+                yield json.dumps(line, ensure_ascii=False) + "\n"
+        finally:
+            if archive is not None:
+                archive.close()
+        summary['duration'] = round(time.perf_counter() - started, 3)
+        yield json.dumps({'summary': summary}, ensure_ascii=False) + "\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+        headers={"X-Accel-Buffering": "no"},
+    )
+
+
+# -------------------------------------------------
+#           TÂCHES ASYNCHRONES (ANALYSE)
+# -------------------------------------------------
+def _analyse_job(data, filename, progress, timings=False):
+    with start_trace() as trace:
+        results, error = run_analysis(data, filename, progress=progress)
+    if error:
+        raise RuntimeError(error)
+    if timings:
+        results["timings"] = trace.to_dict()
+    return results
+
+
+@app.route('/api/jobs/analyze', methods=['POST'])
+def submit_analyze_job():
+    """
+    Endpoint: POST /api/jobs/analyze (FormData: file)
+
+    Lance l'analyse en arrière-plan et répond immédiatement (202) avec
+    l'identifiant de la tâche et les URLs de suivi.
+    """
+    if 'file' not in request.files:
+        return jsonify({'success': False, 'error': 'Aucun fichier envoyé'}), 400
+
+    file = request.files['file']
+    if file.filename == '':
+        return jsonify({'success': False, 'error': 'Aucun fichier sélectionné'}), 400
+
+    if not allowed_file(file.filename):
+        return jsonify({'success': False, 'error': 'Type de fichier non autorisé (PDF ou DOCX uniquement)'}), 400
+
+    # Le fichier est lu ici : le flux de la requête n'est plus disponible dans le worker
+    job = get_job_manager().submit(
+        "analyze", _analyse_job, file.read(), file.filename, timings=timings_requested()
+    )
+
+    return jsonify({
+        'success': True,
+        'job_id': job.id,
+        'status_url': f"/api/jobs/{job.id}",
+        'result_url': f"/api/jobs/{job.id}/result",
+        'events_url': f"/api/jobs/{job.id}/events",
+    }), 202
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Tâche introuvable'}), 404
+    return jsonify({'success': True, **job.to_dict()})
+
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Tâche introuvable'}), 404
+    if job.status == "error":
+        return jsonify({'success': False, 'error': job.error}), 500
+    if not job.finished:
+        return jsonify({'success': True, **job.to_dict()}), 202
+    return jsonify(job.result)
+
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """Suivi en direct (Server-Sent Events) : une ligne par étape et changement d'état."""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Tâche introuvable'}), 404
+
+    def stream():
+        for event in job.iter_events():
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {event['event']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# -------------------------------------------------
+#           MÉTRIQUES (PROMETHEUS)
+# -------------------------------------------------
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Métriques du processus au format texte Prometheus."""
+    from generators.docx_to_pdf import converter_stats
+
+    cache = get_result_cache()
+    pool = get_worker_pool()
+    body = render_metrics(
+        model_stats=model_stats(),
+        cache=cache.stats() if cache else None,
+        jobs=get_job_manager().stats(),
+        worker_pool=pool.stats() if pool else None,
+        converter=converter_stats(),
+    )
+    return Response(body, content_type=METRICS_CONTENT_TYPE)
 
 # -------------------------------------------------
 #           ROUTE DOWNLOAD DOCX       
@@ -377,17 +707,19 @@ def normalize_cv_batch():
     """
     Endpoint: POST /api/cv/normalize-batch
     
-    Normalise plusieurs CVs en une seule requête.
+    Normalise plusieurs CVs en une seule requête, en parallèle sur un pool de processus.
     
     Body:
     {
       "cvs": [
         {...ancien JSON 1...},
         {...ancien JSON 2...}
-      ]
+      ],
+      "concurrency": 8,    (optionnel) nombre max de CVs traités simultanément
+      "stream": false      (optionnel) réponse NDJSON au fil de l'eau
     }
     
-    Réponse:
+    Réponse (ordre des résultats = ordre des CVs envoyés):
     {
       "success": true,
       "results": [
@@ -400,6 +732,10 @@ def normalize_cv_batch():
         "errors": 1
       }
     }
+
+    Mode streaming ("stream": true, ?stream=1 ou Accept: application/x-ndjson) :
+    une ligne JSON par CV dès qu'il est terminé, avec son "index" dans le lot,
+    puis une dernière ligne {"summary": {...}}.
     """
     try:
         data = request.get_json()
@@ -410,20 +746,35 @@ def normalize_cv_batch():
                 'success': False,
                 'error': 'Champ "cvs" doit être une liste'
             }), 400
-        
-        results = []
-        for cv_data in cvs_input:
-            try:
-                cv_normalized = normalize_old_cv_to_new(cv_data)
-                results.append({
-                    'success': True,
-                    'cv_normalized': cv_normalized
-                })
-            except Exception as e:
-                results.append({
-                    'success': False,
-                    'error': str(e)
-                })
+
+        concurrency = data.get('concurrency')
+        if concurrency is not None and (not isinstance(concurrency, int) or concurrency < 1):
+            return jsonify({
+                'success': False,
+                'error': 'Champ "concurrency" doit être un entier positif'
+            }), 400
+
+        stream = (
+            data.get('stream') is True or
+            request.args.get('stream') == '1' or
+            'application/x-ndjson' in request.headers.get('Accept', '')
+        )
+
+        if stream:
+            def generate():
+                summary = {'total': len(cvs_input), 'success': 0, 'errors': 0}
+                for index, result in iter_completed(normalize_batch_item, cvs_input, concurrency):
+                    summary['success' if result.get('success') else 'errors'] += 1
+                    yield json.dumps({'index': index, **result}, ensure_ascii=False) + "\n"
+                yield json.dumps({'summary': summary}, ensure_ascii=False) + "\n"
+
+            return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+        if len(cvs_input) < 2:
+            # Pas de pool pour un seul CV
+            results = [normalize_batch_item(cv_data) for cv_data in cvs_input]
+        else:
+            results = map_ordered(normalize_batch_item, cvs_input, concurrency)
         
         summary = {
             'total': len(results),
@@ -609,4 +960,9 @@ def normalize_and_export_pdf():
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000, use_reloader=False)
+    # Mode production : CV_WORKER_PROCESSES=N démarre N workers (modèles chargés par le forkserver)
+    if start_worker_pool() is not None:
+        app.run(debug=False, port=5000, threaded=True, use_reloader=False)
+    else:
+        warm_up()
+        app.run(debug=True, port=5000, use_reloader=False)
@@ -0,0 +1,7 @@
+"""
+Benchmarks du pipeline d'analyse de CV.
+
+Ce module contient:
+- corpus.py: Génération d'un corpus synthétique de CV (DOCX et PDF)
+- run_benchmarks.py: Mesure des étapes du pipeline et de process_cv() sur ce corpus
+"""
@@ -0,0 +1,133 @@
+"""
+Génération d'un corpus synthétique de CV français (DOCX et PDF).
+
+Les blocs de texte viennent des exemples annotés de training/training_data.py
+(classification de sections) : en-tête, profil, formations, expériences,
+compétences, langues, projets, certifications, loisirs. Chaque CV combine ces
+blocs avec une longueur (nombre de blocs par section), un ordre de sections et
+des titres de section variables. Le corpus dépend uniquement de la graine :
+deux générations avec la même graine produisent les mêmes textes.
+"""
+
+import random
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from training.training_data import TEXTCAT_TRAINING_DATA
+
+# Titres alternatifs quand un bloc n'a pas son propre titre de section
+SECTION_TITLES = {
+    "PROFILE": ["PROFIL", "À PROPOS", "Résumé"],
+    "EDUCATION": ["FORMATION", "Formations", "PARCOURS ACADÉMIQUE", "ÉDUCATION"],
+    "EXPERIENCE": ["EXPÉRIENCE PROFESSIONNELLE", "Expériences", "PARCOURS PROFESSIONNEL"],
+    "SKILLS": ["COMPÉTENCES", "Compétences techniques", "SAVOIR-FAIRE"],
+    "LANGUAGES": ["LANGUES", "Langues"],
+    "PROJECTS": ["PROJETS", "Projets personnels"],
+    "CERTIFICATIONS": ["CERTIFICATIONS", "Certifications"],
+    "INTERESTS": ["LOISIRS", "Centres d'intérêt", "INTÉRÊTS"],
+}
+
+# Ordres de sections rencontrés dans les CV réels
+LAYOUTS = {
+    "classique": ["PROFILE", "EXPERIENCE", "EDUCATION", "SKILLS", "LANGUAGES",
+                  "PROJECTS", "CERTIFICATIONS", "INTERESTS"],
+    "etudiant": ["PROFILE", "EDUCATION", "PROJECTS", "EXPERIENCE", "SKILLS",
+                 "LANGUAGES", "INTERESTS", "CERTIFICATIONS"],
+    "competences_d_abord": ["SKILLS", "LANGUAGES", "CERTIFICATIONS", "EXPERIENCE",
+                            "EDUCATION", "PROJECTS", "PROFILE", "INTERESTS"],
+}
+
+# Longueur : (nombre de sections après l'en-tête, blocs max par section)
+LENGTHS = {
+    "court": (4, 1),
+    "moyen": (6, 2),
+    "long": (8, 3),
+}
+
+
+def _blocks_by_category() -> Dict[str, List[str]]:
+    blocks: Dict[str, List[str]] = {}
+    for texte, annotations in TEXTCAT_TRAINING_DATA:
+        cats = annotations["cats"]
+        blocks.setdefault(max(cats, key=cats.get), []).append(texte)
+    return blocks
+
+
+BLOCKS = _blocks_by_category()
+
+
+def _has_title(block: str) -> bool:
+    first = block.split("\n", 1)[0]
+    return "\n" in block and len(first) < 40 and ":" not in first
+
+
+def generate_cv(rng: random.Random, length: str, layout: str) -> str:
+    """Texte d'un CV synthétique."""
+    n_sections, max_blocks = LENGTHS[length]
+    parts = [rng.choice(BLOCKS["HEADER"])]
+    for category in LAYOUTS[layout][:n_sections]:
+        candidates = BLOCKS.get(category)
+        if not candidates:
+            continue
+        chosen = rng.sample(candidates, min(len(candidates), rng.randint(1, max_blocks)))
+        lines = []
+        if not _has_title(chosen[0]):
+            lines.append(rng.choice(SECTION_TITLES[category]))
+        for i, block in enumerate(chosen):
+            # Un seul titre par section : les blocs suivants perdent le leur
+            lines.append(block.split("\n", 1)[1] if i and _has_title(block) else block)
+        parts.append("\n".join(lines))
+    return "\n\n".join(parts)
+
+
+def write_docx(texte: str, path: Path):
+    from docx import Document
+
+    doc = Document()
+    for line in texte.split("\n"):
+        doc.add_paragraph(line)
+    # Métadonnées fixes : même graine, mêmes fichiers
+    doc.core_properties.created = datetime(2024, 1, 1)
+    doc.core_properties.modified = datetime(2024, 1, 1)
+    doc.save(str(path))
+
+
+def write_pdf(texte: str, path: Path):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    c = canvas.Canvas(str(path), pagesize=A4, invariant=1)
+    width, height = A4
+    y = height - 50
+    for line in texte.split("\n"):
+        # Retour à la ligne simple pour les blocs longs
+        chunks = [line[i:i + 95] for i in range(0, len(line), 95)] or [""]
+        for chunk in chunks:
+            if y < 50:
+                c.showPage()
+                y = height - 50
+            c.setFont("Helvetica", 10)
+            c.drawString(50, y, chunk)
+            y -= 14
+    c.save()
+
+
+def generate_corpus(directory, size: int = 100, seed: int = 42) -> List[Tuple[Path, Dict[str, str]]]:
+    """
+    Écrit `size` CV dans `directory` (moitié DOCX, moitié PDF) et retourne
+    [(chemin, {"format", "length", "layout"})].
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        length = rng.choice(list(LENGTHS))
+        layout = rng.choice(list(LAYOUTS))
+        fmt = "docx" if i % 2 == 0 else "pdf"
+        texte = generate_cv(rng, length, layout)
+        path = directory / f"cv_{i:04d}_{length}_{layout}.{fmt}"
+        (write_docx if fmt == "docx" else write_pdf)(texte, path)
+        corpus.append((path, {"format": fmt, "length": length, "layout": layout}))
+    return corpus
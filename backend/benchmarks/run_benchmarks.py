@@ -0,0 +1,254 @@
+"""
+Benchmark du pipeline d'analyse sur un corpus synthétique.
+
+    cd backend
+    python -m benchmarks.run_benchmarks --size 200 --seed 42
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/bench-<commit>.json
+
+Chaque étape est mesurée séparément sur tout le corpus (les entrées d'une étape
+sont les sorties de la précédente), puis process_cv() de bout en bout :
+- lecture       : lire_document() (PDF ou DOCX → texte)
+- extraction    : extraire_infos_cv() (regex : dates, emails, téléphones, adresses)
+- spacy         : passage du modèle NER (AnalysisContext.doc)
+- structuration : build_structured_json() (spaCy + classification + sections)
+- pdf           : generate_sopra_profile_pdf()
+- process_cv    : pipeline complet de l'API
+
+Le rapport JSON (débit, latences p50/p95/p99, pic de mémoire) a des clés triées
+et une structure fixe (contexte d'exécution sous "meta") : deux rapports se
+comparent avec diff ou --compare. Toutes les étapes tournent dans le même
+processus : process_peak_rss_mb est le pic de tout le processus atteint à la
+fin de l'étape (maximum cumulé depuis le démarrage), pas la mémoire de l'étape.
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import platform
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.corpus import generate_corpus
+
+RESULTS_DIR = BACKEND_DIR / "benchmarks" / "results"
+STAGES = ["lecture", "extraction", "spacy", "structuration", "pdf", "process_cv"]
+
+
+# =============================================================================
+# MESURES
+# =============================================================================
+
+def process_peak_rss_mb() -> Optional[float]:
+    """Pic de mémoire résidente du processus entier depuis son démarrage (Mo), pas d'une étape."""
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux : Ko ; macOS : octets
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Percentile par rang le plus proche (valeurs déjà triées)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def run_stage(fn: Callable, inputs: List[Any]) -> Dict[str, Any]:
+    """Applique fn à chaque entrée et résume les latences. Retourne aussi les sorties."""
+    latencies, outputs, errors = [], [], 0
+    start = time.perf_counter()
+    for item in inputs:
+        t0 = time.perf_counter()
+        try:
+            outputs.append(fn(item))
+        except Exception:
+            errors += 1
+            outputs.append(None)
+        latencies.append(time.perf_counter() - t0)
+    total = time.perf_counter() - start
+
+    latencies.sort()
+    ms = lambda s: round(1000 * s, 3)
+    return {
+        "count": len(inputs),
+        "errors": errors,
+        "total_s": round(total, 3),
+        "throughput_per_s": round(len(inputs) / total, 2) if total > 0 else None,
+        "mean_ms": ms(sum(latencies) / len(latencies)) if latencies else 0.0,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(latencies[-1]) if latencies else 0.0,
+        "process_peak_rss_mb": process_peak_rss_mb(),
+    }, outputs
+
+
+@contextmanager
+def _working_directory(path: Path):
+    # process_cv() écrit dans data/output relatif au dossier courant
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def run_benchmarks(size: int = 100, seed: int = 42, stages: List[str] = None,
+                   warmup: int = 3) -> Dict[str, Any]:
+    from extractors.document_reader import lire_document
+    from extractors.cv_context import AnalysisContext
+    from extractors.section_classifier import build_structured_json
+    from extractors.model_registry import warm_up
+    from analyser_cv import extraire_infos_cv
+    from generators.pdf_sopra_profile import generate_sopra_profile_pdf
+
+    stages = stages or STAGES
+    report: Dict[str, Any] = {"stages": {}}
+
+    with tempfile.TemporaryDirectory(prefix="cv_bench_") as workdir:
+        workdir = Path(workdir)
+        corpus = generate_corpus(workdir / "corpus", size=size, seed=seed)
+        paths = [path for path, _ in corpus]
+        print(f"Corpus: {len(paths)} CV (graine {seed}) dans {workdir / 'corpus'}")
+
+        t0 = time.perf_counter()
+        warm_up()
+        model_load_s = time.perf_counter() - t0
+
+        # Échauffement hors mesure (caches, imports paresseux)
+        for path in paths[:warmup]:
+            texte = lire_document(path)
+            infos = extraire_infos_cv(texte)
+            build_structured_json(infos["emails"], infos["telephones"], infos["adresses"],
+                                  infos["dates"], texte)
+
+        def record(name, fn, inputs):
+            if name not in stages:
+                return None
+            stats, outputs = run_stage(fn, inputs)
+            report["stages"][name] = stats
+            print(f"  {name:<14} {stats['throughput_per_s'] or 0:8.2f} CV/s  "
+                  f"p50 {stats['p50_ms']:8.1f} ms  p95 {stats['p95_ms']:8.1f} ms  "
+                  f"p99 {stats['p99_ms']:8.1f} ms  erreurs {stats['errors']}")
+            return outputs
+
+        # Les sorties de chaque étape alimentent la suivante, même si elle n'est pas mesurée
+        textes = record("lecture", lire_document, paths) or [lire_document(p) for p in paths]
+        infos = record("extraction", extraire_infos_cv, textes) or [extraire_infos_cv(t) for t in textes]
+        record("spacy", lambda t: AnalysisContext(t).doc, textes)
+
+        def structurer(pair):
+            texte, brut = pair
+            return build_structured_json(brut["emails"], brut["telephones"], brut["adresses"],
+                                         brut["dates"], texte)
+
+        pairs = list(zip(textes, infos))
+        resultats = record("structuration", structurer, pairs)
+        if "pdf" in stages:
+            resultats = resultats or [structurer(p) for p in pairs]
+            pdf_dir = workdir / "pdf"
+            pdf_dir.mkdir()
+            numbered = list(enumerate(resultats))
+            record("pdf", lambda item: generate_sopra_profile_pdf(item[1], str(pdf_dir / f"{item[0]}.pdf")),
+                   numbered)
+
+        if "process_cv" in stages:
+            from api import process_cv
+
+            def bout_en_bout(path):
+                resultats, error = process_cv(path)
+                if error:
+                    raise RuntimeError(error)
+                return resultats
+
+            with _working_directory(workdir):
+                record("process_cv", bout_en_bout, paths)
+
+    report["meta"] = {
+        "commit": _git_commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "corpus_size": size,
+        "seed": seed,
+        "warmup": warmup,
+        "model_load_s": round(model_load_s, 3),
+        "process_peak_rss_mb": process_peak_rss_mb(),
+    }
+    return report
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]):
+    """Affiche l'écart (%) de chaque étape par rapport à un rapport de référence."""
+    print(f"\nComparaison avec {baseline.get('meta', {}).get('commit') or 'référence'} :")
+    for name, stats in report["stages"].items():
+        ref = baseline.get("stages", {}).get(name)
+        if not ref:
+            continue
+        deltas = []
+        for key in ("throughput_per_s", "p50_ms", "p95_ms", "p99_ms", "process_peak_rss_mb"):
+            old, new = ref.get(key), stats.get(key)
+            if old and new is not None:
+                deltas.append(f"{key} {100 * (new - old) / old:+.1f}%")
+        print(f"  {name:<14} " + "  ".join(deltas))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du pipeline sur un corpus synthétique de CV")
+    parser.add_argument("--size", type=int, default=100, help="nombre de CV générés (défaut: 100)")
+    parser.add_argument("--seed", type=int, default=42, help="graine du corpus (défaut: 42)")
+    parser.add_argument("--warmup", type=int, default=3, help="CV traités avant les mesures")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"étapes mesurées ({','.join(STAGES)})")
+    parser.add_argument("-o", "--output", help="rapport JSON (défaut: benchmarks/results/bench-<commit>.json)")
+    parser.add_argument("--compare", help="rapport de référence à comparer")
+    args = parser.parse_args(argv)
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"étape(s) inconnue(s): {', '.join(sorted(unknown))}")
+
+    report = run_benchmarks(args.size, args.seed, stages, args.warmup)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"bench-{report['meta']['commit'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, sort_keys=True, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"\nRapport: {output}")
+
+    if args.compare:
+        compare(report, json.loads(Path(args.compare).read_text(encoding="utf-8")))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
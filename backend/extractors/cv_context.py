@@ -0,0 +1,169 @@
+"""
+Contexte d'analyse partagé pour un CV.
+
+Un AnalysisContext est créé une fois par requête puis transmis aux fonctions
+de section_classifier, enhanced_extractor et heuristic_rules à la place du
+texte brut. Les calculs coûteux (Doc spaCy, texte en minuscules, lignes,
+phrases, dates, sections) sont faits à la demande, une seule fois par document.
+"""
+
+import re
+from functools import cached_property
+from typing import List, Tuple, Union
+
+# Import adaptatif pour tracing
+try:
+    from extractors.tracing import stage
+except ImportError:
+    try:
+        from .tracing import stage
+    except ImportError:
+        from tracing import stage
+
+
+def _registry():
+    # Import paresseux : heuristic_rules utilise ce module sans dépendre de spaCy
+    try:
+        from extractors import model_registry
+    except ImportError:
+        try:
+            from . import model_registry
+        except ImportError:
+            import model_registry
+    return model_registry
+
+
+class AnalysisContext:
+    """Texte d'un CV et tous ses dérivés, calculés paresseusement."""
+
+    def __init__(self, texte: str, doc=None, model: str = "cv_ner", mode: str = "ner"):
+        self.texte = texte
+        self.model = model
+        self.mode = mode
+        if doc is not None:
+            # Pré-remplit la propriété mise en cache : aucun nouveau passage du modèle
+            self.__dict__["doc"] = doc
+
+    @classmethod
+    def batch(cls, texts, model: str = "cv_ner", mode: str = "ner",
+              batch_size: int = 32, n_process: int = 1) -> List["AnalysisContext"]:
+        """
+        Crée un contexte par texte, les Doc étant calculés en lot via nlp.pipe.
+        Un AnalysisContext déjà créé (même modèle) est repris tel quel : seul son
+        Doc est calculé, avec ceux des autres textes, s'il ne l'est pas encore.
+        """
+        contexts = [t if is_context(t) else cls(t, model=model, mode=mode) for t in texts]
+        to_parse = [ctx for ctx in contexts if "doc" not in ctx.__dict__]
+        if to_parse:
+            with stage("spacy"):
+                docs = _registry().parse_batch(
+                    [ctx.texte for ctx in to_parse], model, mode, batch_size=batch_size, n_process=n_process
+                )
+                for ctx, doc in zip(to_parse, docs):
+                    ctx.__dict__["doc"] = doc
+        return contexts
+
+    @cached_property
+    def doc(self):
+        """Doc spaCy du texte complet (un seul passage du modèle par contexte)."""
+        with stage("spacy"):
+            return _registry().parse(self.texte, self.model, self.mode)
+
+    @cached_property
+    def texte_lower(self) -> str:
+        return self.texte.lower()
+
+    @cached_property
+    def lines(self) -> List[str]:
+        return self.texte.split('\n')
+
+    @cached_property
+    def non_empty_lines(self) -> List[str]:
+        return [l.strip() for l in self.lines if l.strip()]
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        return re.split(r'[.!\n]', self.texte)
+
+    @cached_property
+    def sentences_lower(self) -> List[str]:
+        return [s.lower() for s in self.sentences]
+
+    @cached_property
+    def date_scan(self):
+        """Dates du texte repérées en une passe (date_scanner), partagées par tous les extracteurs."""
+        try:
+            from extractors.date_scanner import scan_dates
+        except ImportError:
+            try:
+                from .date_scanner import scan_dates
+            except ImportError:
+                from date_scanner import scan_dates
+        return scan_dates(self.texte)
+
+    @cached_property
+    def date_spans(self):
+        """Dates du texte au format de section_classifier.extract_date_spans()."""
+        try:
+            from extractors.section_classifier import date_spans_from_scan
+        except ImportError:
+            try:
+                from .section_classifier import date_spans_from_scan
+            except ImportError:
+                from section_classifier import date_spans_from_scan
+        return date_spans_from_scan(self.date_scan)
+
+    @cached_property
+    def date_index(self):
+        """DateIndex des date_spans (recherche de la date la plus proche par bisect)."""
+        try:
+            from extractors.section_classifier import DateIndex
+        except ImportError:
+            try:
+                from .section_classifier import DateIndex
+            except ImportError:
+                from section_classifier import DateIndex
+        return DateIndex(self.date_spans)
+
+    @cached_property
+    def sections(self):
+        """SectionIndex du texte (section_index) : limites des sections, partagées par tous les parseurs."""
+        try:
+            from extractors.section_index import index_sections
+        except ImportError:
+            try:
+                from .section_index import index_sections
+            except ImportError:
+                from section_index import index_sections
+        return index_sections(self.texte, self.model)
+
+    def org_positions(self, org: str) -> List[Tuple[int, int]]:
+        """Positions (insensibles à la casse) de `org` dans le texte, calculées une fois par nom."""
+        cache = self.__dict__.setdefault("_org_positions", {})
+        if org not in cache:
+            cache[org] = [
+                (m.start(), m.end())
+                for m in re.finditer(re.escape(org), self.texte, flags=re.IGNORECASE)
+            ]
+        return cache[org]
+
+
+# Les tests se font sur `str` plutôt que sur AnalysisContext : avec les imports
+# adaptatifs, le module peut être chargé sous deux noms (extractors.cv_context
+# et cv_context), donc deux classes distinctes.
+
+def as_context(texte: Union[str, AnalysisContext], **kwargs) -> AnalysisContext:
+    """Retourne `texte` s'il s'agit déjà d'un contexte, sinon en crée un."""
+    if isinstance(texte, str):
+        return AnalysisContext(texte, **kwargs)
+    return texte
+
+
+def is_context(obj) -> bool:
+    """True si `obj` est un AnalysisContext (quel que soit le nom d'import du module)."""
+    return not isinstance(obj, str) and hasattr(obj, "texte")
+
+
+def texte_of(texte: Union[str, AnalysisContext]) -> str:
+    """Texte brut d'une chaîne ou d'un contexte."""
+    return texte if isinstance(texte, str) else texte.texte
@@ -0,0 +1,106 @@
+"""
+Normalisation déterministe des dates françaises rencontrées dans les CV.
+
+Les formats repérés par date_scanner (FORMATS) et DATE_PATTERNS
+(heuristic_rules) sont convertis sans dateparser, au format ISO 8601 avec la
+précision présente dans le texte :
+    "15/09/2020"      -> "2020-09-15"
+    "09/2020"         -> "2020-09"
+    "Septembre 2020"  -> "2020-09"
+    "2020"            -> "2020"
+Aucune partie absente n'est inventée (pas de jour ni de mois « du jour »).
+dateparser n'est utilisé qu'en dernier recours, derrière un cache LRU borné.
+"""
+
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Optional
+
+MOIS_FR = {
+    "janvier": 1, "janv": 1, "jan": 1,
+    "février": 2, "fevrier": 2, "févr": 2, "fevr": 2, "fév": 2, "fev": 2,
+    "mars": 3, "mar": 3,
+    "avril": 4, "avr": 4,
+    "mai": 5,
+    "juin": 6,
+    "juillet": 7, "juil": 7,
+    "août": 8, "aout": 8,
+    "septembre": 9, "sept": 9, "sep": 9,
+    "octobre": 10, "oct": 10,
+    "novembre": 11, "nov": 11,
+    "décembre": 12, "decembre": 12, "déc": 12, "dec": 12,
+}
+
+DATEPARSER_CACHE_SIZE = 1024
+
+_RX_NUMERIQUE = re.compile(r"(\d{1,2})[/\-.](\d{1,2})[/\-.](\d{2}|\d{4})")
+_RX_MOIS_ANNEE = re.compile(r"(\d{1,2})[/\-.]((?:19|20)\d{2})")
+_RX_ANNEE = re.compile(r"(?:19|20)\d{2}")
+_RX_MOIS_TEXTE = re.compile(r"([^\W\d_]+)\.?\s+(\d{4})")
+
+
+def _annee(valeur: str) -> int:
+    """Année sur 4 chiffres (pivot fixe pour les années sur 2 chiffres)."""
+    annee = int(valeur)
+    if len(valeur) == 2:
+        annee += 2000 if annee < 50 else 1900
+    return annee
+
+
+def _normaliser_deterministe(raw: str) -> Optional[str]:
+    s = raw.strip()
+
+    m = _RX_NUMERIQUE.fullmatch(s)
+    if m:
+        try:
+            return date(_annee(m.group(3)), int(m.group(2)), int(m.group(1))).isoformat()
+        except ValueError:
+            return None
+
+    m = _RX_MOIS_ANNEE.fullmatch(s)
+    if m:
+        mois = int(m.group(1))
+        return f"{m.group(2)}-{mois:02d}" if 1 <= mois <= 12 else None
+
+    if _RX_ANNEE.fullmatch(s):
+        return s
+
+    m = _RX_MOIS_TEXTE.fullmatch(s)
+    if m:
+        mois = MOIS_FR.get(m.group(1).lower())
+        if mois:
+            return f"{m.group(2)}-{mois:02d}"
+
+    return None
+
+
+@lru_cache(maxsize=DATEPARSER_CACHE_SIZE)
+def _normaliser_dateparser(raw: str) -> Optional[str]:
+    """Repli dateparser, limité aux dates complètes (jour, mois et année présents)."""
+    try:
+        import dateparser
+    except ImportError:
+        return None
+    try:
+        dp = dateparser.parse(
+            raw,
+            languages=['fr'],
+            settings={"REQUIRE_PARTS": ["day", "month", "year"]},
+        )
+    except Exception:
+        return None
+    return dp.date().isoformat() if dp else None
+
+
+def normaliser_date(raw: str) -> Optional[str]:
+    """
+    Normalise une date brute au format ISO (précision d'origine conservée).
+    Retourne None si la chaîne n'est pas une date reconnue.
+    """
+    return _normaliser_deterministe(raw) or _normaliser_dateparser(raw.strip())
+
+
+def cache_info():
+    """Statistiques du cache du repli dateparser."""
+    return _normaliser_dateparser.cache_info()
@@ -0,0 +1,169 @@
+"""
+Repérage des dates d'un CV en une seule passe.
+
+Un motif unique, union de tous les formats de dates du pipeline, parcourt le
+texte une fois. Les formats sont essayés du plus spécifique au plus général :
+à une position donnée la première alternative qui correspond l'emporte, et deux
+dates du scan ne se chevauchent jamais.
+
+Les extracteurs gardent leurs propres formats ("2020 - Présent" est à la fois
+une plage d'années et la fin de "Mars 2020 - Présent") : DateScan.finditer()
+les essaie seulement aux débuts des dates du scan et de leurs parties (mois,
+années, bornes), avec le même résultat qu'un finditer sur tout le texte.
+
+Les suites de 5 chiffres (codes postaux) sont repérées en même temps : le
+filtrage des faux positifs devient une recherche dichotomique, la fenêtre
+autour d'une date n'est relue que si une de ces suites y tombe.
+
+Le résultat (DateScan) est mis en cache par AnalysisContext.date_scan et mis au
+format de chaque appelant par :
+- extracteur.extraire_dates()
+- section_classifier.extract_date_spans()
+- heuristic_rules.extract_dates_heuristic()
+"""
+
+import re
+from bisect import bisect_right
+from typing import Iterator, List, Optional, Tuple
+
+# Import adaptatif pour patterns / cv_context
+try:
+    from extractors.patterns import compile_pattern
+    from extractors.cv_context import is_context
+except ImportError:
+    try:
+        from .patterns import compile_pattern
+        from .cv_context import is_context
+    except ImportError:
+        from patterns import compile_pattern
+        from cv_context import is_context
+
+MOIS = r"(?:Janvier|Février|Fevrier|Mars|Avril|Mai|Juin|Juillet|Août|Aout|Septembre|Octobre|Novembre|Décembre|Decembre)"
+PRESENT = r"(?:présent|actuel(?:lement)?|aujourd(?:'?hui)?)"
+
+# (type, motif) par priorité décroissante : l'ordre des alternatives de l'union
+FORMATS = [
+    ("depuis", r"depuis\s+(?:(?P<mois>\w+)\s+)?(?P<annee>(?:19|20)\d{2})"),
+    ("plage_semestre",
+     r"S(?P<semestre>\d)\s+(?P<debut>(?:19|20)\d{2})\s*[-–—]\s*(?P<fin>(?:19|20)\d{2})"),
+    ("semestre", r"S(?P<semestre>\d)\s+(?P<annee>(?:19|20)\d{2})"),
+    ("plage_mois",
+     rf"(?P<mois_debut>{MOIS})\s*(?P<debut>\d{{4}})\s*[-–—]\s*"
+     rf"(?:(?P<mois_fin>{MOIS})\s*(?P<fin>\d{{4}})|(?P<present>{PRESENT}))"),
+    # "Janvier 2019 - 2021" : plage d'années dont le début porte un mois
+    ("plage_mois_annee",
+     rf"(?P<mois>{MOIS})\s*(?P<debut>\d{{4}})\s*[-–—]\s*(?P<fin>\d{{4}})"),
+    ("mois_annee", rf"\b(?P<mois>{MOIS})\s+(?P<annee>\d{{4}})\b"),
+    ("plage_annees", rf"(?P<debut>\d{{4}})\s*[-–—]\s*(?P<fin>\d{{4}}|{PRESENT})"),
+    ("jj_mm_aaaa", r"\b(?P<jour>\d{1,2})[/-](?P<num_mois>\d{1,2})[/-](?P<annee>\d{2,4})\b"),
+    ("mm_aaaa", r"\b(?P<num_mois>\d{1,2})[/-](?P<annee>\d{4})\b"),
+    ("annee", r"(?<!\d)(?P<annee>(?:19|20)\d{2})(?!\d)"),
+]
+
+
+def _union(formats) -> str:
+    # Chaque alternative devient un groupe nommé par son type ; ses groupes
+    # internes sont préfixés ("plage_mois__debut") pour rester uniques
+    alternatives = []
+    for kind, pattern in formats:
+        pattern = re.sub(r"\(\?P<(\w+)>", rf"(?P<{kind}__\1>", pattern)
+        alternatives.append(f"(?P<{kind}>{pattern})")
+    # Une date commence par un chiffre, "S" (semestre), "depuis" ou un mois : le
+    # lookahead écarte les autres positions sans essayer chaque alternative
+    return rf"(?=[0-9sdjfmaon])(?:{'|'.join(alternatives)})"
+
+
+DATES_RX = compile_pattern("dates.union", _union(FORMATS), re.IGNORECASE)
+CHIFFRES_RX = compile_pattern("dates.chiffres", r"\d{5,}")
+CODE_POSTAL_RX = compile_pattern("dates.code_postal", r"\b\d{5}\b")
+
+
+class DateToken:
+    """Date repérée : type (voir FORMATS), position, texte et parties nommées."""
+
+    __slots__ = ("kind", "start", "end", "raw", "_match")
+
+    def __init__(self, match):
+        self.kind = match.lastgroup
+        self.start, self.end = match.span()
+        self.raw = match.group(0)
+        self._match = match
+
+    def part(self, name: str) -> Optional[str]:
+        """Partie nommée du format ("debut", "annee"...), None si absente."""
+        key = f"{self.kind}__{name}"
+        if key not in self._match.re.groupindex:
+            return None
+        return self._match.group(key)
+
+    def part_start(self, name: str) -> int:
+        return self._match.start(f"{self.kind}__{name}")
+
+    def part_span(self, name: str) -> Tuple[int, int]:
+        return self._match.span(f"{self.kind}__{name}")
+
+    def starts(self) -> List[int]:
+        """Début de la date et de chacune de ses parties présentes."""
+        prefix = f"{self.kind}__"
+        return [self.start] + [
+            self._match.start(key) for key in self._match.re.groupindex
+            if key.startswith(prefix) and self._match.start(key) >= 0
+        ]
+
+    def __repr__(self):
+        return f"DateToken({self.kind!r}, {self.start}, {self.end}, {self.raw!r})"
+
+
+class DateScan:
+    """Dates d'un texte (triées par position, sans chevauchement) et index des codes postaux."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens: List[DateToken] = [DateToken(m) for m in DATES_RX.finditer(text)]
+        # Positions où une date (ou une partie de date) commence
+        self.positions: List[int] = sorted({pos for tok in self.tokens for pos in tok.starts()})
+        # Suites d'au moins 5 chiffres (codes postaux, téléphones...)
+        self._runs: List[Tuple[int, int]] = [m.span() for m in CHIFFRES_RX.finditer(text)]
+        self._run_ends: List[int] = [end for _, end in self._runs]
+
+    def finditer(self, rx, positions: Optional[List[int]] = None) -> Iterator:
+        """
+        Équivalent de rx.finditer(text) pour un motif de date : rx n'est essayé
+        qu'aux positions du scan, les correspondances ne se chevauchent pas.
+        """
+        fin = 0
+        for pos in self.positions if positions is None else positions:
+            if pos < fin:
+                continue
+            m = rx.match(self.text, pos)
+            if m:
+                fin = max(m.end(), pos + 1)
+                yield m
+
+    def has_digits5(self, lo: int, hi: int) -> bool:
+        """True si text[lo:hi] contient 5 chiffres consécutifs."""
+        lo, hi = max(lo, 0), min(hi, len(self.text))
+        i = bisect_right(self._run_ends, lo)
+        while i < len(self._runs) and self._runs[i][0] < hi:
+            start, end = self._runs[i]
+            if min(end, hi) - max(start, lo) >= 5:
+                return True
+            i += 1
+        return False
+
+    def has_postal_code(self, lo: int, hi: int) -> bool:
+        """True si text[lo:hi] contient un nombre de 5 chiffres (code postal)."""
+        # Rare : la fenêtre n'est relue que si une suite de chiffres y tient
+        lo, hi = max(lo, 0), min(hi, len(self.text))
+        return self.has_digits5(lo, hi) and CODE_POSTAL_RX.search(self.text[lo:hi]) is not None
+
+
+def scan_dates(text: str) -> DateScan:
+    return DateScan(text)
+
+
+def date_scan_of(texte) -> DateScan:
+    """DateScan d'un texte ou d'un AnalysisContext (calculé une fois par contexte)."""
+    if is_context(texte):
+        return texte.date_scan
+    return scan_dates(texte)
@@ -0,0 +1,146 @@
+"""
+Lecture en mémoire du texte d'un CV (PDF ou DOCX).
+
+Remplace l'aller-retour PDF -> DOCX temporaire -> texte : le texte est extrait
+directement des octets du fichier, sans écriture sur disque.
+Le texte produit est le même que celui obtenu avec convert_pdf_to_docx() suivi
+de lire_cv_docx() (pages séparées par une ligne vide).
+"""
+
+import io
+import os
+import mmap
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import PyPDF2
+from docx import Document
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = {".pdf", ".docx"}
+
+# Extraction PDF parallèle : nombre de processus (1 = séquentiel) et nombre
+# minimal de pages à partir duquel le pool vaut son coût de démarrage
+PDF_WORKERS = int(os.environ.get("CV_PDF_WORKERS", "1"))
+PARALLEL_MIN_PAGES = 8
+
+
+def _page_text(text: str) -> str:
+    # python-docx transforme \r et \n en sauts de ligne : même rendu ici
+    return (text or "").replace("\r", "\n")
+
+
+@contextmanager
+def _pdf_stream(source: Union[bytes, str, Path]):
+    """Flux lisible sur un PDF : tampon mémoire pour des octets, fichier mappé (mmap) sinon."""
+    if isinstance(source, (bytes, bytearray)):
+        yield io.BytesIO(source)
+        return
+    with open(source, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        yield mm
+
+
+# Lecteur PDF propre à chaque processus du pool (ouvert une fois par processus)
+_worker_reader = None
+
+
+def _init_pdf_worker(source: Union[bytes, str]):
+    global _worker_reader
+    if isinstance(source, (bytes, bytearray)):
+        stream = io.BytesIO(source)
+    else:
+        with open(source, "rb") as f:
+            stream = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    _worker_reader = PyPDF2.PdfReader(stream)
+
+
+def _extract_pdf_page(index: int) -> str:
+    return _page_text(_worker_reader.pages[index].extract_text())
+
+
+def lire_pages_pdf(source: Union[bytes, str, Path], workers: Optional[int] = None,
+                   max_pages: Optional[int] = None) -> List[str]:
+    """
+    Texte de chaque page d'un PDF (octets ou chemin).
+
+    Args:
+        workers: nombre de processus d'extraction (défaut: CV_PDF_WORKERS). Au-delà
+            de 1, les pages sont réparties sur un pool de processus qui ouvrent
+            chacun le fichier mappé en mémoire.
+        max_pages: ne lit que les N premières pages (ex: en-tête pour nom/contact)
+    """
+    workers = PDF_WORKERS if workers is None else workers
+    if isinstance(source, Path):
+        source = str(source)
+
+    with _pdf_stream(source) as stream:
+        reader = PyPDF2.PdfReader(stream)
+        total = len(reader.pages)
+        nb_pages = total if max_pages is None else min(total, max_pages)
+
+        if workers > 1 and nb_pages >= PARALLEL_MIN_PAGES:
+            workers = min(workers, nb_pages)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_pdf_worker,
+                                     initargs=(source,)) as pool:
+                pages = list(pool.map(
+                    _extract_pdf_page, range(nb_pages),
+                    chunksize=max(1, nb_pages // (workers * 4))
+                ))
+        else:
+            pages = [_page_text(reader.pages[i].extract_text()) for i in range(nb_pages)]
+
+    logger.debug(f"PDF lu: {nb_pages}/{total} page(s), {max(workers, 1)} processus")
+    return pages
+
+
+def lire_paragraphes_docx(data: bytes) -> List[str]:
+    """Texte de chaque paragraphe d'un DOCX fourni sous forme d'octets."""
+    doc = Document(io.BytesIO(data))
+    return [paragraph.text for paragraph in doc.paragraphs]
+
+
+def lire_document(source: Union[bytes, str, Path], extension: str = None,
+                  avec_lignes: bool = False, workers: Optional[int] = None,
+                  max_pages: Optional[int] = None) -> Union[str, Tuple[str, List[Tuple[int, str]]]]:
+    """
+    Retourne le texte d'un CV PDF ou DOCX.
+
+    Args:
+        source: octets du fichier, ou chemin vers le fichier
+        extension: ".pdf" ou ".docx" (déduite du chemin si absente)
+        avec_lignes: si True, retourne aussi les lignes non vides avec leur
+            numéro de page (0 pour un DOCX) : (texte, [(page, ligne), ...])
+        workers, max_pages: voir lire_pages_pdf() (ignorés pour un DOCX)
+    """
+    if not isinstance(source, (bytes, bytearray)):
+        extension = extension or Path(source).suffix
+
+    extension = (extension or "").lower()
+    if not extension.startswith("."):
+        extension = f".{extension}"
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise ValueError(f"Format non supporté: {extension} (PDF ou DOCX uniquement)")
+
+    if extension == ".pdf":
+        pages = lire_pages_pdf(source, workers=workers, max_pages=max_pages)
+        texte = "\n\n".join(pages)
+    else:
+        if not isinstance(source, (bytes, bytearray)):
+            source = Path(source).read_bytes()
+        pages = ["\n".join(lire_paragraphes_docx(source))]
+        texte = pages[0]
+
+    if not avec_lignes:
+        return texte
+
+    lignes = [
+        (num_page, ligne.strip())
+        for num_page, page in enumerate(pages)
+        for ligne in page.split("\n")
+        if ligne.strip()
+    ]
+    return texte, lignes
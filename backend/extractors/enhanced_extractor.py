@@ -9,11 +9,31 @@ Ce module:
 
 import os
 import re
-import spacy
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 import logging
 
+# Import adaptatif pour model_registry
+try:
+    from extractors.model_registry import get_model, disabled_components
+except ImportError:
+    try:
+        from .model_registry import get_model, disabled_components
+    except ImportError:
+        from model_registry import get_model, disabled_components
+
+# Import adaptatif pour cv_context
+try:
+    from extractors.cv_context import AnalysisContext, as_context, is_context
+    from extractors.keyword_matcher import KeywordMatcher
+except ImportError:
+    try:
+        from .cv_context import AnalysisContext, as_context, is_context
+        from .keyword_matcher import KeywordMatcher
+    except ImportError:
+        from cv_context import AnalysisContext, as_context, is_context
+        from keyword_matcher import KeywordMatcher
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -23,7 +43,7 @@ logger = logging.getLogger(__name__)
 
 # Chemin vers le modèle entraîné (relatif au dossier backend)
 TRAINED_MODEL_PATH = Path(__file__).parent.parent / "models" / "cv_pipeline"
-BASE_MODEL = "fr_core_news_md"
+MODEL_NAME = "cv_pipeline"
 
 # Labels NER personnalisés
 CUSTOM_NER_LABELS = {
@@ -100,37 +120,19 @@ TECHNICAL_SKILLS = {
     "git", "jira", "confluence", "notion", "figma", "slack"
 }
 
+TECHNICAL_SKILLS_MATCHER = KeywordMatcher(sorted(TECHNICAL_SKILLS))
+
 # =============================================================================
 # CHARGEMENT DU MODÈLE
 # =============================================================================
 
-_nlp_cache = None
-
 def get_nlp():
-    """Charge le modèle spaCy (entraîné ou standard)."""
-    global _nlp_cache
-    
-    if _nlp_cache is not None:
-        return _nlp_cache
-    
-    # Essayer de charger le modèle entraîné
-    if TRAINED_MODEL_PATH.exists():
-        try:
-            _nlp_cache = spacy.load(TRAINED_MODEL_PATH)
-            logger.info(f"✓ Modèle CV entraîné chargé: {TRAINED_MODEL_PATH}")
-            return _nlp_cache
-        except Exception as e:
-            logger.warning(f"Erreur chargement modèle entraîné: {e}")
-    
-    # Fallback vers le modèle standard
-    try:
-        _nlp_cache = spacy.load(BASE_MODEL)
-        logger.info(f"✓ Modèle standard chargé: {BASE_MODEL}")
-    except OSError:
-        logger.error(f"Modèle {BASE_MODEL} non trouvé. Installation requise.")
-        raise
-    
-    return _nlp_cache
+    """
+    Retourne le modèle spaCy partagé (entraîné ou standard).
+    Le registre central garantit un seul chargement par processus et
+    réutilise le modèle déjà chargé par spacy_extractor si possible.
+    """
+    return get_model(MODEL_NAME)
 
 
 # =============================================================================
@@ -276,7 +278,7 @@ def extract_name_from_header(text: str) -> Optional[str]:
     Extrait le nom du candidat depuis l'en-tête du CV.
     Utilise des heuristiques strictes.
     """
-    lines = [l.strip() for l in text.split('\n') if l.strip()][:10]
+    lines = as_context(text).non_empty_lines[:10]
     
     for line in lines:
         # Nettoyer la ligne
@@ -325,34 +327,36 @@ def clean_name(text: str) -> str:
 def extract_skills_from_text(text: str) -> List[str]:
     """Extrait les compétences techniques du texte."""
     skills = set()
-    text_lower = text.lower()
+    text_lower = as_context(text).texte_lower
     
-    # Rechercher les compétences connues
-    for skill in TECHNICAL_SKILLS:
-        # Pattern avec limites de mots
-        pattern = rf'\b{re.escape(skill)}\b'
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            skills.add(skill.upper() if len(skill) <= 3 else skill.title())
+    # Rechercher les compétences connues (une seule passe, limites de mots)
+    for skill in TECHNICAL_SKILLS_MATCHER.matched_keywords(text_lower):
+        skills.add(skill.upper() if len(skill) <= 3 else skill.title())
     
     return sorted(skills)
 
 
-def classify_section(text: str, nlp=None) -> Tuple[str, float]:
+def classify_section(text: str, nlp=None, mode: str = "textcat") -> Tuple[str, float]:
     """
     Classifie une section de CV.
     Retourne (catégorie, score de confiance).
+    Par défaut seul le TextCat est exécuté (mode="textcat").
+    Accepte un AnalysisContext : son Doc est réutilisé s'il contient le TextCat.
     """
     if nlp is None:
         nlp = get_nlp()
     
     # Si le modèle a TextCat, l'utiliser
-    doc = nlp(text)
+    if is_context(text) and text.mode in ("textcat", "full"):
+        doc = text.doc
+    else:
+        doc = nlp(as_context(text).texte, disable=disabled_components(nlp, mode))
     if doc.cats:
         sorted_cats = sorted(doc.cats.items(), key=lambda x: x[1], reverse=True)
         return sorted_cats[0]
     
     # Sinon, utiliser des règles
-    text_lower = text.lower()
+    text_lower = as_context(text).texte_lower
     
     section_keywords = {
         "EDUCATION": ["formation", "diplôme", "université", "école", "master", "licence", "bac"],
@@ -375,7 +379,7 @@ def classify_section(text: str, nlp=None) -> Tuple[str, float]:
 # FONCTION PRINCIPALE D'EXTRACTION
 # =============================================================================
 
-def extraire_entites_ameliore(texte: str) -> Dict[str, Any]:
+def extraire_entites_ameliore(texte: str, mode: str = "ner") -> Dict[str, Any]:
     """
     Extraction d'entités améliorée combinant ML et règles.
     
@@ -388,9 +392,18 @@ def extraire_entites_ameliore(texte: str) -> Dict[str, Any]:
     - langues: Langues parlées
     - lieux: Localisations
     - dates: Dates et périodes
+    
+    Par défaut seul le composant NER est exécuté (mode="ner").
     """
-    nlp = get_nlp()
-    doc = nlp(texte)
+    ctx = as_context(texte, model=MODEL_NAME, mode=mode)
+    return extraire_entites_ameliore_doc(ctx.doc, ctx)
+
+
+def extraire_entites_ameliore_doc(doc, ctx: Optional[AnalysisContext] = None) -> Dict[str, Any]:
+    """Extraction améliorée à partir d'un Doc spaCy déjà calculé."""
+    if ctx is None:
+        ctx = AnalysisContext(doc.text, doc=doc)
+    texte = ctx.texte
     
     entites = {
         "noms": [],
@@ -465,7 +478,7 @@ def extraire_entites_ameliore(texte: str) -> Dict[str, Any]:
     
     # Nom en en-tête si non trouvé
     if not entites["noms"]:
-        name = extract_name_from_header(texte)
+        name = extract_name_from_header(ctx)
         if name:
             entites["noms"].append(name)
     
@@ -479,7 +492,7 @@ def extraire_entites_ameliore(texte: str) -> Dict[str, Any]:
                 entites["noms"].append(name_from_email)
     
     # Compétences techniques
-    skills = extract_skills_from_text(texte)
+    skills = extract_skills_from_text(ctx)
     for skill in skills:
         if skill not in entites["competences"]:
             entites["competences"].append(skill)
@@ -1,9 +1,52 @@
 import re
 
+# Import adaptatif pour le registre de motifs compilés, le repérage des dates et cv_context
+try:
+    from extractors.patterns import compile_pattern, compile_patterns
+    from extractors.date_scanner import MOIS, date_scan_of
+    from extractors.cv_context import texte_of
+except ImportError:
+    try:
+        from .patterns import compile_pattern, compile_patterns
+        from .date_scanner import MOIS, date_scan_of
+        from .cv_context import texte_of
+    except ImportError:
+        from patterns import compile_pattern, compile_patterns
+        from date_scanner import MOIS, date_scan_of
+        from cv_context import texte_of
+
+ESPACES_RX = compile_pattern("extracteur.espaces", r'\s+')
+
 def dedupliquer(liste):
     """Élimine les doublons tout en préservant l'ordre d'apparition"""
     return list(dict.fromkeys(liste))
 
+# Patterns à rejeter absolument (ligne candidate pour le nom)
+PATTERNS_REJET = [
+    r'rue\s+[A-Z][a-zéèêëîïôöûüçÀ-ÿ]+\s+[A-Z][a-zéèêëîïôöûüçÀ-ÿ]+',  # "rue Pierre Bourdan"
+    r'(?:rue|avenue|boulevard|place|chemin|impasse|allée|allee|cour|quai|avenue|passage|square|boulevard)\s+',  # Commence par mot d'adresse
+    r'\d{1,4}\s*[,\s]+(?:rue|avenue|boulevard|place|chemin|impasse|allée|allee)',  # Adresse avec numéro
+    r'rue|avenue|boulevard|place|chemin|impasse|allée|allee',  # Mot d'adresse
+    r'\d{5}(?:\s|$)',  # Code postal
+    r'Téléphone|Phone|Tel|tél|T\.',  # Téléphone
+    r'@',  # Email
+    r'Adresse',  # Adresse
+    r'Nom',  # Label Nom
+    r'(?:FORMATION|Études?|CURSUS|Scolarité|EXPÉRIENCE|Experience|PARCOURS|COMPÉTENCE|Competence|LOISIR|Intérêt|LANGUES)',  # Sections CV
+    r'(?:Responsable|Développeur|Ingénieur|Manager|Chef|Consultant|Lead|Analyst|Admin|Architecte|Directeur)',  # Mots de postes
+    r'(?:Janvier|Février|Mars|Avril|Mai|Juin|Juillet|Août|Septembre|Octobre|Novembre|Décembre)',  # Mois
+    r'20\d{2}|19\d{2}',  # Années
+]
+REJET_RX = compile_patterns("extracteur.rejet", PATTERNS_REJET, re.IGNORECASE)
+RUE_NOM_RX = compile_pattern(
+    "extracteur.rue_nom",
+    r'(?:rue|avenue|boulevard|place|chemin|impasse|allée)\s+([A-Za-zéèêëîïôöûüçÀ-ÿ]+\s+[A-Za-zéèêëîïôöûüçÀ-ÿ]+)',
+    re.IGNORECASE,
+)
+NETTOYAGE_NOM_RX = compile_pattern("extracteur.nettoyage_nom", r'[0-9\(\)\.,;:│]')
+CHIFFRE_RX = compile_pattern("extracteur.chiffre", r'\d')
+EMAIL_NOM_RX = compile_pattern("extracteur.email_nom", r'([a-zA-Z]+)[._]([a-zA-Z]+)@')
+
 def extraire_nom_prenom(texte):
     """Extrait le nom et prénom (généralement en début du CV)"""
     lignes = texte.strip().split('\n')
@@ -14,35 +57,17 @@ def extraire_nom_prenom(texte):
     # D'abord, extraire toutes les adresses pour vérification croisée
     texte_lower = texte.lower()
     
-    # Patterns à rejeter absolument
-    patterns_rejet = [
-        r'rue\s+[A-Z][a-zéèêëîïôöûüçÀ-ÿ]+\s+[A-Z][a-zéèêëîïôöûüçÀ-ÿ]+',  # "rue Pierre Bourdan"
-        r'(?:rue|avenue|boulevard|place|chemin|impasse|allée|allee|cour|quai|avenue|passage|square|boulevard)\s+',  # Commence par mot d'adresse
-        r'\d{1,4}\s*[,\s]+(?:rue|avenue|boulevard|place|chemin|impasse|allée|allee)',  # Adresse avec numéro
-        r'rue|avenue|boulevard|place|chemin|impasse|allée|allee',  # Mot d'adresse
-        r'\d{5}(?:\s|$)',  # Code postal
-        r'Téléphone|Phone|Tel|tél|T\.',  # Téléphone
-        r'@',  # Email
-        r'Adresse',  # Adresse
-        r'Nom',  # Label Nom
-        r'(?:FORMATION|Études?|CURSUS|Scolarité|EXPÉRIENCE|Experience|PARCOURS|COMPÉTENCE|Competence|LOISIR|Intérêt|LANGUES)',  # Sections CV
-        r'(?:Responsable|Développeur|Ingénieur|Manager|Chef|Consultant|Lead|Analyst|Admin|Architecte|Directeur)',  # Mots de postes
-        r'(?:Janvier|Février|Mars|Avril|Mai|Juin|Juillet|Août|Septembre|Octobre|Novembre|Décembre)',  # Mois
-        r'20\d{2}|19\d{2}',  # Années
-    ]
-    
     # Trouver les noms qui apparaissent dans une adresse (à exclure)
     noms_dans_adresse = set()
-    pattern_rue_nom = r'(?:rue|avenue|boulevard|place|chemin|impasse|allée)\s+([A-Za-zéèêëîïôöûüçÀ-ÿ]+\s+[A-Za-zéèêëîïôöûüçÀ-ÿ]+)'
-    for match in re.finditer(pattern_rue_nom, texte, re.IGNORECASE):
+    for match in RUE_NOM_RX.finditer(texte):
         nom_rue = match.group(1).strip().lower()
         noms_dans_adresse.add(nom_rue)
     
     for ligne in lignes[:5]:  # Chercher dans les 5 premières lignes
         # Rejeter si contient un pattern suspect
         rejet = False
-        for pattern in patterns_rejet:
-            if re.search(pattern, ligne, re.IGNORECASE):
+        for pattern in REJET_RX:
+            if pattern.search(ligne):
                 rejet = True
                 break
         
@@ -54,8 +79,8 @@ def extraire_nom_prenom(texte):
             continue
         
         # Nettoyer la ligne (retirer chiffres et caractères spéciaux SAUF tirets)
-        nom_prenom = re.sub(r'[0-9\(\)\.,;:│]', '', ligne).strip()
-        nom_prenom = re.sub(r'\s+', ' ', nom_prenom)  # Normaliser les espaces
+        nom_prenom = NETTOYAGE_NOM_RX.sub('', ligne).strip()
+        nom_prenom = ESPACES_RX.sub(' ', nom_prenom)  # Normaliser les espaces
         
         # Vérifier que c'est un vrai nom
         mots = nom_prenom.split()
@@ -70,7 +95,7 @@ def extraire_nom_prenom(texte):
                 # Vérifier que chaque mot commence par une majuscule (ou un caractère accentué majuscule)
                 if all(mot[0].isupper() or mot[0] in 'ÀÂÄÆÉÈÊËÏÎÔŒÙÛÜŒÇÑ' for mot in mots):
                     # Rejeter les lignes qui contiendraient des nombres cachés
-                    if not re.search(r'\d', ligne):
+                    if not CHIFFRE_RX.search(ligne):
                         nom_candidat = ' '.join(mots)
                         
                         # VÉRIFICATION CROISÉE : rejeter si ce nom apparaît dans une adresse
@@ -78,7 +103,7 @@ def extraire_nom_prenom(texte):
                             return nom_candidat
     
     # Si pas de nom trouvé, essayer d'extraire depuis l'email
-    email_match = re.search(r'([a-zA-Z]+)[._]([a-zA-Z]+)@', texte)
+    email_match = EMAIL_NOM_RX.search(texte)
     if email_match:
         prenom = email_match.group(1).capitalize()
         nom = email_match.group(2).capitalize()
@@ -87,13 +112,30 @@ def extraire_nom_prenom(texte):
     
     return None
 
+SECTION_FORMATION_RX = compile_pattern(
+    "extracteur.section_formation",
+    r'(?:FORMATION|Études?|CURSUS|Scolarité)[\s\n:=]*(.*?)(?=\n(?:EXPÉRIENCE|Experience|COMPÉTENCE|Competence|LOISIR|Intérêt|LANGUES|SKILLS|$))',
+    re.IGNORECASE | re.DOTALL,
+)
+# Patterns pour extraire les formations
+FORMATION_RX = compile_patterns("extracteur.formation", [
+    r"((?:Master|Licence|Bac\+[0-9]|Bac|Diplôme|Diplome|Bachelor|BTS|DUT|DEUST|Certificat|Certification)(?:\s+(?:en|d'|de|du|des))?\s+[A-Za-zéèêëîïôöûüçÀ-ÿ\s\-\']+?)(?:\s*[-–—]|\n|\s*[-–—]\s*|[\(\[])",
+    r"((?:Université|Ecole|École|Institut|Institiut|Académie)\s+[A-Za-zéèêëîïôöûüçÀ-ÿ\s\-\'\.]+?)(?:\s*[-–—]|\n|[\(\[]|$)",
+], re.IGNORECASE)
+PARENTHESES_RX = compile_pattern("extracteur.parentheses", r'[\(\[].*?[\)\]]')
+MOTS_POSTE_RX = compile_pattern(
+    "extracteur.mots_poste",
+    r'(?:Développeur|Ingénieur|Manager|Chef|Consultant|Responsable|Lead|Analyst|Admin|Architecte|Poste|Titre)\b',
+    re.IGNORECASE,
+)
+CONTACT_RX = compile_pattern("extracteur.contact", r'^\d+|Téléphone|Email|rue|avenue', re.IGNORECASE)
+
 def extraire_formations(texte):
     """Extrait les formations (diplômes, écoles, certifications)"""
     formations = []
     
     # Trouver la section FORMATION
-    pattern_section = r'(?:FORMATION|Études?|CURSUS|Scolarité)[\s\n:=]*(.*?)(?=\n(?:EXPÉRIENCE|Experience|COMPÉTENCE|Competence|LOISIR|Intérêt|LANGUES|SKILLS|$))'
-    match_section = re.search(pattern_section, texte, re.IGNORECASE | re.DOTALL)
+    match_section = SECTION_FORMATION_RX.search(texte)
     
     if match_section:
         section_formation = match_section.group(1)
@@ -101,196 +143,264 @@ def extraire_formations(texte):
         # Si pas de section claire, utiliser tout le texte
         section_formation = texte
     
-    # Patterns pour extraire les formations
-    patterns = [
-        r"((?:Master|Licence|Bac\+[0-9]|Bac|Diplôme|Diplome|Bachelor|BTS|DUT|DEUST|Certificat|Certification)(?:\s+(?:en|d'|de|du|des))?\s+[A-Za-zéèêëîïôöûüçÀ-ÿ\s\-\']+?)(?:\s*[-–—]|\n|\s*[-–—]\s*|[\(\[])",
-        r"((?:Université|Ecole|École|Institut|Institiut|Académie)\s+[A-Za-zéèêëîïôöûüçÀ-ÿ\s\-\'\.]+?)(?:\s*[-–—]|\n|[\(\[]|$)",
-    ]
     
-    for pattern in patterns:
-        for match in re.finditer(pattern, section_formation, re.IGNORECASE):
+    for pattern in FORMATION_RX:
+        for match in pattern.finditer(section_formation):
             formation = match.group(1).strip()
-            formation = re.sub(r'\s+', ' ', formation)
-            formation = re.sub(r'[\(\[].*?[\)\]]', '', formation).strip()
+            formation = ESPACES_RX.sub(' ', formation)
+            formation = PARENTHESES_RX.sub('', formation).strip()
             
             # Filtrer les entrées invalides
             if len(formation) > 5 and len(formation) < 100 and formation not in formations:
                 # Rejeter si contient des mots d'expérience
-                if not re.search(r'(?:Développeur|Ingénieur|Manager|Chef|Consultant|Responsable|Lead|Analyst|Admin|Architecte|Poste|Titre)\b', formation, re.IGNORECASE):
-                    if not re.search(r'^\d+|Téléphone|Email|rue|avenue', formation, re.IGNORECASE):
+                if not MOTS_POSTE_RX.search(formation):
+                    if not CONTACT_RX.search(formation):
                         formations.append(formation)
     
     return dedupliquer(formations)
 
+SECTION_EXPERIENCE_RX = compile_pattern(
+    "extracteur.section_experience",
+    r'(?:EXPÉRIENCE|Experience|PARCOURS|HISTORIQUE|Expériences)[\s\n:=]*(.*?)(?=\n(?:FORMATION|COMPÉTENCE|Competence|LOISIR|Intérêt|LANGUES|$))',
+    re.IGNORECASE | re.DOTALL,
+)
+# Mots clés pour identifier les postes
+POSTES_KEYWORDS = r'(?:Développeur|Ingénieur|Manager|Chef|Consultant|Responsable|Lead|Analyst|Admin|Architecte|Directeur|Coordinateur|Spécialiste|Agent|Technicien|Employé)'
+# "Poste - Entreprise" sur la MÊME LIGNE
+POSTE_ENTREPRISE_RX = compile_pattern(
+    "extracteur.poste_entreprise",
+    rf'({POSTES_KEYWORDS}[A-Za-zéèêëîïôöûüçÀ-ÿ\s\-\']*?)\s*[-–—]\s*([A-Za-zéèêëîïôöûüçÀ-ÿ0-9\s\-\'\.]+?)$',
+    re.IGNORECASE,
+)
+MOTS_FORMATION_RX = compile_pattern(
+    "extracteur.mots_formation", r'Master|Licence|Bac|Diplôme|Ecole|Université|BTS|DUT', re.IGNORECASE
+)
+
 def extraire_experiences(texte):
     """Extrait les expériences professionnelles"""
     experiences = []
     
     # Trouver la section EXPÉRIENCE
-    pattern_section = r'(?:EXPÉRIENCE|Experience|PARCOURS|HISTORIQUE|Expériences)[\s\n:=]*(.*?)(?=\n(?:FORMATION|COMPÉTENCE|Competence|LOISIR|Intérêt|LANGUES|$))'
-    match_section = re.search(pattern_section, texte, re.IGNORECASE | re.DOTALL)
+    match_section = SECTION_EXPERIENCE_RX.search(texte)
     
     if match_section:
         section_exp = match_section.group(1)
     else:
         section_exp = texte
     
-    # Mots clés pour identifier les postes
-    postes_keywords = r'(?:Développeur|Ingénieur|Manager|Chef|Consultant|Responsable|Lead|Analyst|Admin|Architecte|Directeur|Coordinateur|Spécialiste|Agent|Technicien|Employé)'
-    
-    # Chercher: "Poste - Entreprise" sur la MÊME LIGNE
-    pattern = rf'({postes_keywords}[A-Za-zéèêëîïôöûüçÀ-ÿ\s\-\']*?)\s*[-–—]\s*([A-Za-zéèêëîïôöûüçÀ-ÿ0-9\s\-\'\.]+?)$'
-    
     for line in section_exp.split('\n'):
         line = line.strip()
         if not line or len(line) < 10:
             continue
             
-        match = re.search(pattern, line, re.IGNORECASE)
+        match = POSTE_ENTREPRISE_RX.search(line)
         if match:
             poste = match.group(1).strip()
             entreprise = match.group(2).strip()
             
             experience = f"{poste} - {entreprise}"
-            experience = re.sub(r'\s+', ' ', experience)
+            experience = ESPACES_RX.sub(' ', experience)
             
             # Filtrer
             if len(experience) > 10 and len(experience) < 150 and experience not in experiences:
                 # Rejeter si contient des mots de formation
-                if not re.search(r'Master|Licence|Bac|Diplôme|Ecole|Université|BTS|DUT', experience, re.IGNORECASE):
+                if not MOTS_FORMATION_RX.search(experience):
                     experiences.append(experience)
     
     return dedupliquer(experiences)
 
+TITRE_LOISIRS_RX = compile_pattern(
+    "extracteur.titre_loisirs",
+    r'(?:Loisir|Intérêt|Centre d[\'e] intérêt|Passion|Hobby|Activité|Activites|Sports?|Divers)[\s,]*[:\-]?',
+    re.IGNORECASE,
+)
+FIN_LOISIRS_RX = compile_pattern(
+    "extracteur.fin_loisirs", r'(?:Référence|Contact|Signature|Disponibilité)', re.IGNORECASE
+)
+SEPARATEURS_RX = compile_pattern("extracteur.separateurs", r'[,;•\-\n]')
+LOISIR_INVALIDE_RX = compile_pattern("extracteur.loisir_invalide", r'^\d+|email|@|\d{5}', re.IGNORECASE)
+MOT_LIAISON_RX = compile_pattern("extracteur.mot_liaison", r'^(?:et|ou|de|d[\'e]|à|en)\s', re.IGNORECASE)
+
 def extraire_loisirs(texte):
     """Extrait les loisirs et centres d'intérêt"""
     loisirs = []
     
-    sections = re.split(r'(?:Loisir|Intérêt|Centre d[\'e] intérêt|Passion|Hobby|Activité|Activites|Sports?|Divers)[\s,]*[:\-]?', texte, flags=re.IGNORECASE)
+    sections = TITRE_LOISIRS_RX.split(texte)
     
     if len(sections) > 1:
         section_loisirs = sections[-1]
-        section_loisirs = re.split(r'(?:Référence|Contact|Signature|Disponibilité)', section_loisirs, flags=re.IGNORECASE)[0]
+        section_loisirs = FIN_LOISIRS_RX.split(section_loisirs)[0]
         
-        items = re.split(r'[,;•\-\n]', section_loisirs)
+        items = SEPARATEURS_RX.split(section_loisirs)
         for item in items:
             item = item.strip()
             if len(item) > 2 and len(item) < 100:
-                if not re.search(r'^\d+|email|@|\d{5}', item, re.IGNORECASE):
-                    if not re.search(r'^(?:et|ou|de|d[\'e]|à|en)\s', item, re.IGNORECASE):
+                if not LOISIR_INVALIDE_RX.search(item):
+                    if not MOT_LIAISON_RX.search(item):
                         loisirs.append(item)
     
     return dedupliquer(loisirs)
 
+# Formats de dates retenus, vérifiés à la position de chaque date du scan
+PLAGE_ANNEES_RX = compile_pattern(
+    "extracteur.plage_annees",
+    r'((?:19|20)\d{2})\s*[-–—]\s*((?:19|20)\d{2}|[Pp]résent|[Aa]ctuel(?:lement)?|[Aa]ujourd)',
+)
+PLAGE_MOIS_RX = compile_pattern(
+    "extracteur.plage_mois",
+    rf"({MOIS})\s*(\d{{4}})\s*[-–—]\s*(?:({MOIS})\s*(\d{{4}})|([Pp]résent|[Aa]ctuel(?:lement)?))",
+    re.IGNORECASE,
+)
+MOIS_ANNEE_RX = compile_pattern("extracteur.mois_annee", rf"\b({MOIS})\s+((?:19|20)\d{{2}})\b", re.IGNORECASE)
+JJ_MM_AAAA_RX = compile_pattern(
+    "extracteur.jj_mm_aaaa", r'\b(0?[1-9]|[12][0-9]|3[01])[-/](0?[1-9]|1[012])[-/]((?:19|20)\d{2})\b'
+)
+MM_AAAA_RX = compile_pattern("extracteur.mm_aaaa", r'\b(0?[1-9]|1[012])[-/]((?:19|20)\d{2})\b')
+ANNEE_SEULE_RX = compile_pattern("extracteur.annee_seule", r'(?<!\d)(?<!/)(?<![/-])((?:19|20)\d{2})(?!\d)(?!/|-)')
+
 def extraire_dates(texte):
-    """Trouve toutes les dates dans un texte avec différents formats"""
+    """
+    Trouve toutes les dates dans un texte avec différents formats.
+    Les formats ne sont essayés qu'aux positions repérées par date_scanner ;
+    avec un AnalysisContext, ce parcours est partagé avec section_classifier
+    et heuristic_rules.
+    """
+    scan = date_scan_of(texte)
     dates = []
+    # Tests d'inclusion "x in d for d in dates" remplacés par des ensembles tenus à
+    # jour à chaque ajout (coût constant par date au lieu d'un parcours de la liste) :
+    # - mois_annees : les "Mois AAAA" contenus dans les dates déjà retenues ;
+    # - fenetres : toutes les sous-chaînes de 4 caractères des dates retenues, donc
+    #   toute année (4 chiffres) contenue dans l'une d'elles.
+    mois_annees = set()
+    fenetres = set()
+
+    def ajouter(date_str, *fragments):
+        dates.append(date_str)
+        mois_annees.update(fragments)
+        fenetres.update(date_str[i:i + 4] for i in range(len(date_str) - 3))
     
     # Format AAAA-AAAA / AAAA–AAAA (plages d'années) - priorité haute
-    pattern_plage = r'((?:19|20)\d{2})\s*[-–—]\s*((?:19|20)\d{2}|[Pp]résent|[Aa]ctuel(?:lement)?|[Aa]ujourd)'
-    for m in re.finditer(pattern_plage, texte):
+    for m in scan.finditer(PLAGE_ANNEES_RX):
         debut, fin = m.group(1), m.group(2)
         if fin.lower() in ('présent', 'present', 'actuel', 'actuellement', 'aujourd'):
-            dates.append(f"{debut} - Présent")
+            ajouter(f"{debut} - Présent")
         else:
-            dates.append(f"{debut}-{fin}")
+            ajouter(f"{debut}-{fin}")
     
     # Format Mois AAAA - Mois AAAA ou Mois AAAA - Présent
-    mois = r"(?:Janvier|Février|Fevrier|Mars|Avril|Mai|Juin|Juillet|Août|Aout|Septembre|Octobre|Novembre|Décembre|Decembre)"
-    pattern_mois_plage = rf"({mois})\s*(\d{{4}})\s*[-–—]\s*(?:({mois})\s*(\d{{4}})|([Pp]résent|[Aa]ctuel(?:lement)?))"
-    for m in re.finditer(pattern_mois_plage, texte, re.IGNORECASE):
+    for m in scan.finditer(PLAGE_MOIS_RX):
         mois_deb, annee_deb = m.group(1), m.group(2)
         if m.group(5):
-            dates.append(f"{mois_deb} {annee_deb} - Présent")
+            ajouter(f"{mois_deb} {annee_deb} - Présent", f"{mois_deb} {annee_deb}")
         elif m.group(3) and m.group(4):
-            dates.append(f"{mois_deb} {annee_deb} - {m.group(3)} {m.group(4)}")
+            ajouter(f"{mois_deb} {annee_deb} - {m.group(3)} {m.group(4)}",
+                    f"{mois_deb} {annee_deb}", f"{m.group(3)} {m.group(4)}")
     
-    # Format Mois AAAA seul (ex: Mars 2026)
-    pattern_mois_seul = rf"\b({mois})\s+((?:19|20)\d{{2}})\b"
-    for m in re.finditer(pattern_mois_seul, texte, re.IGNORECASE):
+    # Format Mois AAAA seul (ex: Mars 2026), s'il n'est pas déjà dans une plage
+    for m in scan.finditer(MOIS_ANNEE_RX):
         date_str = f"{m.group(1)} {m.group(2)}"
-        if date_str not in dates and not any(date_str in d for d in dates):
-            dates.append(date_str)
+        if date_str not in mois_annees:
+            ajouter(date_str, date_str)
     
-    # Format JJ/MM/AAAA ou JJ-MM-AAAA
-    pattern_jma = r'\b(0?[1-9]|[12][0-9]|3[01])[-/](0?[1-9]|1[012])[-/]((?:19|20)\d{2})\b'
-    for m in re.finditer(pattern_jma, texte):
+    # Format JJ/MM/AAAA ou JJ-MM-AAAA (éviter confusion avec codes postaux)
+    for m in scan.finditer(JJ_MM_AAAA_RX):
         start_pos = m.start()
-        if not re.search(r'\d{5}', texte[max(0,start_pos-10):start_pos+15]):
-            dates.append(f"{m.group(1).zfill(2)}/{m.group(2).zfill(2)}/{m.group(3)}")
+        if not scan.has_digits5(start_pos - 10, start_pos + 15):
+            ajouter(f"{m.group(1).zfill(2)}/{m.group(2).zfill(2)}/{m.group(3)}")
     
-    # Format MM/AAAA ou MM-AAAA (éviter confusion avec codes postaux)
-    pattern_ma = r'\b(0?[1-9]|1[012])[-/]((?:19|20)\d{2})\b'
-    for m in re.finditer(pattern_ma, texte):
+    # Format MM/AAAA ou MM-AAAA
+    emises = set(dates)
+    for m in scan.finditer(MM_AAAA_RX):
         start_pos = m.start()
-        window = texte[max(0,start_pos-15):start_pos+20]
-        if not re.search(r'\d{5}', window):
+        if not scan.has_digits5(start_pos - 15, start_pos + 20):
             date_str = f"{m.group(1).zfill(2)}/{m.group(2)}"
-            if date_str not in dates:
-                dates.append(date_str)
+            if date_str not in emises:
+                emises.add(date_str)
+                ajouter(date_str)
     
-    # Années seules (contexte CV : éviter codes postaux)
-    pattern_annee = r'(?<!\d)(?<!/)(?<![/-])((?:19|20)\d{2})(?!\d)(?!/|-)'
-    for m in re.finditer(pattern_annee, texte):
+    # Années seules (contexte CV : éviter codes postaux), si absentes des dates retenues
+    for m in scan.finditer(ANNEE_SEULE_RX):
         annee = m.group(1)
         start_pos = m.start()
-        window = texte[max(0,start_pos-20):start_pos+25]
-        if not re.search(r'\d{5}', window) and annee not in dates:
-            if not any(annee in d for d in dates):
-                dates.append(annee)
+        if not scan.has_digits5(start_pos - 20, start_pos + 25) and annee not in fenetres:
+            ajouter(annee)
     
     return dedupliquer(dates)
 
+EMAIL_RX = compile_pattern("extracteur.email", r'[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}')
+PONCTUATION_BORDS_RX = compile_pattern("extracteur.ponctuation_bords", r'^[.\-_]+|[.\-_]+$')
+
 def extraire_email(texte):
     """Trouve tous les emails dans un texte avec nettoyage"""
-    pattern = r'[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}'
     emails = []
-    for m in re.finditer(pattern, texte):
+    for m in EMAIL_RX.finditer(texte):
         email = m.group(0).strip().lower()
-        email = re.sub(r'^[.\-_]+|[.\-_]+$', '', email)
+        email = PONCTUATION_BORDS_RX.sub('', email)
         if email and '@' in email and '.' in email.split('@')[1]:
             emails.append(email)
     return dedupliquer(emails)
 
+TELEPHONE_RX = compile_patterns("extracteur.telephone", [
+    r'(?:\+33|0033|0)\s*[1-9](?:[\s.\-]*\d{2}){4}',
+    r'\+?\d{1,3}[\s.\-]?\(?\d{1,4}\)?[\s.\-]?\d{2,4}[\s.\-]?\d{2,4}[\s.\-]?\d{2,4}',
+])
+SEPARATEURS_TEL_RX = compile_pattern("extracteur.separateurs_tel", r'[\s.\-()]')
+ESPACES_TEL_RX = compile_pattern("extracteur.espaces_tel", r'[\s.\-]+')
+
 def extraire_telephone(texte):
     """Trouve tous les numéros de téléphone dans un texte avec normalisation"""
-    patterns = [
-        r'(?:\+33|0033|0)\s*[1-9](?:[\s.\-]*\d{2}){4}',
-        r'\+?\d{1,3}[\s.\-]?\(?\d{1,4}\)?[\s.\-]?\d{2,4}[\s.\-]?\d{2,4}[\s.\-]?\d{2,4}',
-    ]
     telephones = []
-    for pattern in patterns:
-        for m in re.finditer(pattern, texte):
+    for pattern in TELEPHONE_RX:
+        for m in pattern.finditer(texte):
             tel = m.group(0).strip()
-            tel_clean = re.sub(r'[\s.\-()]', '', tel)
+            tel_clean = SEPARATEURS_TEL_RX.sub('', tel)
             if len(tel_clean) >= 10 and len(tel_clean) <= 15:
-                tel_format = re.sub(r'[\s.\-]+', ' ', tel).strip()
+                tel_format = ESPACES_TEL_RX.sub(' ', tel).strip()
                 if tel_format not in telephones:
                     telephones.append(tel_format)
     return dedupliquer(telephones)
 
+ADRESSE_RX = compile_patterns("extracteur.adresse", [
+    r'\b(\d{1,4}[,\s]+(?:rue|avenue|boulevard|av\.?|bd\.?|place|chemin|impasse|allée|allee|passage|quai|route)[\s,]+[A-Za-zéèêëîïôöûüçÀ-ÿ\s\-\']+[,\s]+\d{5}[\s,]+[A-Za-zéèêëîïôöûüçÀ-ÿ\s\-\']+)',
+    r'\b(\d{1,4}[,\s]+(?:rue|avenue|boulevard|av\.?|bd\.?|place|chemin|impasse|allée|allee)[\s,]+[A-Za-zéèêëîïôöûüçÀ-ÿ\s\-\']{3,50})(?=[\s\n,]|$)',
+    r'\b(\d{5})[\s,]+([A-Za-zéèêëîïôöûüçÀ-ÿ][A-Za-zéèêëîïôöûüçÀ-ÿ\s\-\']{2,30})(?=[\s,\n]|$)',
+], re.IGNORECASE)
+ESPACES_FIN_RX = compile_pattern("extracteur.espaces_fin", r'[\s]+$')
+SUITE_CONTACT_RX = compile_pattern("extracteur.suite_contact", r'(?:Téléphone|Email|Tel|tél).*$')
+MOTS_CONTACT_RX = compile_pattern("extracteur.mots_contact", r'\b(?:Tel|Email|@|www\.)\b', re.IGNORECASE)
+
 def extraire_adresse(texte):
     """Trouve les adresses dans un texte avec patterns améliorés"""
-    patterns = [
-        r'\b(\d{1,4}[,\s]+(?:rue|avenue|boulevard|av\.?|bd\.?|place|chemin|impasse|allée|allee|passage|quai|route)[\s,]+[A-Za-zéèêëîïôöûüçÀ-ÿ\s\-\']+[,\s]+\d{5}[\s,]+[A-Za-zéèêëîïôöûüçÀ-ÿ\s\-\']+)',
-        r'\b(\d{1,4}[,\s]+(?:rue|avenue|boulevard|av\.?|bd\.?|place|chemin|impasse|allée|allee)[\s,]+[A-Za-zéèêëîïôöûüçÀ-ÿ\s\-\']{3,50})(?=[\s\n,]|$)',
-        r'\b(\d{5})[\s,]+([A-Za-zéèêëîïôöûüçÀ-ÿ][A-Za-zéèêëîïôöûüçÀ-ÿ\s\-\']{2,30})(?=[\s,\n]|$)',
-    ]
     
     adresses = []
-    for i, pattern in enumerate(patterns):
-        for match in re.finditer(pattern, texte, re.IGNORECASE):
+    for i, pattern in enumerate(ADRESSE_RX):
+        for match in pattern.finditer(texte):
             if i == 2:
                 adresse = f"{match.group(1)} {match.group(2)}"
             else:
                 adresse = match.group(1)
             
-            adresse = re.sub(r'\s+', ' ', adresse.strip())
-            adresse = re.sub(r'[\s]+$', '', adresse)
-            adresse = re.sub(r'(?:Téléphone|Email|Tel|tél).*$', '', adresse).strip()
+            adresse = ESPACES_RX.sub(' ', adresse.strip())
+            adresse = ESPACES_FIN_RX.sub('', adresse)
+            adresse = SUITE_CONTACT_RX.sub('', adresse).strip()
             
             if len(adresse) > 5 and adresse not in adresses:
-                if not re.search(r'\b(?:Tel|Email|@|www\.)\b', adresse, re.IGNORECASE):
+                if not MOTS_CONTACT_RX.search(adresse):
                     adresses.append(adresse)
     
-    return dedupliquer(adresses)
\ No newline at end of file
+    return dedupliquer(adresses)
+
+
+def extraire_infos_cv(texte_cv):
+    """
+    Retourne les données brutes extraites d'un texte de CV.
+    Avec un AnalysisContext, le repérage des dates est partagé avec build_structured_json().
+    """
+    texte = texte_of(texte_cv)
+    return {
+        "dates": extraire_dates(texte_cv),
+        "emails": extraire_email(texte),
+        "telephones": extraire_telephone(texte),
+        "adresses": extraire_adresse(texte)
+    }
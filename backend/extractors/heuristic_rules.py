@@ -13,6 +13,27 @@ import re
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
+# Import adaptatif pour cv_context
+try:
+    from extractors.cv_context import texte_of
+except ImportError:
+    try:
+        from .cv_context import texte_of
+    except ImportError:
+        from cv_context import texte_of
+
+# Import adaptatif pour le registre de motifs compilés et le repérage des dates
+try:
+    from extractors.patterns import compile_pattern, compile_patterns
+    from extractors.date_scanner import date_scan_of
+except ImportError:
+    try:
+        from .patterns import compile_pattern, compile_patterns
+        from .date_scanner import date_scan_of
+    except ImportError:
+        from patterns import compile_pattern, compile_patterns
+        from date_scanner import date_scan_of
+
 # =============================================================================
 # PATTERNS DE DATES
 # =============================================================================
@@ -39,6 +60,8 @@ DATE_PATTERNS = {
     "since": r"[Dd]epuis\s+(?:(?P<month>\w+)\s+)?(?P<year>(?:19|20)\d{2})",
 }
 
+DATE_RX = compile_patterns("heuristic.date", DATE_PATTERNS, re.IGNORECASE)
+
 MONTHS_FR = {
     "janvier": 1, "février": 2, "fevrier": 2, "mars": 3, "avril": 4,
     "mai": 5, "juin": 6, "juillet": 7, "août": 8, "aout": 8,
@@ -74,6 +97,8 @@ JOB_TITLE_PATTERNS = [
     r"(?P<title>Alternance?\s+(?:Développeur|Developpeur|Ingénieur|Data)(?:\s+\w+)?)",
 ]
 
+JOB_TITLE_RX = compile_patterns("heuristic.job_title", JOB_TITLE_PATTERNS, re.IGNORECASE)
+
 # Mots-clés de postes
 JOB_KEYWORDS = {
     "senior_titles": ["lead", "senior", "principal", "staff", "chief", "head", "director", "manager"],
@@ -121,6 +146,8 @@ DIPLOMA_PATTERNS = [
     r"(?P<diploma>(?:Certification|Certified)\s+(?:\w+(?:\s+\w+){0,3}))",
 ]
 
+DIPLOMA_RX = compile_patterns("heuristic.diploma", DIPLOMA_PATTERNS, re.IGNORECASE)
+
 DIPLOMA_KEYWORDS = [
     "master", "licence", "bachelor", "ingénieur", "ingenieur", "doctorat", "phd",
     "mba", "bts", "dut", "but", "bac", "baccalauréat", "prépa", "cpge",
@@ -151,6 +178,8 @@ SCHOOL_PATTERNS = [
     r"(?P<school>Lycée\s+(?:[A-ZÀ-Ü][a-zà-ÿ]+(?:[\s\-][A-Za-zÀ-ÿ]+)*))",
 ]
 
+SCHOOL_RX = compile_patterns("heuristic.school", SCHOOL_PATTERNS, re.IGNORECASE)
+
 SCHOOL_KEYWORDS = [
     "université", "universite", "university", "école", "ecole", "school",
     "lycée", "lycee", "iut", "institut", "faculty", "faculté", "campus",
@@ -174,6 +203,8 @@ COMPANY_PATTERNS = [
     r"(?P<company>[A-ZÀ-Ü][A-Za-zÀ-ÿ]+(?:\s+[A-Za-zÀ-ÿ]+)?)\s*[-–—]\s*(?:Ingénieur|Développeur|Consultant|Stage|Alternance)",
 ]
 
+COMPANY_RX = compile_patterns("heuristic.company", COMPANY_PATTERNS, re.IGNORECASE)
+
 COMPANY_KEYWORDS = [
     "sopra", "steria", "capgemini", "accenture", "atos", "cgi", "ibm", "microsoft",
     "google", "amazon", "meta", "apple", "oracle", "sap", "salesforce",
@@ -192,10 +223,12 @@ def extract_dates_heuristic(text: str) -> List[Dict]:
     Returns:
         List[Dict] avec: raw, start, end, normalized, type (range/single/semester)
     """
+    scan = date_scan_of(text)
     results = []
     
+    # Chaque motif n'est essayé qu'aux positions des dates du scan partagé
     # Plages d'années
-    for match in re.finditer(DATE_PATTERNS["range_year"], text, re.IGNORECASE):
+    for match in scan.finditer(DATE_RX["range_year"]):
         results.append({
             "raw": match.group(0),
             "start_pos": match.start(),
@@ -206,7 +239,7 @@ def extract_dates_heuristic(text: str) -> List[Dict]:
         })
     
     # Semestres
-    for match in re.finditer(DATE_PATTERNS["semester"], text, re.IGNORECASE):
+    for match in scan.finditer(DATE_RX["semester"]):
         sem = match.group("sem")
         year = match.group("year")
         results.append({
@@ -219,7 +252,7 @@ def extract_dates_heuristic(text: str) -> List[Dict]:
         })
     
     # Semestres avec plage
-    for match in re.finditer(DATE_PATTERNS["semester_range"], text, re.IGNORECASE):
+    for match in scan.finditer(DATE_RX["semester_range"]):
         results.append({
             "raw": match.group(0),
             "start_pos": match.start(),
@@ -231,7 +264,7 @@ def extract_dates_heuristic(text: str) -> List[Dict]:
         })
     
     # "depuis X"
-    for match in re.finditer(DATE_PATTERNS["since"], text, re.IGNORECASE):
+    for match in scan.finditer(DATE_RX["since"]):
         results.append({
             "raw": match.group(0),
             "start_pos": match.start(),
@@ -256,10 +289,11 @@ def extract_job_title_heuristic(text: str) -> List[Dict]:
     """
     Extrait les postes/titres de fonction avec patterns heuristiques.
     """
+    text = texte_of(text)
     results = []
     
-    for pattern in JOB_TITLE_PATTERNS:
-        for match in re.finditer(pattern, text, re.IGNORECASE):
+    for pattern in JOB_TITLE_RX:
+        for match in pattern.finditer(text):
             title = match.group("title").strip()
             # Normaliser la casse
             title = title.title()
@@ -277,10 +311,11 @@ def extract_diploma_heuristic(text: str) -> List[Dict]:
     """
     Extrait les diplômes avec patterns heuristiques.
     """
+    text = texte_of(text)
     results = []
     
-    for pattern in DIPLOMA_PATTERNS:
-        for match in re.finditer(pattern, text, re.IGNORECASE):
+    for pattern in DIPLOMA_RX:
+        for match in pattern.finditer(text):
             diploma = match.group("diploma").strip()
             results.append({
                 "raw": match.group(0),
@@ -296,10 +331,11 @@ def extract_school_heuristic(text: str) -> List[Dict]:
     """
     Extrait les écoles/universités avec patterns heuristiques.
     """
+    text = texte_of(text)
     results = []
     
-    for pattern in SCHOOL_PATTERNS:
-        for match in re.finditer(pattern, text, re.IGNORECASE):
+    for pattern in SCHOOL_RX:
+        for match in pattern.finditer(text):
             school = match.group("school").strip()
             results.append({
                 "raw": match.group(0),
@@ -315,10 +351,11 @@ def extract_company_heuristic(text: str) -> List[Dict]:
     """
     Extrait les entreprises avec patterns heuristiques.
     """
+    text = texte_of(text)
     results = []
     
-    for pattern in COMPANY_PATTERNS:
-        for match in re.finditer(pattern, text, re.IGNORECASE):
+    for pattern in COMPANY_RX:
+        for match in pattern.finditer(text):
             company = match.group("company").strip()
             results.append({
                 "raw": match.group(0),
@@ -330,6 +367,10 @@ def extract_company_heuristic(text: str) -> List[Dict]:
     return results
 
 
+TIRET_RX = compile_pattern("heuristic.tiret", r'\s*[-–—]\s*')
+PRESENT_RX = compile_pattern("heuristic.present", r'(?i)\b(actuel|actuellement|aujourd\'?hui)\b')
+
+
 def normalize_date_range(date_str: str) -> str:
     """
     Normalise une plage de dates.
@@ -340,10 +381,10 @@ def normalize_date_range(date_str: str) -> str:
         "depuis 2020" -> "2020 – Présent"
     """
     # Normaliser les tirets
-    date_str = re.sub(r'\s*[-–—]\s*', ' – ', date_str)
+    date_str = TIRET_RX.sub(' – ', date_str)
     
     # Normaliser "Présent"
-    date_str = re.sub(r'(?i)\b(actuel|actuellement|aujourd\'?hui)\b', 'Présent', date_str)
+    date_str = PRESENT_RX.sub('Présent', date_str)
     
     return date_str
 
@@ -423,6 +464,9 @@ def merge_ner_and_heuristic(ner_entities: List[Dict], heuristic_entities: List[D
 # STRUCTURATION TEMPORELLE DES SECTIONS
 # =============================================================================
 
+ANNEE_RX = compile_pattern("heuristic.annee", r'(19|20)\d{2}')
+
+
 def sort_by_date(items: List[Dict], date_key: str = "dates", descending: bool = True) -> List[Dict]:
     """
     Trie une liste d'items par date.
@@ -436,7 +480,7 @@ def sort_by_date(items: List[Dict], date_key: str = "dates", descending: bool =
         if not date_str:
             return 0
         # Trouver la première année
-        match = re.search(r'(19|20)\d{2}', str(date_str))
+        match = ANNEE_RX.search(str(date_str))
         if match:
             return int(match.group(0))
         return 0
@@ -452,7 +496,7 @@ def group_by_year(items: List[Dict], date_key: str = "dates") -> Dict[str, List[
     
     for item in items:
         date_str = item.get(date_key, "")
-        match = re.search(r'(19|20)\d{2}', str(date_str))
+        match = ANNEE_RX.search(str(date_str))
         year = match.group(0) if match else "Autre"
         
         if year not in groups:
@@ -473,6 +517,7 @@ def extract_structured_cv_data(text: str) -> Dict:
     Returns:
         Dict avec: dates, job_titles, diplomas, schools, companies
     """
+    # Le contexte est transmis tel quel : le scan des dates reste partagé
     return {
         "dates": extract_dates_heuristic(text),
         "job_titles": extract_job_title_heuristic(text),
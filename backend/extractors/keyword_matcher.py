@@ -0,0 +1,71 @@
+"""
+Recherche simultanée de mots-clés dans un texte, en une seule passe.
+
+Le dictionnaire est compilé une fois (à l'import du module appelant) en une
+expression régulière en forme de trie : les préfixes communs sont factorisés,
+le texte est parcouru une seule fois quel que soit le nombre de mots-clés.
+Chaque mot-clé garde la sémantique de re.search(rf"\\b{re.escape(m)}\\b", texte).
+"""
+
+import re
+from typing import Dict, Iterable, List, Tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Construit une alternative regex factorisée (le plus long mot est essayé en premier)."""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        alt = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{alt})?" if "" in node else alt
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Automate de recherche multi-mots-clés, construit une fois et réutilisable."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = list(dict.fromkeys(k for k in keywords if k))
+        self._index = {k: i for i, k in enumerate(self.keywords)}
+
+        # Mots-clés plus courts qui correspondent aussi quand un mot plus long correspond
+        # à la même position (ex: "gestion" dans "gestion de projet"). La frontière de mot
+        # à la fin du mot court tombe à l'intérieur du mot long : elle se vérifie ici.
+        self._nested: Dict[str, List[str]] = {}
+        for long_kw in self.keywords:
+            for short_kw in self.keywords:
+                n = len(short_kw)
+                if n < len(long_kw) and long_kw.startswith(short_kw) and \
+                        _is_word_char(long_kw[n - 1]) != _is_word_char(long_kw[n]):
+                    self._nested.setdefault(long_kw, []).append(short_kw)
+
+        pattern = _trie_pattern(self.keywords) if self.keywords else r"(?!)"
+        self._regex = re.compile(rf"(?=\b({pattern})\b)")
+
+    def finditer(self, text: str) -> List[Tuple[str, int, int]]:
+        """Toutes les occurrences (mot-clé, début, fin), dans l'ordre du texte."""
+        hits = []
+        for m in self._regex.finditer(text):
+            keyword, start = m.group(1), m.start()
+            hits.append((keyword, start, start + len(keyword)))
+            for short_kw in self._nested.get(keyword, ()):
+                hits.append((short_kw, start, start + len(short_kw)))
+        return hits
+
+    def matched_keywords(self, text: str) -> List[str]:
+        """Mots-clés présents dans le texte, dans l'ordre du dictionnaire d'origine."""
+        found = {keyword for keyword, _, _ in self.finditer(text)}
+        return sorted(found, key=self._index.__getitem__)
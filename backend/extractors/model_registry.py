@@ -0,0 +1,290 @@
+"""
+Registre central des modèles spaCy.
+
+Ce module:
+1. Charge chaque pipeline une seule fois par processus (à la demande ou via warm_up())
+2. Partage la même instance entre tous les extracteurs (spacy_extractor, enhanced_extractor)
+3. Mesure le temps de chargement et la mémoire résidente de chaque modèle
+4. N'exécute (ou ne charge) que les composants utiles à chaque mode d'extraction
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import spacy
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+MODELS_DIR = Path(__file__).parent.parent / "models"
+BASE_MODEL = "fr_core_news_md"
+
+# Candidats par modèle logique, du plus spécifique au plus générique.
+# Le premier candidat chargeable est retenu ; deux noms logiques qui se
+# résolvent vers la même source partagent la même instance en mémoire.
+MODEL_CANDIDATES = {
+    "cv_ner": [MODELS_DIR / "cv_ner", BASE_MODEL],
+    "cv_pipeline": [MODELS_DIR / "cv_pipeline", MODELS_DIR / "cv_ner", BASE_MODEL],
+}
+
+DEFAULT_MODEL = "cv_ner"
+
+# Composants utiles par mode d'extraction (None = pipeline complet).
+# Les tok2vec partagés écoutés par ces composants sont conservés automatiquement.
+EXTRACTION_MODES = {
+    "ner": {"ner"},
+    "textcat": {"textcat", "textcat_multilabel"},
+    "full": None,
+}
+
+# Mode de chargement par défaut : "full" garde tous les composants sur disque ;
+# "ner" ou "textcat" n'en charge qu'une partie (moins de RAM, démarrage plus rapide).
+DEFAULT_LOAD_MODE = os.environ.get("CV_MODEL_LOAD_MODE", "full")
+
+# =============================================================================
+# ÉTAT DU REGISTRE
+# =============================================================================
+
+_lock = threading.RLock()
+_pipelines: Dict[str, Any] = {}       # "source#mode" -> Language
+_resolved: Dict[str, str] = {}        # nom logique -> "source#mode"
+_stats: Dict[str, Dict[str, Any]] = {}  # "source#mode" -> statistiques de chargement
+_load_modes: Dict[str, str] = {}      # nom logique -> mode de chargement
+_disabled_cache: Dict[Any, List[str]] = {}  # (id(nlp), mode) -> composants désactivés
+
+
+def _current_rss_mb() -> Optional[float]:
+    """Mémoire résidente du processus en Mo (None si indisponible)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError, IndexError):
+        pass
+
+    try:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss est en octets sous macOS, en Ko ailleurs
+        return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+    except ImportError:
+        return None
+
+
+def _check_mode(mode: str):
+    if mode not in EXTRACTION_MODES:
+        raise ValueError(f"Mode d'extraction inconnu: {mode} (attendu: {', '.join(EXTRACTION_MODES)})")
+
+
+def _read_config(source):
+    """Lit le config.cfg d'un modèle (dossier ou package installé), None si introuvable."""
+    try:
+        if isinstance(source, Path):
+            return spacy.util.load_config(source / "config.cfg")
+        package_dir = spacy.util.get_package_path(source)
+        config_path = next(package_dir.glob("*/config.cfg"), None)
+        return spacy.util.load_config(config_path) if config_path else None
+    except Exception:
+        return None
+
+
+def _excluded_at_load(source, mode: str) -> List[str]:
+    """Composants à ne pas charger du tout pour un mode donné (d'après config.cfg)."""
+    wanted = EXTRACTION_MODES[mode]
+    if wanted is None:
+        return []
+    config = _read_config(source)
+    if config is None:
+        return []
+
+    pipeline = list(config["nlp"]["pipeline"])
+    keep = {name for name in pipeline if name in wanted}
+    for name in list(keep):
+        tok2vec = config["components"].get(name, {}).get("model", {}).get("tok2vec", {})
+        if str(tok2vec.get("@architectures", "")).startswith("spacy.Tok2VecListener"):
+            upstream = tok2vec.get("upstream", "*")
+            keep.update(
+                n for n in pipeline
+                if n == upstream or (upstream == "*" and n in ("tok2vec", "transformer"))
+            )
+    return [name for name in pipeline if name not in keep]
+
+
+def _load_source(source, mode: str = "full") -> Optional[Any]:
+    """Charge une source (dossier de modèle ou nom de package) et enregistre ses stats."""
+    key = f"{source}#{mode}"
+    if key in _pipelines:
+        return _pipelines[key]
+
+    if isinstance(source, Path) and not (source / "config.cfg").exists():
+        logger.debug(f"Pas de config.cfg dans {source}, candidat ignoré")
+        return None
+
+    exclude = _excluded_at_load(source, mode)
+    rss_before = _current_rss_mb()
+    t0 = time.perf_counter()
+    try:
+        nlp = spacy.load(str(source), exclude=exclude)
+    except Exception as e:
+        if isinstance(source, Path):
+            logger.warning(f"Erreur chargement modèle {source}: {e}")
+            return None
+        raise
+    elapsed = time.perf_counter() - t0
+    rss_after = _current_rss_mb()
+
+    _pipelines[key] = nlp
+    _stats[key] = {
+        "source": str(source),
+        "trained": isinstance(source, Path),
+        "load_mode": mode,
+        "pipeline": list(nlp.pipe_names),
+        "load_seconds": round(elapsed, 3),
+        "rss_mb": (
+            round(rss_after - rss_before, 1)
+            if rss_before is not None and rss_after is not None else None
+        ),
+    }
+    logger.info(
+        f"✓ Modèle chargé: {source} [{mode}] en {elapsed:.2f}s"
+        + (f" (+{_stats[key]['rss_mb']} Mo)" if _stats[key]["rss_mb"] is not None else "")
+    )
+    return nlp
+
+
+# =============================================================================
+# API PUBLIQUE
+# =============================================================================
+
+def configure(name: str, load_mode: str):
+    """
+    Fixe le mode de chargement d'un modèle logique (avant son premier chargement).
+    Ex: configure("cv_ner", "ner") ne charge ni parser, ni morphologizer, ni lemmatizer.
+    """
+    _check_mode(load_mode)
+    with _lock:
+        if name in _resolved:
+            logger.warning(f"Modèle {name} déjà chargé, mode de chargement {load_mode} ignoré")
+            return
+        _load_modes[name] = load_mode
+
+
+def get_model(name: str = DEFAULT_MODEL):
+    """
+    Retourne le pipeline spaCy associé au nom logique `name`.
+    Le chargement n'a lieu qu'au premier appel ; les suivants sont gratuits.
+    """
+    key = _resolved.get(name)
+    if key is not None:
+        return _pipelines[key]
+
+    if name not in MODEL_CANDIDATES:
+        raise KeyError(f"Modèle inconnu: {name}")
+
+    with _lock:
+        key = _resolved.get(name)
+        if key is not None:
+            return _pipelines[key]
+
+        mode = _load_modes.get(name, DEFAULT_LOAD_MODE)
+        _check_mode(mode)
+        for candidate in MODEL_CANDIDATES[name]:
+            nlp = _load_source(candidate, mode)
+            if nlp is not None:
+                _resolved[name] = f"{candidate}#{mode}"
+                return nlp
+
+    raise OSError(f"Aucun modèle chargeable pour {name}")
+
+
+def has_component(name: str, components) -> bool:
+    """
+    True si le modèle logique `name` contient l'un des composants demandés.
+    Un modèle pas encore chargé ne l'est pas : seul son config.cfg est lu.
+    """
+    key = _resolved.get(name)
+    if key is not None:
+        return bool(set(components) & set(_pipelines[key].pipe_names))
+    if name not in MODEL_CANDIDATES:
+        raise KeyError(f"Modèle inconnu: {name}")
+    # Même ordre de résolution que get_model() : premier candidat avec un config.cfg
+    for candidate in MODEL_CANDIDATES[name]:
+        config = _read_config(candidate)
+        if config is not None:
+            return bool(set(components) & set(config["nlp"]["pipeline"]))
+    return False
+
+
+def disabled_components(nlp, mode: str = "full") -> List[str]:
+    """Composants à désactiver à l'exécution pour un mode d'extraction donné."""
+    _check_mode(mode)
+    cache_key = (id(nlp), mode)
+    cached = _disabled_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    wanted = EXTRACTION_MODES[mode]
+    if wanted is None:
+        disabled = []
+    else:
+        keep = {name for name in nlp.pipe_names if name in wanted}
+        for name, pipe in nlp.pipeline:
+            if set(getattr(pipe, "listening_components", []) or []) & keep:
+                keep.add(name)
+        disabled = [name for name in nlp.pipe_names if name not in keep]
+
+    _disabled_cache[cache_key] = disabled
+    return disabled
+
+
+def parse(texte: str, name: str = DEFAULT_MODEL, mode: str = "full"):
+    """Analyse un texte en n'exécutant que les composants du mode demandé."""
+    nlp = get_model(name)
+    return nlp(texte, disable=disabled_components(nlp, mode))
+
+
+def parse_batch(texts, name: str = DEFAULT_MODEL, mode: str = "full",
+                batch_size: int = 32, n_process: int = 1):
+    """Version lot de parse() basée sur nlp.pipe (générateur de Doc, ordre préservé)."""
+    nlp = get_model(name)
+    return nlp.pipe(
+        texts,
+        batch_size=batch_size,
+        n_process=n_process,
+        disable=disabled_components(nlp, mode),
+    )
+
+
+def is_trained_model(name: str = DEFAULT_MODEL) -> bool:
+    """True si le modèle logique `name` est un modèle CV entraîné (et non le modèle de base)."""
+    get_model(name)
+    return _stats[_resolved[name]]["trained"]
+
+
+def warm_up(names: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Précharge les modèles (tous par défaut) avant de servir des requêtes.
+    À appeler au démarrage du serveur pour éviter le chargement à froid.
+    """
+    for name in names or list(MODEL_CANDIDATES):
+        get_model(name)
+    return model_stats()
+
+
+def model_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistiques par modèle logique chargé: source, temps de chargement, mémoire."""
+    with _lock:
+        return {
+            name: dict(_stats[source], shared_with=[
+                other for other, s in _resolved.items() if s == source and other != name
+            ])
+            for name, source in _resolved.items()
+        }
@@ -0,0 +1,164 @@
+"""
+Registre central des expressions régulières du pipeline.
+
+Les motifs de heuristic_rules, section_classifier et extracteur sont compilés
+une seule fois, à l'import, et enregistrés sous un nom ("module.motif") :
+les appels n'ont plus à passer par le cache interne de `re`, trop petit pour
+les centaines de motifs évalués par CV.
+
+    ANNEE_RX = compile_pattern("extracteur.annee", r"(?:19|20)\\d{2}")
+    POSTE_RX = compile_patterns("section.poste", POSTE_PATTERNS, re.IGNORECASE)
+
+Variables d'environnement :
+- CV_REGEX_ENGINE=regex : compile avec le module `regex` (requirements) au lieu de `re`
+- CV_REGEX_PROFILE=1    : mesure le temps passé dans chaque motif (pattern_stats()) ;
+                          sans cette variable, les motifs compilés sont utilisés tels quels
+"""
+
+import os
+import re
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Union
+
+logger = logging.getLogger(__name__)
+
+REGEX_ENGINE = os.environ.get("CV_REGEX_ENGINE", "re")
+REGEX_PROFILE = os.environ.get("CV_REGEX_PROFILE", "0") == "1"
+
+
+def _load_engine():
+    if REGEX_ENGINE == "regex":
+        try:
+            import regex
+            return regex
+        except ImportError:
+            logger.warning("CV_REGEX_ENGINE=regex mais le module regex n'est pas installé : utilisation de re")
+    return re
+
+
+_engine = _load_engine()
+_registry: Dict[str, Any] = {}
+_sources: Dict[str, Any] = {}  # nom -> (motif, flags)
+_stats: Dict[str, List[float]] = {}  # nom -> [appels, secondes, correspondances]
+_stats_lock = threading.Lock()
+
+
+class TimedPattern:
+    """Motif compilé qui comptabilise appels, durée et correspondances (CV_REGEX_PROFILE=1)."""
+
+    __slots__ = ("name", "_rx")
+
+    def __init__(self, name: str, compiled):
+        self.name = name
+        self._rx = compiled
+
+    def _record(self, seconds: float, matches: int):
+        with _stats_lock:
+            stats = _stats.setdefault(self.name, [0, 0.0, 0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] += matches
+
+    def _timed(self, method: str, *args, **kwargs):
+        t0 = time.perf_counter()
+        result = getattr(self._rx, method)(*args, **kwargs)
+        self._record(time.perf_counter() - t0, 1 if result else 0)
+        return result
+
+    def search(self, *args, **kwargs):
+        return self._timed("search", *args, **kwargs)
+
+    def match(self, *args, **kwargs):
+        return self._timed("match", *args, **kwargs)
+
+    def fullmatch(self, *args, **kwargs):
+        return self._timed("fullmatch", *args, **kwargs)
+
+    def findall(self, *args, **kwargs):
+        t0 = time.perf_counter()
+        result = self._rx.findall(*args, **kwargs)
+        self._record(time.perf_counter() - t0, len(result))
+        return result
+
+    def finditer(self, *args, **kwargs):
+        # Le parcours est paresseux : le temps est compté à chaque correspondance produite
+        it = self._rx.finditer(*args, **kwargs)
+        elapsed, count = 0.0, 0
+        try:
+            while True:
+                t0 = time.perf_counter()
+                try:
+                    m = next(it)
+                except StopIteration:
+                    elapsed += time.perf_counter() - t0
+                    return
+                elapsed += time.perf_counter() - t0
+                count += 1
+                yield m
+        finally:
+            self._record(elapsed, count)
+
+    def sub(self, *args, **kwargs):
+        return self._timed("sub", *args, **kwargs)
+
+    def subn(self, *args, **kwargs):
+        return self._timed("subn", *args, **kwargs)
+
+    def split(self, *args, **kwargs):
+        return self._timed("split", *args, **kwargs)
+
+    def __getattr__(self, attr):
+        # pattern, flags, groupindex, groups...
+        return getattr(self._rx, attr)
+
+
+def compile_pattern(name: str, pattern: str, flags: int = 0):
+    """Compile `pattern` et l'enregistre sous `name` (unique)."""
+    if name in _registry:
+        if _sources[name] == (pattern, flags):
+            # Module rechargé : même motif, même objet
+            return _registry[name]
+        raise ValueError(f"Motif déjà enregistré sous le nom {name!r}")
+    compiled = _engine.compile(pattern, flags)
+    if REGEX_PROFILE:
+        compiled = TimedPattern(name, compiled)
+    _registry[name] = compiled
+    _sources[name] = (pattern, flags)
+    return compiled
+
+
+def compile_patterns(prefix: str, patterns: Union[Dict[str, str], List[str]], flags: int = 0):
+    """
+    Compile une famille de motifs : un dict donne un dict (noms "prefix.clé"),
+    une liste donne une liste dans le même ordre (noms "prefix.0", "prefix.1"...).
+    """
+    if isinstance(patterns, dict):
+        return {key: compile_pattern(f"{prefix}.{key}", p, flags) for key, p in patterns.items()}
+    return [compile_pattern(f"{prefix}.{i}", p, flags) for i, p in enumerate(patterns)]
+
+
+def get_pattern(name: str):
+    """Motif compilé enregistré sous `name` (KeyError si inconnu)."""
+    return _registry[name]
+
+
+def registered_patterns() -> Dict[str, str]:
+    """{nom: motif source} de tous les motifs enregistrés."""
+    return {name: source for name, (source, _) in _sources.items()}
+
+
+def pattern_stats() -> List[Dict[str, Any]]:
+    """Motifs mesurés (CV_REGEX_PROFILE=1), du plus coûteux au moins coûteux."""
+    with _stats_lock:
+        rows = [
+            {"name": name, "calls": calls, "seconds": round(seconds, 6), "matches": matches}
+            for name, (calls, seconds, matches) in _stats.items()
+        ]
+    return sorted(rows, key=lambda r: r["seconds"], reverse=True)
+
+
+def reset_pattern_stats():
+    with _stats_lock:
+        _stats.clear()
@@ -1,9 +1,18 @@
 import logging
 from pathlib import Path
-import PyPDF2
+from typing import Optional
 from docx import Document
 from docx.shared import Inches
 
+# Import adaptatif pour document_reader
+try:
+    from extractors.document_reader import lire_pages_pdf
+except ImportError:
+    try:
+        from .document_reader import lire_pages_pdf
+    except ImportError:
+        from document_reader import lire_pages_pdf
+
 # Configuration du logging
 logging.basicConfig(
     level=logging.INFO,
@@ -11,13 +20,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def convert_pdf_to_docx(pdf_path: str, docx_path: str) -> bool:
+def convert_pdf_to_docx(pdf_path: str, docx_path: str, workers: Optional[int] = None,
+                        max_pages: Optional[int] = None) -> bool:
     """
     Convertit un fichier PDF en document Word (.docx)
     
     Args:
         pdf_path (str): Chemin du fichier PDF source
         docx_path (str): Chemin du fichier Word de destination
+        workers (int): Nombre de processus d'extraction des pages (défaut: CV_PDF_WORKERS)
+        max_pages (int): Ne convertit que les N premières pages (None = toutes)
     
     Returns:
         bool: True si la conversion est réussie, False sinon
@@ -30,30 +42,21 @@ def convert_pdf_to_docx(pdf_path: str, docx_path: str) -> bool:
             return False
 
         logger.info(f"Ouverture du fichier PDF: {pdf_path}")
+        # Extraction du texte de chaque page (en parallèle si workers > 1)
+        pages = lire_pages_pdf(pdf_file, workers=workers, max_pages=max_pages)
+        logger.info(f"Nombre de pages extraites: {len(pages)}")
+
         # Création du document Word
         doc = Document()
-        
-        # Ouverture du PDF
-        with open(pdf_file, 'rb') as file:
-            # Création du lecteur PDF
-            pdf_reader = PyPDF2.PdfReader(file)
-            total_pages = len(pdf_reader.pages)
-            logger.info(f"Nombre total de pages: {total_pages}")
+        for page_num, text in enumerate(pages):
+            logger.debug(f"Ajout de la page {page_num + 1}/{len(pages)}")
 
-            # Traitement de chaque page
-            for page_num in range(total_pages):
-                logger.info(f"Traitement de la page {page_num + 1}/{total_pages}")
-                
-                # Extraction du texte de la page
-                page = pdf_reader.pages[page_num]
-                text = page.extract_text()
-                
-                # Ajout d'un saut de page si ce n'est pas la première page
-                if page_num > 0:
-                    doc.add_page_break()
-                
-                # Ajout du texte dans le document Word
-                doc.add_paragraph(text)
+            # Ajout d'un saut de page si ce n'est pas la première page
+            if page_num > 0:
+                doc.add_page_break()
+            
+            # Ajout du texte dans le document Word
+            doc.add_paragraph(text)
         
         # Sauvegarde du document Word
         logger.info(f"Sauvegarde du document Word: {docx_path}")
@@ -1,23 +1,40 @@
 import re
 import sys
+from bisect import bisect_left
 import os
 from typing import List, Optional, Tuple
-import dateparser
-from rich.console import Console
-from rich.table import Table
 import json
 from datetime import datetime
 
-# Import adaptatif pour spacy_extractor
+# Import adaptatif pour spacy_extractor / cv_context / keyword_matcher / date_normalizer / tracing / patterns / date_scanner / section_index
 try:
-    from extractors.spacy_extractor import extraire_entites
+    from extractors.spacy_extractor import extraire_entites_doc
+    from extractors.cv_context import AnalysisContext, as_context, is_context, texte_of
+    from extractors.keyword_matcher import KeywordMatcher
+    from extractors.date_normalizer import normaliser_date
+    from extractors.tracing import stage, traced
+    from extractors.patterns import compile_pattern, compile_patterns
+    from extractors.date_scanner import scan_dates
+    from extractors.section_index import section_index_of
 except ImportError:
     try:
-        from .spacy_extractor import extraire_entites
+        from .spacy_extractor import extraire_entites_doc
+        from .cv_context import AnalysisContext, as_context, is_context, texte_of
+        from .keyword_matcher import KeywordMatcher
+        from .date_normalizer import normaliser_date
+        from .tracing import stage, traced
+        from .patterns import compile_pattern, compile_patterns
+        from .date_scanner import scan_dates
+        from .section_index import section_index_of
     except ImportError:
-        from spacy_extractor import extraire_entites
-
-console = Console()
+        from spacy_extractor import extraire_entites_doc
+        from cv_context import AnalysisContext, as_context, is_context, texte_of
+        from keyword_matcher import KeywordMatcher
+        from date_normalizer import normaliser_date
+        from tracing import stage, traced
+        from patterns import compile_pattern, compile_patterns
+        from date_scanner import scan_dates
+        from section_index import section_index_of
 
 # ---------------------
 # 0️ Mots-clés enrichis
@@ -72,70 +89,78 @@ LANGUES_KEYWORDS = [
     "néerlandais", "polonais", "coréen", "hindi"
 ]
 
-DATE_REGEXES = [
-    r'\b\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4}\b',
-    r'\b\d{1,2}[\/\-]\d{4}\b',
-    r'\b(?:19|20)\d{2}\b',
-    r'\b(?:Janvier|Février|Fevrier|Mars|Avril|Mai|Juin|Juillet|Août|Aout|Septembre|Octobre|Novembre|Décembre)\s+\d{4}\b',
-    r'\b(?:\d{4})\s*[-–—]\s*(?:\d{4}|[Pp]résent|[Aa]ctuel(?:lement)?|[Aa]ujourd\'?hui)\b'
-]
+# Dictionnaires compilés une fois : une seule passe sur le texte par dictionnaire
+COMPETENCE_MATCHER = KeywordMatcher(COMPETENCE_KEYWORDS)
+LANGUES_MATCHER = KeywordMatcher(LANGUES_KEYWORDS)
+
 
 # ---------------------
 # 1️ Extraction de base
 # ---------------------
 def extraire_competences_langues(texte):
-    texte_min = texte.lower()
+    texte_min = as_context(texte).texte_lower
     competences = []
     langues = []
     
-    for m in COMPETENCE_KEYWORDS:
-        if re.search(rf"\b{re.escape(m)}\b", texte_min):
-            comp = m.title() if len(m) > 3 else m.upper()
-            if comp not in competences:
-                competences.append(comp)
+    for m in COMPETENCE_MATCHER.matched_keywords(texte_min):
+        comp = m.title() if len(m) > 3 else m.upper()
+        if comp not in competences:
+            competences.append(comp)
     
-    for m in LANGUES_KEYWORDS:
-        if re.search(rf"\b{re.escape(m)}\b", texte_min):
-            lang = m.capitalize()
-            if lang not in langues:
-                langues.append(lang)
+    for m in LANGUES_MATCHER.matched_keywords(texte_min):
+        lang = m.capitalize()
+        if lang not in langues:
+            langues.append(lang)
     
     return competences, langues
 
 
+DATE_REGEXES = [
+    r'\b\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4}\b',
+    r'\b\d{1,2}[\/\-]\d{4}\b',
+    r'\b(?:19|20)\d{2}\b',
+    r'\b(?:Janvier|Février|Fevrier|Mars|Avril|Mai|Juin|Juillet|Août|Aout|Septembre|Octobre|Novembre|Décembre)\s+\d{4}\b',
+    r'\b(?:\d{4})\s*[-–—]\s*(?:\d{4}|[Pp]résent|[Aa]ctuel(?:lement)?|[Aa]ujourd\'?hui)\b'
+]
+DATE_RX = compile_patterns("section.date", DATE_REGEXES, re.IGNORECASE)
+# Plages d'années : conservées telles quelles (pas une date unique)
+RANGE_RX = compile_pattern(
+    "section.range",
+    r"^(?:19|20)\d{2}\s*[-–—]\s*(?:(?:19|20)\d{2}|présent|actuel(?:lement)?|aujourd'?hui)$",
+    re.IGNORECASE
+)
+ANNEE_RX = compile_pattern("section.annee", r"(?:19|20)\d{2}")
+
 def extract_date_spans(text: str):
     """
     Extrait toutes les dates présentes dans le texte (simples ou plages).
     Renvoie une liste de tuples (brut, start, end, normalisé)
     """
+    if is_context(text):
+        return text.date_spans
+    return date_spans_from_scan(scan_dates(text))
+
+
+def date_spans_from_scan(scan) -> List[Tuple[str, int, int, str]]:
+    """Dates d'un DateScan (date_scanner) au format de extract_date_spans()."""
     spans = []
-    for rx in DATE_REGEXES:
-        for m in re.finditer(rx, text, flags=re.IGNORECASE):
+    for rx in DATE_RX:
+        # Chaque format n'est essayé qu'aux positions des dates du scan
+        for m in scan.finditer(rx):
             raw = m.group(0).strip()
             start, end = m.start(), m.end()
 
             #  1. Détection directe des plages de dates
-            if re.match(r"^(?:19|20)\d{2}\s*[-–—]\s*(?:19|20)\d{2}$", raw):
+            if RANGE_RX.match(raw):
                 spans.append((raw, start, end, raw))
                 continue
 
             #  2. Filtrage des faux positifs (code postal, etc.)
-            window = text[max(0, start - 8):min(len(text), end + 8)]
-            if re.search(r"\b\d{5}\b", window) and re.fullmatch(r"(?:19|20)\d{2}", raw):
+            if ANNEE_RX.fullmatch(raw) and scan.has_postal_code(start - 8, end + 8):
                 continue
 
-            #  3. Parsing “humain”
-            parsed = None
-            try:
-                dp = dateparser.parse(raw, languages=['fr'])
-                if dp:
-                    parsed = dp.date().isoformat()
-
-                    #  Filtrer les dates du jour (erreur fréquente de dateparser)
-                    if parsed.endswith("-11-12") or parsed.endswith("-11-11"):
-                        continue
-            except Exception:
-                parsed = None
+            #  3. Normalisation déterministe (dateparser en repli, mis en cache)
+            parsed = normaliser_date(raw)
 
             spans.append((raw, start, end, parsed or raw))
 
@@ -150,28 +175,77 @@ def extract_date_spans(text: str):
 
 
 def find_org_positions(org: str, text: str) -> List[Tuple[int, int]]:
+    if is_context(text):
+        return text.org_positions(org)
     return [(m.start(), m.end()) for m in re.finditer(re.escape(org), text, flags=re.IGNORECASE)]
 
 
-def find_closest_date_by_char(org: str, text: str, date_spans: List[Tuple[str, int, int, str]]) -> Optional[str]:
+class DateIndex:
+    """
+    Dates d'un document triées par position centrale, pour retrouver la plus
+    proche d'une position par recherche dichotomique (bisect) au lieu d'un
+    parcours de toutes les dates.
+    """
+
+    def __init__(self, date_spans: List[Tuple[str, int, int, str]]):
+        # (centre, rang d'origine, valeur) : le rang départage les égalités comme
+        # le parcours séquentiel d'origine (première date rencontrée retenue)
+        entries = sorted(
+            ((d_start + d_end) / 2, i, parsed or raw)
+            for i, (raw, d_start, d_end, parsed) in enumerate(date_spans)
+        )
+        self.centers = [c for c, _, _ in entries]
+        self.ranks = [i for _, i, _ in entries]
+        self.values = [v for _, _, v in entries]
+
+    def __len__(self):
+        return len(self.centers)
+
+    def nearest(self, pos: float) -> Optional[Tuple[float, int, str]]:
+        """(distance, rang d'origine, valeur) de la date la plus proche de `pos`."""
+        if not self.centers:
+            return None
+        # Candidats : première date (plus petit rang) du groupe de centres égaux
+        # de part et d'autre de `pos`
+        i = bisect_left(self.centers, pos)
+        candidates = []
+        if i > 0:
+            j = bisect_left(self.centers, self.centers[i - 1])
+            candidates.append((pos - self.centers[j], self.ranks[j], self.values[j]))
+        if i < len(self.centers):
+            candidates.append((self.centers[i] - pos, self.ranks[i], self.values[i]))
+        return min(candidates)
+
+
+def find_closest_date_by_char(org: str, text: str, date_spans) -> Optional[str]:
+    """
+    Date la plus proche (en caractères) d'une occurrence de `org`, à moins de 1200 caractères.
+    `date_spans` peut être une liste de extract_date_spans() ou un DateIndex déjà construit.
+    """
     org_positions = find_org_positions(org, text)
     if not org_positions:
         return None
+    index = date_spans if hasattr(date_spans, "nearest") else DateIndex(date_spans)
     best, best_dist = None, 1200
     for (o_start, o_end) in org_positions:
-        for raw, d_start, d_end, parsed in date_spans:
-            dist = abs(((o_start + o_end) / 2) - ((d_start + d_end) / 2))
-            if dist < best_dist:
-                best_dist, best = dist, (parsed or raw)
+        hit = index.nearest((o_start + o_end) / 2)
+        if hit and hit[0] < best_dist:
+            best_dist, best = hit[0], hit[2]
     return best if best_dist < 1200 else None
 
 
 # ---------------------
 # 2️ Nettoyage
 # ---------------------
+PREFIXE_ORG_RX = compile_pattern(
+    "section.prefixe_org",
+    r"(?i)(entreprise|projets?|compétences?|competences?|stage|formation)[:\s-]*"
+)
+ESPACES_RX = compile_pattern("section.espaces", r"\s+")
+
 def nettoyer_nom_organisation(org: str) -> str:
-    org = re.sub(r"(?i)(entreprise|projets?|compétences?|competences?|stage|formation)[:\s-]*", "", org)
-    org = re.sub(r"\s+", " ", org)
+    org = PREFIXE_ORG_RX.sub("", org)
+    org = ESPACES_RX.sub(" ", org)
     return org.strip(" :-\n\t")
 
 
@@ -227,11 +301,13 @@ def is_valid_school(name: str) -> bool:
     return False
 
 
+TIRET_HORS_DATE_RX = compile_pattern("section.tiret_hors_date", r'[\-–—](?!\s*(?:19|20)\d{2})')
+
 def nettoyer_organisations(entites_org):
     nettoyees = []
     for org in entites_org:
-        org_clean = re.sub(r'\s+', ' ', org.strip())
-        morceaux = re.split(r'[\-–—](?!\s*(?:19|20)\d{2})', org_clean)
+        org_clean = ESPACES_RX.sub(' ', org.strip())
+        morceaux = TIRET_HORS_DATE_RX.split(org_clean)
         for part in morceaux:
             part = part.strip(" -–—.,;")
             if len(part) > 2 and part.lower() not in STOP_ORG:
@@ -247,13 +323,16 @@ NIVEAUX = {
     "intermédiaire": "B2", "débutant": "A2", "notions": "A1"
 }
 LANG_LIST = ["français", "francais", "anglais", "espagnol", "allemand", "italien", "portugais", "arabe"]
+# Niveau de langue -> motif "mot entier" compilé
+NIVEAUX_RX = {niveau: compile_pattern(f"section.niveau.{niveau}", rf"\b{niveau}\b") for niveau in NIVEAUX}
+
+SEPARATEURS_LISTE_RX = compile_pattern("section.separateurs_liste", r"[•\-\u2022,;/\n]+")
 
 def parse_section_langues(texte):
-    m = re.search(r"(?is)\bLangues?\b\s*[:\-\n]*(.+?)(?:\n\s*(?:Compétences?|Formations?|Expériences?|Certifications?)\b|$)", texte)
-    if not m:
+    bloc = section_index_of(texte).section_text("langues")
+    if not bloc:
         return []
-    bloc = m.group(1)
-    items = re.split(r"[•\-\u2022,;/\n]+", bloc)
+    items = SEPARATEURS_LISTE_RX.split(bloc)
     out = []
     for it in items:
         t = it.strip()
@@ -261,49 +340,66 @@ def parse_section_langues(texte):
             continue
         low = t.lower()
         if any(l in low for l in LANG_LIST):
-            lvl = next((v for k, v in NIVEAUX.items() if re.search(rf"\b{k}\b", low)), None)
+            lvl = next((v for k, v in NIVEAUX.items() if NIVEAUX_RX[k].search(low)), None)
             out.append(t if not lvl else f"{t} ({lvl})")
     return list(dict.fromkeys(out))
 
+PUCE_RX = compile_pattern("section.puce", r"^[\-\•\d]+\s*")
+# Libellé de ligne ("Langages :", "IDE:", "CI/CD :") devant une liste de compétences
+LIBELLE_COMPETENCES_RX = compile_pattern(
+    "section.libelle_competences", r"^[ \t]*[^:\n,;•]{1,30}:[ \t]*", re.MULTILINE
+)
+CHIFFRE_RX = compile_pattern("section.chiffre", r"\d")
+PRINCIPALE_RX = compile_pattern("section.principale", r"principale", re.IGNORECASE)
+
 def parse_section_competences(texte):
-    m = re.search(r"(?is)\bCompétences?\b\s*[:\-\n]*(.+?)(?:\n\s*(?:Langues?|Formations?|Expériences?|Certifications?)\b|$)", texte)
-    if not m:
+    bloc = section_index_of(texte).section_text("competences")
+    if not bloc:
         return []
-    bloc = m.group(1)
-    items = re.split(r"[•\-\u2022,;/\n]+", bloc)
+    items = SEPARATEURS_LISTE_RX.split(LIBELLE_COMPETENCES_RX.sub("", bloc))
     out = []
     for it in items:
-        t = re.sub(r"^[\-\•\d]+\s*", "", it.strip().lower())
-        if 2 <= len(t) <= 40 and not re.search(r"\d", t) and not re.search(r"principale", t, re.IGNORECASE):
+        t = PUCE_RX.sub("", it.strip().lower())
+        if 2 <= len(t) <= 40 and not CHIFFRE_RX.search(t) and not PRINCIPALE_RX.search(t):
             out.append(t.capitalize())
     return list(dict.fromkeys(out))
 
+SEPARATEURS_PUCES_RX = compile_pattern("section.separateurs_puces", r"[•\-\u2022,;\n]+")
+
 def parse_section_projets(texte):
-    matches = re.findall(r"(?:Projets?|Réalisations?)[:\-\n]+([\s\S]+?)(?=\n[A-ZÉÈ]|$)", texte, re.IGNORECASE)
-    if not matches:
+    bloc = section_index_of(texte).section_text("projets")
+    if not bloc:
         return []
-    bloc = matches[0]
-    items = re.split(r"[•\-\u2022,;\n]+", bloc)
+    items = SEPARATEURS_PUCES_RX.split(bloc)
     projets = [i.strip(" .") for i in items if 3 < len(i.strip()) < 80]
     return list(dict.fromkeys(projets))
 
 def parse_section_certifications(texte):
-    matches = re.findall(r"(?:Certifications?|Certif)[\s:]+(.+?)(?=\n[A-ZÉÈ]|$)", texte, re.IGNORECASE)
-    if not matches:
+    bloc = section_index_of(texte).section_text("certifications")
+    if not bloc:
         return []
-    items = re.split(r"[•\-\u2022,;\n]+", matches[0])
+    items = SEPARATEURS_PUCES_RX.split(bloc)
     certifs = [i.strip() for i in items if len(i.strip()) > 3]
     return list(dict.fromkeys(certifs))
 
+SEPARATEURS_LOISIRS_RX = compile_pattern("section.separateurs_loisirs", r"[,;/\n]+")
+
 def parse_section_loisirs(texte):
-    matches = re.findall(r"(?:Loisirs?|Centres d’intérêt)[:\-\s]+(.+?)(?=\n[A-ZÉÈ]|$)", texte, re.IGNORECASE)
-    if not matches:
+    bloc = section_index_of(texte).section_text("loisirs")
+    if not bloc:
         return []
-    items = re.split(r"[,;/]+", matches[0])
+    items = SEPARATEURS_LOISIRS_RX.split(bloc)
     return [i.strip() for i in items if len(i.strip()) > 2]
 
+DISPONIBILITE_RX = compile_pattern(
+    "section.disponibilite",
+    r"Disponible\s+(?:à partir de|dès)?\s*(.+?)(?:\.|\n|$)",
+    re.IGNORECASE
+)
+
 def parse_disponibilite(texte):
-    m = re.search(r"Disponible\s+(?:à partir de|dès)?\s*(.+?)(?:\.|\n|$)", texte, re.IGNORECASE)
+    texte = texte_of(texte)
+    m = DISPONIBILITE_RX.search(texte)
     return m.group(1).strip() if m else None
 
 
@@ -336,17 +432,42 @@ ADRESSE_KEYWORDS = [
     "cour", "quai", "passage", "square", "route", "voie"
 ]
 
+RUE_NOM_RX = compile_pattern(
+    "section.rue_nom",
+    r'(?:rue|avenue|boulevard|place|chemin|impasse|allée|allee|passage|quai|square|route)\s+([A-Za-zéèêëîïôöûüçÀ-ÿ\-]+(?:\s+[A-Za-zéèêëîïôöûüçÀ-ÿ\-]+)*)',
+    re.IGNORECASE
+)
+EMAIL_NOM_RX = compile_pattern("section.email_nom", r'([a-zA-Z]+)[._]([a-zA-Z]+)@')
+CHIFFRES_5_RX = compile_pattern("section.chiffres_5", r'[@\d]{5,}')
+CODE_POSTAL_RX = compile_pattern("section.code_postal", r'\d{5}')
+TELEPHONE_RX = compile_pattern("section.telephone", r'\+?\d[\d\s\(\)\-]{8,}')
+TITRE_SECTION_RX = compile_pattern(
+    "section.titre_section",
+    r'^(expériences?|formations?|compétences?|langues?|projets?|contact|profil)\s*[:.]?$'
+)
+NOM_CASSE_TITRE_RX = compile_pattern(
+    "section.nom_casse_titre",
+    r'^[A-ZÀ-Ü][a-zà-ÿ]+(?:\s+[A-ZÀ-Ü][a-zà-ÿ]+)*(?:\s+[A-ZÀ-Ü][A-ZÀ-Üa-zà-ÿ]+)+$'
+)
+NOM_MAJUSCULES_RX = compile_pattern("section.nom_majuscules", r'^[A-ZÀ-Ü]+(?:\s+[A-ZÀ-Ü]+)+$')
+LABEL_NOM_RX = compile_pattern(
+    "section.label_nom",
+    r'(?:Nom|Name)\s*[:\-]\s*([A-Za-zÀ-ÿ]+(?:\s+[A-Za-zÀ-ÿ]+)+)',
+    re.IGNORECASE
+)
+
 def extract_name_from_header(texte: str) -> Optional[str]:
     """
     Extrait le nom depuis l'en-tête du CV (généralement les 5-10 premières lignes).
     Le nom est souvent la première ligne non vide qui ressemble à "Prénom NOM".
     """
-    lines = [l.strip() for l in texte.split('\n') if l.strip()][:15]
+    ctx = as_context(texte)
+    texte = ctx.texte
+    lines = ctx.non_empty_lines[:15]
     
     # ÉTAPE 1: Trouver tous les noms qui apparaissent dans les adresses (à exclure)
     noms_dans_adresse = set()
-    pattern_rue_nom = r'(?:rue|avenue|boulevard|place|chemin|impasse|allée|allee|passage|quai|square|route)\s+([A-Za-zéèêëîïôöûüçÀ-ÿ\-]+(?:\s+[A-Za-zéèêëîïôöûüçÀ-ÿ\-]+)*)'
-    for match in re.finditer(pattern_rue_nom, texte, re.IGNORECASE):
+    for match in RUE_NOM_RX.finditer(texte):
         nom_rue = match.group(1).strip().lower()
         noms_dans_adresse.add(nom_rue)
         # Ajouter aussi chaque mot individuellement
@@ -362,11 +483,11 @@ def extract_name_from_header(texte: str) -> Optional[str]:
             continue
         
         # Ignorer si contient email, téléphone, adresse
-        if re.search(r'[@\d]{5,}', line_clean):
+        if CHIFFRES_5_RX.search(line_clean):
             continue
-        if re.search(r'\d{5}', line_clean):  # Code postal
+        if CODE_POSTAL_RX.search(line_clean):  # Code postal
             continue
-        if re.search(r'\+?\d[\d\s\(\)\-]{8,}', line_clean):  # Téléphone
+        if TELEPHONE_RX.search(line_clean):  # Téléphone
             continue
         
         # Ignorer si contient un mot d'adresse
@@ -384,12 +505,12 @@ def extract_name_from_header(texte: str) -> Optional[str]:
             continue
         
         # Ignorer si c'est une section connue
-        if re.match(r'^(expériences?|formations?|compétences?|langues?|projets?|contact|profil)\s*[:.]?$', line_lower):
+        if TITRE_SECTION_RX.match(line_lower):
             continue
         
         # Pattern : "Prénom NOM" ou "Prénom Prénom2 NOM"
         # Prénom = Capitale + minuscules, NOM = tout en majuscules ou normale
-        if re.match(r'^[A-ZÀ-Ü][a-zà-ÿ]+(?:\s+[A-ZÀ-Ü][a-zà-ÿ]+)*(?:\s+[A-ZÀ-Ü][A-ZÀ-Üa-zà-ÿ]+)+$', line_clean):
+        if NOM_CASSE_TITRE_RX.match(line_clean):
             # Vérifier que les mots ne sont pas des exclusions
             words = line_clean.split()
             if all(w.lower() not in NAME_EXCLUSIONS for w in words):
@@ -402,7 +523,7 @@ def extract_name_from_header(texte: str) -> Optional[str]:
                             return line_clean
         
         # Pattern alternatif: "PRENOM NOM" tout en majuscules
-        if re.match(r'^[A-ZÀ-Ü]+(?:\s+[A-ZÀ-Ü]+)+$', line_clean):
+        if NOM_MAJUSCULES_RX.match(line_clean):
             words = line_clean.split()
             if all(w.lower() not in NAME_EXCLUSIONS for w in words):
                 if len(words) >= 2 and len(words) <= 4:
@@ -415,7 +536,7 @@ def extract_name_from_header(texte: str) -> Optional[str]:
     
     # Deuxième passe: chercher "Nom : XXX" ou pattern flexible
     for line in lines[:10]:
-        m = re.search(r'(?:Nom|Name)\s*[:\-]\s*([A-Za-zÀ-ÿ]+(?:\s+[A-Za-zÀ-ÿ]+)+)', line, re.IGNORECASE)
+        m = LABEL_NOM_RX.search(line)
         if m:
             candidate = m.group(1).strip()
             words = candidate.split()
@@ -426,7 +547,7 @@ def extract_name_from_header(texte: str) -> Optional[str]:
                         return candidate
     
     # Troisième passe: extraire depuis l'email
-    email_match = re.search(r'([a-zA-Z]+)[._]([a-zA-Z]+)@', texte)
+    email_match = EMAIL_NOM_RX.search(texte)
     if email_match:
         prenom = email_match.group(1).capitalize()
         nom = email_match.group(2).capitalize()
@@ -457,6 +578,7 @@ POSTE_PATTERNS = [
     r"(product\s*(?:owner|manager)?)",
     r"(scrum\s*master)",
 ]
+POSTE_RX = compile_patterns("section.poste", POSTE_PATTERNS, re.IGNORECASE)
 
 # Entreprises connues (vraies entreprises)
 KNOWN_COMPANIES = {
@@ -557,12 +679,35 @@ def is_valid_company(name: str) -> bool:
     return True
 
 
-def extract_section_text(texte: str, section_names: List[str]) -> Optional[str]:
-    """Extrait le texte d'une section spécifique du CV."""
-    pattern = r'(?:' + '|'.join(section_names) + r')\s*[:\-\n]+(.+?)(?=\n\s*(?:Formations?|Expériences?|Compétences?|Langues?|Projets?|Certifications?|Loisirs?|Centres?\s+d\'intérêt)\s*[:\-\n]|$)'
-    match = re.search(pattern, texte, re.IGNORECASE | re.DOTALL)
-    return match.group(1).strip() if match else None
-
+TITRE_FORMATIONS_RX = compile_pattern(
+    "section.titre_formations",
+    r'^(formations?|études|education|cursus)\s*[:.]?$',
+    re.IGNORECASE
+)
+FORMATION_DATE_D_ABORD_RX = compile_pattern(
+    "section.formation_date_d_abord",
+    r'^((?:19|20)\d{2})\s*[-–—]\s*((?:19|20)\d{2}|[Pp]résent|[Aa]ctuel)\s*[:\-–—]\s*(.+)$'
+)
+TITRE_PLAGE_RX = compile_pattern(
+    "section.titre_plage",
+    r'^(.+?)\s*\(((?:19|20)\d{2})\s*[-–—]\s*((?:19|20)\d{2}|[Pp]résent|[Aa]ctuel)\)$'
+)
+ECOLE_DIPLOME_RX = compile_pattern(
+    "section.ecole_diplome",
+    r'^([A-ZÀ-Üa-zà-ÿ][A-Za-zÀ-ÿ\s\-]+?)\s*:\s*(.+?)(?:\s*\(([A-Za-zÀ-ÿ\s\-]+)\))?$'
+)
+ECOLE_VILLE_ANNEES_RX = compile_pattern(
+    "section.ecole_ville_annees",
+    r'^(.+?),\s*(.+?),?\s*((?:19|20)\d{2})\s*[-–—]?\s*((?:19|20)\d{2})?$'
+)
+DIPLOME_DESCRIPTION_RX = compile_patterns("section.diplome_description", [
+    r'(Baccalauréat\s*[A-Za-z]*(?:\s+mention\s+[A-Za-zà-ÿ\s]+)?)',
+    r'((?:Dernière\s+)?année\s+du?\s+cycle\s+ingénieur)',
+    r'(Master\s+[A-Za-zà-ÿ\s]+)',
+    r'(Licence\s+[A-Za-zà-ÿ\s]+)',
+    r'(DUT|BTS|Diplôme\s+[A-Za-zà-ÿ\s]+)'
+], re.IGNORECASE)
+ANNEES_OPT_RX = compile_pattern("section.annees_opt", r'((?:19|20)\d{2})\s*[-–—]?\s*((?:19|20)\d{2})?')
 
 def parse_formation_section(texte: str) -> List[dict]:
     """
@@ -571,9 +716,8 @@ def parse_formation_section(texte: str) -> List[dict]:
     """
     formations = []
     
-    # Chercher la section Formations
-    formation_keywords = ["FORMATION", "FORMATIONS", "ÉTUDES", "ETUDES", "ÉDUCATION", "EDUCATION", "CURSUS", "PARCOURS ACADÉMIQUE", "PARCOURS SCOLAIRE"]
-    section_text = extract_section_text(texte, formation_keywords)
+    # Section Formations (découpage du document partagé par tous les parseurs)
+    section_text = section_index_of(texte).section_text("formation")
     
     if not section_text:
         return formations
@@ -587,7 +731,7 @@ def parse_formation_section(texte: str) -> List[dict]:
             continue
         
         # Ignorer les titres de section
-        if re.match(r'^(formations?|études|education|cursus)\s*[:.]?$', line, re.IGNORECASE):
+        if TITRE_FORMATIONS_RX.match(line):
             continue
         
         # Ignorer les lignes qui commencent par un tiret (descriptions)
@@ -595,16 +739,16 @@ def parse_formation_section(texte: str) -> List[dict]:
             continue
         
         # Pattern 1: "2018-2020: Master Informatique - Université Paris"
-        match1 = re.match(r'^((?:19|20)\d{2})\s*[-–—]\s*((?:19|20)\d{2}|[Pp]résent|[Aa]ctuel)\s*[:\-–—]\s*(.+)$', line)
+        match1 = FORMATION_DATE_D_ABORD_RX.match(line)
         
         # Pattern 2: "Université Paris - Master Informatique (2018-2020)"
-        match2 = re.search(r'^(.+?)\s*\(((?:19|20)\d{2})\s*[-–—]\s*((?:19|20)\d{2}|[Pp]résent|[Aa]ctuel)\)$', line)
+        match2 = TITRE_PLAGE_RX.search(line)
         
         # Pattern 3: "École : Diplôme (Lieu)" - format du CV Léo WEBER
-        match3 = re.match(r'^([A-ZÀ-Üa-zà-ÿ][A-Za-zÀ-ÿ\s\-]+?)\s*:\s*(.+?)(?:\s*\(([A-Za-zÀ-ÿ\s\-]+)\))?$', line)
+        match3 = ECOLE_DIPLOME_RX.match(line)
         
         # Pattern 4: "Master Informatique, Université Paris, 2018-2020"
-        match4 = re.match(r'^(.+?),\s*(.+?),?\s*((?:19|20)\d{2})\s*[-–—]?\s*((?:19|20)\d{2})?$', line)
+        match4 = ECOLE_VILLE_ANNEES_RX.match(line)
         
         if match1:
             dates = f"{match1.group(1)} – {match1.group(2)}"
@@ -638,15 +782,8 @@ def parse_formation_section(texte: str) -> List[dict]:
             if is_school_keyword(ecole) or (len(ecole) > 3 and ecole[0].isupper()):
                 # Chercher un diplôme dans la description
                 diplome = None
-                diplome_patterns = [
-                    r'(Baccalauréat\s*[A-Za-z]*(?:\s+mention\s+[A-Za-zà-ÿ\s]+)?)',
-                    r'((?:Dernière\s+)?année\s+du?\s+cycle\s+ingénieur)',
-                    r'(Master\s+[A-Za-zà-ÿ\s]+)',
-                    r'(Licence\s+[A-Za-zà-ÿ\s]+)',
-                    r'(DUT|BTS|Diplôme\s+[A-Za-zà-ÿ\s]+)'
-                ]
-                for pattern in diplome_patterns:
-                    m = re.search(pattern, description, re.IGNORECASE)
+                for pattern in DIPLOME_DESCRIPTION_RX:
+                    m = pattern.search(description)
                     if m:
                         diplome = m.group(1).strip()
                         break
@@ -681,10 +818,10 @@ def parse_formation_section(texte: str) -> List[dict]:
             })
         else:
             # Essayer de parser sans pattern strict
-            date_match = re.search(r'((?:19|20)\d{2})\s*[-–—]?\s*((?:19|20)\d{2})?', line)
+            date_match = ANNEES_OPT_RX.search(line)
             if date_match:
                 dates = date_match.group(0)
-                rest = re.sub(r'((?:19|20)\d{2})\s*[-–—]?\s*((?:19|20)\d{2})?', '', line).strip(" -–—:,()")
+                rest = ANNEES_OPT_RX.sub('', line).strip(" -–—:,()")
                 if rest:
                     diplome, ecole = extract_diploma_school(rest)
                     if ecole or diplome:
@@ -720,10 +857,13 @@ def is_school_keyword(text: str) -> bool:
     return any(kw in text_lower for kw in school_keywords)
 
 
+SEPARATEURS_DIPLOME_RX = compile_pattern("section.separateurs_diplome", r'\s*[-–—,]\s*')
+MAJUSCULE_INITIALE_RX = compile_pattern("section.majuscule_initiale", r'^[A-Z][a-z]')
+
 def extract_diploma_school(text: str) -> Tuple[Optional[str], Optional[str]]:
     """Extrait le diplôme et l'école d'un texte."""
     # Séparer par tiret ou virgule
-    parts = re.split(r'\s*[-–—,]\s*', text)
+    parts = SEPARATEURS_DIPLOME_RX.split(text)
     
     diplome = None
     ecole = None
@@ -739,7 +879,7 @@ def extract_diploma_school(text: str) -> Tuple[Optional[str], Optional[str]]:
             ecole = part
         elif not diplome and not ecole:
             # Premier élément, deviner basé sur les majuscules
-            if re.match(r'^[A-Z][a-z]', part):
+            if MAJUSCULE_INITIALE_RX.match(part):
                 ecole = part
             else:
                 diplome = part
@@ -751,17 +891,45 @@ def extract_diploma_school(text: str) -> Tuple[Optional[str], Optional[str]]:
     return diplome, ecole
 
 
+TITRE_EXPERIENCES_RX = compile_pattern(
+    "section.titre_experiences",
+    r'^(expériences?|experiences?|parcours)\s*(professionnell?e?s?)?\s*[:.]?$',
+    re.IGNORECASE
+)
+TITRE_PROJETS_RX = compile_pattern("section.titre_projets", r'projets?\s*:?\s*$', re.IGNORECASE)
+SEMESTRE_PLAGE_RX = compile_pattern(
+    "section.semestre_plage",
+    r'^(S\d\s+(?:19|20)\d{2})\s*[-–—]\s*((?:19|20)\d{2})\s+(.+?)(?:,\s*(\w+))?\s*$'
+)
+EXPERIENCE_DATE_D_ABORD_RX = compile_pattern(
+    "section.experience_date_d_abord",
+    r'^((?:S\d\s+)?(?:19|20)\d{2})\s*[-–—]\s*((?:19|20)\d{2}|[Pp]résent|[Aa]ctuel(?:lement)?)\s*[:\-–—,]\s*(.+)$'
+)
+SEMESTRE_LIEU_RX = compile_pattern("section.semestre_lieu", r'^(S\d\s+(?:19|20)\d{2})\s+([A-ZÀ-Ü][A-Za-zÀ-ÿ\s\-]+)$')
+STAGE_CHEZ_RX = compile_pattern(
+    "section.stage_chez",
+    r'[Ss]tage\s+(?:de\s+\d+\s+\w+\s+)?chez\s+([A-ZÀ-Ü][A-Za-zÀ-ÿ\s&\-]+?)\s+en\s+tant\s+que\s+(.+)',
+    re.IGNORECASE
+)
+POSTE_CHEZ_RX = compile_pattern(
+    "section.poste_chez",
+    r'^(.+?)\s+(?:chez|à|at|@)\s+([A-ZÀ-Ü][A-Za-zÀ-ÿ\s&\-\']+)',
+    re.IGNORECASE
+)
+TIRET_RX = compile_pattern("section.tiret", r'\s*[-–—]\s*')
+PLAGE_ANNEES_RX = compile_pattern(
+    "section.plage_annees",
+    r'((?:19|20)\d{2})\s*[-–—]\s*((?:19|20)\d{2}|[Pp]résent|[Aa]ctuel)'
+)
+
 def parse_experience_section_v2(texte: str) -> List[dict]:
     """
     Parse la section Expériences du CV de manière structurée (version améliorée).
     """
     experiences = []
     
-    # Chercher la section Expériences
-    exp_keywords = ["EXPÉRIENCE", "EXPERIENCE", "EXPÉRIENCES", "EXPERIENCES", 
-                    "EXPÉRIENCE PROFESSIONNELLE", "EXPÉRIENCES PROFESSIONNELLES",
-                    "PARCOURS PROFESSIONNEL", "PROFESSIONAL EXPERIENCE"]
-    section_text = extract_section_text(texte, exp_keywords)
+    # Section Expériences (découpage du document partagé par tous les parseurs)
+    section_text = section_index_of(texte).section_text("experience")
     
     if not section_text:
         return experiences
@@ -775,30 +943,30 @@ def parse_experience_section_v2(texte: str) -> List[dict]:
             continue
         
         # Ignorer les titres de section
-        if re.match(r'^(expériences?|experiences?|parcours)\s*(professionnell?e?s?)?\s*[:.]?$', line, re.IGNORECASE):
+        if TITRE_EXPERIENCES_RX.match(line):
             continue
         
         # Ignorer les lignes "Projets" qui ne sont pas des expériences
-        if re.search(r'projets?\s*:?\s*$', line, re.IGNORECASE):
+        if TITRE_PROJETS_RX.search(line):
             continue
         
         # Pattern spécial: "S3 2024 – 2025 NomEntreprise/Institution, Lieu" (format Léo WEBER)
-        match_sx_full = re.match(r'^(S\d\s+(?:19|20)\d{2})\s*[-–—]\s*((?:19|20)\d{2})\s+(.+?)(?:,\s*(\w+))?\s*$', line)
+        match_sx_full = SEMESTRE_PLAGE_RX.match(line)
         
         # Pattern 1: "2021-Présent: Lead DevOps chez AWS"
-        match1 = re.match(r'^((?:S\d\s+)?(?:19|20)\d{2})\s*[-–—]\s*((?:19|20)\d{2}|[Pp]résent|[Aa]ctuel(?:lement)?)\s*[:\-–—,]\s*(.+)$', line)
+        match1 = EXPERIENCE_DATE_D_ABORD_RX.match(line)
         
         # Pattern 2: "Lead DevOps - AWS (2021-Présent)"
-        match2 = re.search(r'^(.+?)\s*\(((?:19|20)\d{2})\s*[-–—]\s*((?:19|20)\d{2}|[Pp]résent|[Aa]ctuel)\)$', line)
+        match2 = TITRE_PLAGE_RX.search(line)
         
         # Pattern 3: "S2 2023 Paris" (date + lieu, sans entreprise explicite)
-        match3 = re.match(r'^(S\d\s+(?:19|20)\d{2})\s+([A-ZÀ-Ü][A-Za-zÀ-ÿ\s\-]+)$', line)
+        match3 = SEMESTRE_LIEU_RX.match(line)
         
         # Pattern 4: "Stage de X semaines chez ENTREPRISE en tant que POSTE"
-        match4 = re.search(r'[Ss]tage\s+(?:de\s+\d+\s+\w+\s+)?chez\s+([A-ZÀ-Ü][A-Za-zÀ-ÿ\s&\-]+?)\s+en\s+tant\s+que\s+(.+)', line, re.IGNORECASE)
+        match4 = STAGE_CHEZ_RX.search(line)
         
         # Pattern "Poste chez Entreprise"
-        match_chez = re.search(r'^(.+?)\s+(?:chez|à|at|@)\s+([A-ZÀ-Ü][A-Za-zÀ-ÿ\s&\-\']+)', line, re.IGNORECASE)
+        match_chez = POSTE_CHEZ_RX.search(line)
         
         if match4:
             # "Stage chez X en tant que Y"
@@ -828,7 +996,7 @@ def parse_experience_section_v2(texte: str) -> List[dict]:
             lieu = match_sx_full.group(4).strip() if match_sx_full.group(4) else None
             
             # Nettoyer l'institution (enlever les tirets parasites)
-            institution = re.sub(r'\s*[-–—]\s*', '-', institution).strip('-').strip()
+            institution = TIRET_RX.sub('-', institution).strip('-').strip()
             
             current_exp = {
                 "entreprise": institution,
@@ -899,7 +1067,7 @@ def parse_experience_section_v2(texte: str) -> List[dict]:
             entreprise = match_chez.group(2).strip()
             
             # Chercher la date
-            date_match = re.search(r'((?:19|20)\d{2})\s*[-–—]\s*((?:19|20)\d{2}|[Pp]résent|[Aa]ctuel)', line)
+            date_match = PLAGE_ANNEES_RX.search(line)
             dates = date_match.group(0) if date_match else None
             
             # Si l'expérience courante a une date mais pas d'entreprise, l'utiliser
@@ -918,7 +1086,7 @@ def parse_experience_section_v2(texte: str) -> List[dict]:
             desc_line = line.lstrip('-•*').strip()
             
             # Chercher si c'est une description qui contient "chez ENTREPRISE en tant que POSTE"
-            chez_in_desc = re.search(r'[Ss]tage\s+(?:de\s+\d+\s+\w+\s+)?chez\s+([A-ZÀ-Ü][A-Za-zÀ-ÿ\s&\-]+?)\s+en\s+tant\s+que\s+(.+)', desc_line, re.IGNORECASE)
+            chez_in_desc = STAGE_CHEZ_RX.search(desc_line)
             if chez_in_desc and not current_exp.get("entreprise"):
                 current_exp["entreprise"] = chez_in_desc.group(1).strip()
                 current_exp["poste"] = chez_in_desc.group(2).strip().title()
@@ -935,6 +1103,8 @@ def parse_experience_section_v2(texte: str) -> List[dict]:
     return experiences
 
 
+CHEZ_RX = compile_pattern("section.chez", r'\s+(?:chez|à|at|@)\s+([A-ZÀ-Ü][A-Za-zÀ-ÿ\s&\-\']+)', re.IGNORECASE)
+
 def extract_job_company(text: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
     """Extrait le poste, l'entreprise et le lieu d'un texte."""
     poste = None
@@ -942,15 +1112,15 @@ def extract_job_company(text: str) -> Tuple[Optional[str], Optional[str], Option
     lieu = None
     
     # Pattern "chez/à/at ENTREPRISE"
-    chez_match = re.search(r'\s+(?:chez|à|at|@)\s+([A-ZÀ-Ü][A-Za-zÀ-ÿ\s&\-\']+)', text, re.IGNORECASE)
+    chez_match = CHEZ_RX.search(text)
     if chez_match:
         entreprise = chez_match.group(1).strip()
         poste_text = text[:chez_match.start()].strip()
         after = text[chez_match.end():].strip(" -–—:,")
         
         # Chercher un poste connu dans le texte avant
-        for pattern in POSTE_PATTERNS:
-            m = re.search(pattern, poste_text, re.IGNORECASE)
+        for pattern in POSTE_RX:
+            m = pattern.search(poste_text)
             if m:
                 poste = m.group(1).strip().title()
                 break
@@ -963,7 +1133,7 @@ def extract_job_company(text: str) -> Tuple[Optional[str], Optional[str], Option
             lieu = after
     else:
         # Séparer par tiret ou virgule
-        parts = re.split(r'\s*[-–—]\s*', text)
+        parts = TIRET_RX.split(text)
         
         for i, part in enumerate(parts):
             part = part.strip()
@@ -972,8 +1142,8 @@ def extract_job_company(text: str) -> Tuple[Optional[str], Optional[str], Option
             
             # Chercher un poste connu
             is_poste = False
-            for pattern in POSTE_PATTERNS:
-                if re.search(pattern, part, re.IGNORECASE):
+            for pattern in POSTE_RX:
+                if pattern.search(part):
                     poste = part.title()
                     is_poste = True
                     break
@@ -987,6 +1157,12 @@ def extract_job_company(text: str) -> Tuple[Optional[str], Optional[str], Option
     return poste, entreprise, lieu
 
 
+CHEZ_ENTREPRISE_RX = compile_pattern(
+    "section.chez_entreprise",
+    r'(?:chez|à|at|@)\s+([A-ZÀ-Ü][A-Za-zÀ-ÿ\s\-\']+)',
+    re.IGNORECASE
+)
+
 def parse_experience_section(texte: str) -> List[dict]:
     """
     Parse la section Expériences du CV de manière structurée.
@@ -994,25 +1170,10 @@ def parse_experience_section(texte: str) -> List[dict]:
     """
     experiences = []
     
-    # Pattern pour détecter le début d'une expérience
-    # Format: "S2 2023 Paris" ou "2022 - 2023" ou "Janvier 2022 - Présent"
-    exp_pattern = re.compile(
-        r'(?:S\d\s+)?'  # Optionnel: Semestre
-        r'((?:19|20)\d{2})'  # Année début
-        r'(?:\s*[-–—]\s*(?:((?:19|20)\d{2})|[Pp]résent|[Aa]ctuel))?'  # Optionnel: Année fin
-        r'[,\s]*'
-        r'([A-ZÀ-Ü][A-Za-zÀ-ÿ\s\-\']+)?'  # Lieu ou entreprise
-    )
-    
-    # Chercher la section Expériences
-    exp_section_match = re.search(
-        r'(?:Expériences?\s*(?:professionnelles?)?|Professional\s+Experience)\s*[:\-\n]+(.+?)(?=\n\s*(?:Formations?|Compétences?|Langues?|Certifications?|Projets?|Loisirs?)\s*[:\-\n]|$)',
-        texte, 
-        re.IGNORECASE | re.DOTALL
-    )
+    # Section Expériences (découpage du document partagé par tous les parseurs)
+    exp_text = section_index_of(texte).section_text("experience")
     
-    if exp_section_match:
-        exp_text = exp_section_match.group(1)
+    if exp_text:
         
         # Diviser par lignes et chercher les entrées
         lines = exp_text.split('\n')
@@ -1024,7 +1185,7 @@ def parse_experience_section(texte: str) -> List[dict]:
                 continue
             
             # Chercher une date de début d'expérience
-            date_match = re.search(r'((?:19|20)\d{2})\s*[-–—]\s*((?:19|20)\d{2}|[Pp]résent|[Aa]ctuel)', line)
+            date_match = PLAGE_ANNEES_RX.search(line)
             
             if date_match:
                 # Nouvelle expérience détectée
@@ -1037,7 +1198,7 @@ def parse_experience_section(texte: str) -> List[dict]:
                 rest = line[date_match.end():].strip(" -–—:,")
                 
                 # Chercher "chez ENTREPRISE" ou "à ENTREPRISE"
-                chez_match = re.search(r'(?:chez|à|at|@)\s+([A-ZÀ-Ü][A-Za-zÀ-ÿ\s\-\']+)', rest, re.IGNORECASE)
+                chez_match = CHEZ_ENTREPRISE_RX.search(rest)
                 
                 entreprise = None
                 poste = None
@@ -1047,8 +1208,8 @@ def parse_experience_section(texte: str) -> List[dict]:
                     poste = rest[:chez_match.start()].strip(" -–—:,")
                 else:
                     # Chercher un poste connu
-                    for pattern in POSTE_PATTERNS:
-                        m = re.search(pattern, rest, re.IGNORECASE)
+                    for pattern in POSTE_RX:
+                        m = pattern.search(rest)
                         if m:
                             poste = m.group(1).strip().title()
                             # L'entreprise est peut-être avant ou après le poste
@@ -1084,39 +1245,55 @@ def parse_experience_section(texte: str) -> List[dict]:
 
 def extract_poste_from_context(context: str) -> Optional[str]:
     """Extrait le poste/titre du contexte avec des patterns améliorés"""
-    for pattern in POSTE_PATTERNS:
-        m = re.search(pattern, context, re.IGNORECASE)
+    for pattern in POSTE_RX:
+        m = pattern.search(context)
         if m:
             poste = m.group(1).strip()
-            poste = re.sub(r'\s+', ' ', poste)
+            poste = ESPACES_RX.sub(' ', poste)
             return poste.title()
     return None
 
+CHIFFRES_6_RX = compile_pattern("section.chiffres_6", r'[@\d]{6,}')
+
 def extract_titre_profil(texte: str) -> Optional[str]:
     """Extrait le titre/profil du candidat (ex: Développeur Full Stack)"""
-    lines = [l.strip() for l in texte.split('\n') if l.strip()][:20]
+    lines = as_context(texte).non_empty_lines[:20]
     
     for line in lines:
         if len(line) < 5 or len(line) > 80:
             continue
-        if re.search(r'[@\d]{6,}', line):
+        if CHIFFRES_6_RX.search(line):
             continue
         
-        for pattern in POSTE_PATTERNS:
-            m = re.search(pattern, line, re.IGNORECASE)
+        for pattern in POSTE_RX:
+            m = pattern.search(line)
             if m:
                 return m.group(1).strip().title()
     
     return None
 
+DIPLOME_RX = compile_pattern(
+    "section.diplome",
+    r"(Master|Licence|Bachelor|DUT|BTS|Ingénieur|Doctorat|MBA)(?:\s+[A-Za-zÀ-ÿ]+){0,4}",
+    re.IGNORECASE
+)
+PLAGE_ANNEES_TEXTE_RX = compile_pattern(
+    "section.plage_annees_texte",
+    r"(?:19|20)\d{2}\s*[-–—]\s*(?:(?:19|20)\d{2}|[Pp]résent|[Aa]ctuel)"
+)
+
+@traced("classification")
 def classifier_formations_experiences(texte: str, entites: dict, dates: List[str]):
     formations, experiences = [], []
-    date_spans = extract_date_spans(texte)
+    ctx = as_context(texte)
+    texte = ctx.texte
+    texte_lower = ctx.texte_lower
+    date_index = ctx.date_index
 
     # === PRIORITÉ 1: Parser les sections directement ===
     # Cela donne de meilleurs résultats que l'extraction par entités NER
     
-    parsed_formations = parse_formation_section(texte)
+    parsed_formations = parse_formation_section(ctx)
     if parsed_formations:
         for f in parsed_formations:
             if f.get("etablissement") or f.get("diplome"):
@@ -1129,7 +1306,7 @@ def classifier_formations_experiences(texte: str, entites: dict, dates: List[str
                     "diplome": f.get("diplome")
                 })
     
-    parsed_experiences = parse_experience_section_v2(texte)
+    parsed_experiences = parse_experience_section_v2(ctx)
     if parsed_experiences:
         for e in parsed_experiences:
             if e.get("entreprise") and is_valid_company(e["entreprise"]):
@@ -1148,14 +1325,14 @@ def classifier_formations_experiences(texte: str, entites: dict, dates: List[str
             if not is_valid_school(ecole_clean):
                 continue
             
-            date_assoc = find_closest_date_by_char(ecole_clean, texte, date_spans)
+            date_assoc = find_closest_date_by_char(ecole_clean, ctx, date_index)
             
             # Chercher le diplôme associé
             diplome = None
+            idx_ecole = texte_lower.find(ecole_clean.lower())
             for dip in entites.get("diplomes", []):
                 # Vérifier si le diplôme est proche de l'école dans le texte
-                idx_ecole = texte.lower().find(ecole_clean.lower())
-                idx_dip = texte.lower().find(dip.lower())
+                idx_dip = texte_lower.find(dip.lower())
                 if idx_ecole != -1 and idx_dip != -1:
                     if abs(idx_ecole - idx_dip) < 200:  # Proximité de 200 caractères
                         diplome = dip
@@ -1179,27 +1356,26 @@ def classifier_formations_experiences(texte: str, entites: dict, dates: List[str
             if not is_valid_company(entreprise_clean):
                 continue
             
-            date_assoc = find_closest_date_by_char(entreprise_clean, texte, date_spans)
+            date_assoc = find_closest_date_by_char(entreprise_clean, ctx, date_index)
             
             # Chercher le poste associé
             poste = None
+            idx_ent = texte_lower.find(entreprise_clean.lower())
             for p in entites.get("postes", []):
-                idx_ent = texte.lower().find(entreprise_clean.lower())
-                idx_poste = texte.lower().find(p.lower())
+                idx_poste = texte_lower.find(p.lower())
                 if idx_ent != -1 and idx_poste != -1:
                     if abs(idx_ent - idx_poste) < 200:
                         poste = p.title()
                         break
             
             if not poste:
-                sentences = re.split(r'[.!\n]', texte)
-                for s in sentences:
-                    if entreprise_clean.lower() in s.lower():
+                for s, s_lower in zip(ctx.sentences, ctx.sentences_lower):
+                    if entreprise_clean.lower() in s_lower:
                         poste = extract_poste_from_context(s)
                         break
             
             if not poste:
-                idx = texte.lower().find(entreprise_clean.lower())
+                idx = idx_ent
                 if idx != -1:
                     window = texte[max(0, idx-100):min(len(texte), idx+150)]
                     poste = extract_poste_from_context(window)
@@ -1232,25 +1408,24 @@ def classifier_formations_experiences(texte: str, entites: dict, dates: List[str
         if not is_valid_company(org_clean) and not is_formation(org_clean, ""):
             continue
 
-        date_assoc = find_closest_date_by_char(org_clean, texte, date_spans)
+        date_assoc = find_closest_date_by_char(org_clean, ctx, date_index)
         
-        sentences = re.split(r'[.!\n]', texte)
         context = ""
-        for s in sentences:
-            if org_clean.lower() in s.lower():
+        for s, s_lower in zip(ctx.sentences, ctx.sentences_lower):
+            if org_clean.lower() in s_lower:
                 context = s
                 break
         
         poste = extract_poste_from_context(context)
         
         if not poste:
-            idx = texte.lower().find(org_clean.lower())
+            idx = texte_lower.find(org_clean.lower())
             if idx != -1:
                 window = texte[max(0, idx-100):min(len(texte), idx+150)]
                 poste = extract_poste_from_context(window)
 
         if is_formation(org_clean, context):
-            diplome_match = re.search(r"(Master|Licence|Bachelor|DUT|BTS|Ingénieur|Doctorat|MBA)(?:\s+[A-Za-zÀ-ÿ]+){0,4}", context, re.IGNORECASE)
+            diplome_match = DIPLOME_RX.search(context)
             diplome = diplome_match.group(0).strip() if diplome_match else None
             formations.append({
                 "etablissement": org_clean, 
@@ -1275,8 +1450,8 @@ def classifier_formations_experiences(texte: str, entites: dict, dates: List[str
             })
 
     for item in formations + experiences:
-        if item.get("dates") in (None, "", "2025-11-12", "2026-01-03"):
-            match = re.search(r"(?:19|20)\d{2}\s*[-–—]\s*(?:(?:19|20)\d{2}|[Pp]résent|[Aa]ctuel)", texte)
+        if not item.get("dates"):
+            match = PLAGE_ANNEES_TEXTE_RX.search(texte)
             if match:
                 item["dates"] = match.group(0)
 
@@ -1285,14 +1460,112 @@ def classifier_formations_experiences(texte: str, entites: dict, dates: List[str
 
 
 # ---------------------
-# 5️ Construction JSON + affichage rich
+# 5️ Construction JSON + sorties optionnelles
 # ---------------------
-def build_structured_json(emails, telephones, adresses, dates, texte_cv):
-    entites = extraire_entites(texte_cv)
+def json_file_sink(output_dir="data/output", filename=None, indent=4):
+    """
+    Sortie qui enregistre le résultat en JSON dans `output_dir`.
+    `filename` : nom fixe, callable(résultat) -> nom, ou None (cv_result_<horodatage>.json).
+    """
+    def sink(json_data):
+        os.makedirs(output_dir, exist_ok=True)
+        if filename is None:
+            name = f"cv_result_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        else:
+            name = filename(json_data) if callable(filename) else filename
+        path = os.path.join(output_dir, name)
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(json_data, f, indent=indent, ensure_ascii=False)
+        return path
+
+    return sink
+
+
+def rich_table_sink(console=None):
+    """Sortie qui affiche le résultat sous forme de tableau rich (usage CLI)."""
+    from rich.console import Console
+    from rich.table import Table
+
+    console = console or Console()
+
+    def sink(json_final):
+        contact = json_final["contact"]
+        formations, experiences = json_final["formations"], json_final["experiences"]
+        table = Table(title="Résultats d'analyse du CV", show_header=True, header_style="bold magenta")
+        table.add_column("Section", style="cyan", no_wrap=True)
+        table.add_column("Contenu principal", style="white")
+        table.add_row("👤 Nom", contact["nom"] or "—")
+        table.add_row("📧 Email", contact["email"] or "—")
+        table.add_row("📞 Téléphone", contact["telephone"] or "—")
+        table.add_row("🏠 Adresse", contact["adresse"] or "—")
+        table.add_row("🎓 Formations", str([f"{f['etablissement']} ({f['dates']})" for f in formations]))
+        table.add_row("💼 Expériences", str([f"{e['entreprise']} - {e.get('poste', '—')} ({e['dates']})" for e in experiences]))
+        table.add_row("🧠 Compétences", ", ".join(json_final["competences"][:10]))
+        table.add_row("🌐 Langues", ", ".join(json_final["langues"]))
+        table.add_row("🚀 Projets", ", ".join(json_final["projets"]) or "—")
+        table.add_row("🏅 Certifications", ", ".join(json_final["certifications"]) or "—")
+        table.add_row("🎯 Loisirs", ", ".join(json_final["loisirs"]) or "—")
+        table.add_row("📅 Disponibilité", json_final["disponibilite"] or "—")
+        console.print(table)
+
+    return sink
+
+
+def build_structured_json_batch(items, batch_size=32, n_process=1, sinks=None):
+    """
+    Construit le JSON structuré de plusieurs CV en une passe NER groupée (nlp.pipe).
+    `items` est une liste de dicts avec les clés emails, telephones, adresses, dates, texte_cv.
+    Un texte_cv déjà sous forme d'AnalysisContext est réutilisé (dates déjà repérées).
+    `sinks` est transmis à build_structured_json() pour chaque CV.
+    """
+    items = list(items)
+    contexts = AnalysisContext.batch(
+        [item["texte_cv"] for item in items], batch_size=batch_size, n_process=n_process
+    )
+    return [
+        build_structured_json(
+            emails=item["emails"],
+            telephones=item["telephones"],
+            adresses=item["adresses"],
+            dates=item["dates"],
+            texte_cv=ctx,
+            sinks=sinks,
+        )
+        for item, ctx in zip(items, contexts)
+    ]
+
+
+PREFIXE_COMPETENCE_RX = compile_pattern(
+    "section.prefixe_competence",
+    r'^(?:Langage|Outils?|Analyse|Gestion)[^\:]*:\s*',
+    re.IGNORECASE
+)
+CODE_POSTAL_SEUL_RX = compile_pattern("section.code_postal_seul", r'^\d{5}$')
+METIER_DANS_NOM_RX = compile_pattern(
+    "section.metier_dans_nom",
+    r"\b(?:développeur|developer|ingénieur|consultant|manager|full\s*stack|data|web|chef|stagiaire|alternant)\b.*",
+    re.IGNORECASE
+)
+PONCTUATION_FIN_RX = compile_pattern("section.ponctuation_fin", r"[\-–—:,]+$")
+
+def build_structured_json(emails, telephones, adresses, dates, texte_cv, entites=None, sinks=None):
+    """
+    Construit le JSON structuré d'un CV et le retourne, sans effet de bord.
+    `sinks` : callables optionnels appelés avec le résultat (ex: json_file_sink(),
+    rich_table_sink()) pour la sauvegarde ou l'affichage.
+    """
+    # Un seul contexte (et un seul passage spaCy) partagé par toutes les étapes
+    ctx = as_context(texte_cv)
+    texte_cv = ctx.texte
+    if entites is None:
+        doc = ctx.doc
+        with stage("entites"):
+            entites = extraire_entites_doc(doc)
     entites["organisations"] = nettoyer_organisations(entites.get("organisations", []))
 
     # === Nom (PRIORITÉ : extraction depuis l'en-tête) ===
-    nom = extract_name_from_header(texte_cv)
+    nom = extract_name_from_header(ctx)
     
     # Fallback: utiliser spaCy si l'heuristique échoue
     if not nom and entites.get("noms"):
@@ -1306,24 +1579,19 @@ def build_structured_json(emails, telephones, adresses, dates, texte_cv):
     
     # Nettoyage final du nom
     if nom:
-        nom = re.sub(
-            r"\b(?:développeur|developer|ingénieur|consultant|manager|full\s*stack|data|web|chef|stagiaire|alternant)\b.*",
-            "",
-            nom,
-            flags=re.IGNORECASE
-        ).strip()
-        nom = re.sub(r"[\-–—:,]+$", "", nom).strip()
+        nom = METIER_DANS_NOM_RX.sub("", nom).strip()
+        nom = PONCTUATION_FIN_RX.sub("", nom).strip()
         
         # Dernière vérification: le nom ne doit pas être un mot parasite
         if nom.lower() in NAME_EXCLUSIONS or any(w in nom.lower() for w in ["savoirs", "être", "soft", "hard", "skills"]):
             nom = None
 
     # === Titre du profil ===
-    titre_profil = extract_titre_profil(texte_cv)
+    titre_profil = extract_titre_profil(ctx)
     
     if not titre_profil:
-        for pattern in POSTE_PATTERNS[:5]:
-            m = re.search(pattern, texte_cv[:500], re.IGNORECASE)
+        for pattern in POSTE_RX[:5]:
+            m = pattern.search(texte_cv[:500])
             if m:
                 titre_profil = m.group(1).strip().title()
                 break
@@ -1337,11 +1605,11 @@ def build_structured_json(emails, telephones, adresses, dates, texte_cv):
     }
 
     # === Sections ===
-    formations, experiences = classifier_formations_experiences(texte_cv, entites, dates)
+    formations, experiences = classifier_formations_experiences(ctx, entites, dates)
     
     # FALLBACK: Si pas d'expériences valides, utiliser le parser de section
     if not experiences or len(experiences) < 1:
-        parsed_exp = parse_experience_section(texte_cv)
+        parsed_exp = parse_experience_section(ctx)
         if parsed_exp:
             experiences = parsed_exp
     
@@ -1355,13 +1623,14 @@ def build_structured_json(emails, telephones, adresses, dates, texte_cv):
             valid_experiences.append(exp)
     experiences = valid_experiences if valid_experiences else experiences
     
-    comp_kw, lang_kw = extraire_competences_langues(texte_cv)
-    comp_sec = parse_section_competences(texte_cv)
-    lang_sec = parse_section_langues(texte_cv)
-    projets = parse_section_projets(texte_cv)
-    certifs = parse_section_certifications(texte_cv)
-    loisirs = parse_section_loisirs(texte_cv)
-    dispo = parse_disponibilite(texte_cv)
+    with stage("sections"):
+        comp_kw, lang_kw = extraire_competences_langues(ctx)
+        comp_sec = parse_section_competences(ctx)
+        lang_sec = parse_section_langues(ctx)
+        projets = parse_section_projets(ctx)
+        certifs = parse_section_certifications(ctx)
+        loisirs = parse_section_loisirs(ctx)
+        dispo = parse_disponibilite(ctx)
 
     # === Nettoyage des listes avec meilleure normalisation ===
     # Mots à exclure des compétences
@@ -1392,7 +1661,7 @@ def build_structured_json(emails, telephones, adresses, dates, texte_cv):
             if x_norm.endswith(':') or x_norm.startswith(':'):
                 continue
             # Exclure les codes postaux (5 chiffres)
-            if re.match(r'^\d{5}$', x):
+            if CODE_POSTAL_SEUL_RX.match(x):
                 continue
             # Exclure les numéros purs
             if x.isdigit():
@@ -1417,7 +1686,7 @@ def build_structured_json(emails, telephones, adresses, dates, texte_cv):
     competences_clean = []
     for comp in competences:
         # Supprimer les préfixes comme "Langage informatiques :"
-        comp = re.sub(r'^(?:Langage|Outils?|Analyse|Gestion)[^\:]*:\s*', '', comp, flags=re.IGNORECASE)
+        comp = PREFIXE_COMPETENCE_RX.sub('', comp)
         comp = comp.strip()
         if comp and len(comp) >= 2 and comp.lower() not in COMPETENCE_EXCLUSIONS:
             competences_clean.append(comp)
@@ -1444,37 +1713,8 @@ def build_structured_json(emails, telephones, adresses, dates, texte_cv):
         "dates": dates if dates else [],
     }
 
-    # === Sauvegarde dans /data/output ===
-    def save_to_output_folder(json_data):
-        output_dir = "data/output"
-        os.makedirs(output_dir, exist_ok=True)
-
-        filename = f"cv_result_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        path = os.path.join(output_dir, filename)
-
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(json_data, f, indent=4, ensure_ascii=False)
-
-        print(f"\n📁 Résultat JSON enregistré ici : {path}\n")
-
-    save_to_output_folder(json_final)
-
-    # === Affichage console ===
-    table = Table(title="Résultats d'analyse du CV", show_header=True, header_style="bold magenta")
-    table.add_column("Section", style="cyan", no_wrap=True)
-    table.add_column("Contenu principal", style="white")
-    table.add_row("👤 Nom", nom or "—")
-    table.add_row("📧 Email", contact["email"] or "—")
-    table.add_row("📞 Téléphone", contact["telephone"] or "—")
-    table.add_row("🏠 Adresse", contact["adresse"] or "—")
-    table.add_row("🎓 Formations", str([f"{f['etablissement']} ({f['dates']})" for f in formations]))
-    table.add_row("💼 Expériences", str([f"{e['entreprise']} - {e.get('poste', '—')} ({e['dates']})" for e in experiences]))
-    table.add_row("🧠 Compétences", ", ".join(competences[:10]))
-    table.add_row("🌐 Langues", ", ".join(langues))
-    table.add_row("🚀 Projets", ", ".join(projets) or "—")
-    table.add_row("🏅 Certifications", ", ".join(certifs) or "—")
-    table.add_row("🎯 Loisirs", ", ".join(loisirs) or "—")
-    table.add_row("📅 Disponibilité", dispo or "—")
-    console.print(table)
+    # === Sorties optionnelles (fichier, console...) choisies par l'appelant ===
+    for sink in sinks or ():
+        sink(json_final)
 
     return json_final
@@ -0,0 +1,220 @@
+"""
+Découpage d'un CV en sections, calculé une fois par document.
+
+Les titres de section ("FORMATION", "Expérience professionnelle", "Langues :
+Anglais courant"...) sont repérés en une seule passe par un motif unique, union
+des mots-clés de chaque section. Le résultat est une table
+{section: (début, fin)} : position du contenu de la section, de la fin de son
+titre au titre de section suivant. Les sections en liste (compétences,
+langues, projets, certifications, loisirs) s'arrêtent aussi à la première ligne
+vide qui suit leur contenu. Tous les parseurs de section_classifier lisent la
+même table, donc les mêmes limites de sections.
+
+Avec CV_SECTION_TEXTCAT=1, les lignes qui ressemblent à un titre sans contenir
+de mot-clé ("STAGES ET ALTERNANCES", "HOBBIES"...) sont classées par le TextCat
+du modèle, s'il en a un.
+
+Le résultat (SectionIndex) est mis en cache par AnalysisContext.sections.
+"""
+
+import os
+import re
+import logging
+from typing import Dict, List, Optional, Tuple
+
+# Import adaptatif pour patterns / cv_context
+try:
+    from extractors.patterns import compile_pattern
+    from extractors.cv_context import is_context
+except ImportError:
+    try:
+        from .patterns import compile_pattern
+        from .cv_context import is_context
+    except ImportError:
+        from patterns import compile_pattern
+        from cv_context import is_context
+
+logger = logging.getLogger(__name__)
+
+SECTION_TEXTCAT = os.environ.get("CV_SECTION_TEXTCAT", "0") == "1"
+
+# Mots-clés de titre par section (insensibles à la casse)
+SECTION_KEYWORDS = {
+    "profil": [r"profil", r"r[ée]sum[ée]", r"[àa] propos(?: de moi)?"],
+    "formation": [r"formations?", r"[ée]tudes", r"[ée]ducation", r"cursus(?: scolaire)?",
+                  r"parcours acad[ée]mique", r"parcours scolaire", r"dipl[ôo]mes?"],
+    "experience": [r"exp[ée]riences?", r"parcours professionnel", r"professional experience",
+                   r"stages et alternances?"],
+    "competences": [r"comp[ée]tences?", r"technical skills", r"skills", r"savoir-faire",
+                    r"outils et technologies"],
+    "langues": [r"langues?", r"languages"],
+    "projets": [r"projets?", r"r[ée]alisations?"],
+    "certifications": [r"certifications?", r"certificats?"],
+    "loisirs": [r"loisirs?", r"centres? d['’]int[ée]r[êe]ts?", r"int[ée]r[êe]ts", r"hobbies", r"passions?"],
+}
+
+# Compléments admis après le mot-clé dans un titre ("Compétences techniques")
+QUALIFICATIFS = (
+    r"professionnel(?:le)?s?|techniques?|informatiques?|personnel(?:le)?s?|parl[ée]es|"
+    r"cl[ée]s|acad[ée]miques?|scolaires?|pratiques?|linguistiques?"
+)
+
+# Catégories du TextCat (training_data.py) -> section
+TEXTCAT_SECTIONS = {
+    "PROFILE": "profil",
+    "EDUCATION": "formation",
+    "EXPERIENCE": "experience",
+    "SKILLS": "competences",
+    "LANGUAGES": "langues",
+    "PROJECTS": "projets",
+    "CERTIFICATIONS": "certifications",
+    "INTERESTS": "loisirs",
+}
+TEXTCAT_MIN_SCORE = 0.5
+TEXTCAT_PIPES = ("textcat", "textcat_multilabel")
+
+# Sections en liste : leur contenu s'arrête à la première ligne vide
+SECTIONS_EN_LISTE = {"competences", "langues", "projets", "certifications", "loisirs"}
+
+
+def _union(keywords) -> str:
+    # Un titre : mot-clé en début de ligne, complément éventuel, puis fin de
+    # ligne ou ":" suivi du contenu ("Langues : Anglais courant")
+    alternatives = "|".join(
+        f"(?P<{section}>{'|'.join(words)})" for section, words in keywords.items()
+    )
+    return (
+        rf"^[ \t]*(?:{alternatives})(?:[ \t]+(?:{QUALIFICATIFS}))?"
+        rf"[ \t]*(?::[ \t]*|$)"
+    )
+
+
+TITRES_RX = compile_pattern("sections.titres", _union(SECTION_KEYWORDS), re.IGNORECASE | re.MULTILINE)
+LIGNE_RX = compile_pattern("sections.ligne", r"^.*$", re.MULTILINE)
+CHIFFRE_RX = compile_pattern("sections.chiffre", r"\d")
+NON_BLANC_RX = compile_pattern("sections.non_blanc", r"\S")
+LIGNE_VIDE_RX = compile_pattern("sections.ligne_vide", r"\n[ \t]*\n")
+
+
+def _registry():
+    # Import paresseux : le découpage par mots-clés ne dépend pas de spaCy
+    try:
+        from extractors import model_registry
+    except ImportError:
+        try:
+            from . import model_registry
+        except ImportError:
+            import model_registry
+    return model_registry
+
+
+class SectionIndex:
+    """Titres de section d'un texte et table {section: (début, fin)} de leur contenu."""
+
+    def __init__(self, text: str, model: Optional[str] = None):
+        self.text = text
+        # (section, début du titre, début du contenu), triés par position
+        self.headers: List[Tuple[str, int, int]] = [
+            (m.lastgroup, m.start(), m.end()) for m in TITRES_RX.finditer(text)
+        ]
+        if model and SECTION_TEXTCAT:
+            self.headers = sorted(self.headers + self._textcat_headers(model), key=lambda h: h[1])
+        self.pieces: Dict[str, List[Tuple[int, int]]] = self._build_pieces()
+        self.spans: Dict[str, Tuple[int, int]] = self._spans()
+
+    def _heading_candidates(self) -> List[Tuple[int, int]]:
+        """Lignes en majuscules, courtes et sans chiffre, qui ne sont pas des titres connus."""
+        known = {start for _, start, _ in self.headers}
+        candidates = []
+        for m in LIGNE_RX.finditer(self.text):
+            line = m.group(0).strip()
+            if (3 <= len(line) <= 40 and line.isupper() and ":" not in line
+                    and "@" not in line and not CHIFFRE_RX.search(line)):
+                if m.start() not in known:
+                    candidates.append((m.start(), m.end()))
+        return candidates
+
+    def _textcat_headers(self, model: str) -> List[Tuple[str, int, int]]:
+        candidates = self._heading_candidates()
+        if not candidates:
+            return []
+        try:
+            registry = _registry()
+            # Vérifié sur config.cfg : un modèle sans TextCat n'est pas chargé pour rien
+            if not registry.has_component(model, TEXTCAT_PIPES):
+                return []
+            registry.get_model(model)
+        except (ImportError, OSError, KeyError) as e:
+            logger.debug(f"TextCat indisponible pour le découpage en sections: {e}")
+            return []
+
+        # Chaque candidat est classé avec son bloc : du titre au titre suivant
+        bornes = sorted([start for _, start, _ in self.headers] + [start for start, _ in candidates])
+        blocs = []
+        for start, _ in candidates:
+            suivant = next((b for b in bornes if b > start), len(self.text))
+            blocs.append(self.text[start:suivant])
+
+        headers = []
+        docs = registry.parse_batch(blocs, model, "textcat")
+        for (start, end), doc in zip(candidates, docs):
+            if not doc.cats:
+                continue
+            label, score = max(doc.cats.items(), key=lambda x: x[1])
+            section = TEXTCAT_SECTIONS.get(label)
+            if section and score >= TEXTCAT_MIN_SCORE:
+                headers.append((section, start, end))
+        return headers
+
+    def _build_pieces(self) -> Dict[str, List[Tuple[int, int]]]:
+        # Une section va de la fin de son titre au titre d'une autre section ;
+        # des titres consécutifs de la même section ("Langues parlées :") la
+        # prolongent, leur contenu s'ajoute sans le titre.
+        # Une section présente deux fois garde sa première occurrence.
+        # Une section en liste s'arrête à la première ligne vide après son contenu.
+        pieces: Dict[str, List[Tuple[int, int]]] = {}
+        courante = None
+        bornes = [start for _, start, _ in self.headers[1:]] + [len(self.text)]
+        for (section, _, body), fin in zip(self.headers, bornes):
+            if section != courante and section in pieces:
+                courante = None  # Deuxième occurrence : ignorée
+                continue
+            if section != courante:
+                courante = section
+                pieces[section] = []
+            if section in SECTIONS_EN_LISTE:
+                fin = self._fin_de_bloc(body, fin)
+            pieces[section].append((body, fin))
+        return pieces
+
+    def _fin_de_bloc(self, start: int, fin: int) -> int:
+        contenu = NON_BLANC_RX.search(self.text, start, fin)
+        if not contenu:
+            return fin
+        vide = LIGNE_VIDE_RX.search(self.text, contenu.start(), fin)
+        return vide.start() if vide else fin
+
+    def _spans(self) -> Dict[str, Tuple[int, int]]:
+        return {section: (p[0][0], p[-1][1]) for section, p in self.pieces.items()}
+
+    def span(self, section: str) -> Optional[Tuple[int, int]]:
+        return self.spans.get(section)
+
+    def section_text(self, section: str) -> Optional[str]:
+        """Contenu de la section (sans ses titres), None si le CV n'en a pas."""
+        pieces = self.pieces.get(section)
+        if not pieces:
+            return None
+        texte = "\n".join(self.text[start:end].strip() for start, end in pieces)
+        return texte.strip() or None
+
+
+def index_sections(text: str, model: Optional[str] = None) -> SectionIndex:
+    return SectionIndex(text, model)
+
+
+def section_index_of(texte) -> SectionIndex:
+    """SectionIndex d'un texte ou d'un AnalysisContext (calculé une fois par contexte)."""
+    if is_context(texte):
+        return texte.sections
+    return index_sections(texte)
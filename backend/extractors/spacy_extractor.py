@@ -1,15 +1,23 @@
-import spacy
 import re
 import os
 from pathlib import Path
 import logging
 
+# Import adaptatif pour model_registry
+try:
+    from extractors.model_registry import get_model, is_trained_model, parse
+except ImportError:
+    try:
+        from .model_registry import get_model, is_trained_model, parse
+    except ImportError:
+        from model_registry import get_model, is_trained_model, parse
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Chemin vers le modèle entraîné
 TRAINED_MODEL_PATH = Path(__file__).parent.parent / "models" / "cv_ner"
-BASE_MODEL = "fr_core_news_md"
+MODEL_NAME = "cv_ner"
 
 # Titres de sections courants à ignorer pour les noms
 SECTION_TITLES = {
@@ -130,31 +138,33 @@ def clean_name(text: str) -> str:
 
 def load_spacy_model():
     """
-    Charge le modèle spaCy : utilise le modèle entraîné s'il existe,
-    sinon charge le modèle de base fr_core_news_md
+    Retourne le modèle spaCy partagé (entraîné s'il existe, sinon fr_core_news_md)
+    et un booléen indiquant s'il s'agit du modèle entraîné.
+    Le chargement est délégué au registre central : un seul chargement par processus.
     """
-    if TRAINED_MODEL_PATH.exists():
-        try:
-            logger.info(f"Chargement du modèle entraîné depuis: {TRAINED_MODEL_PATH}")
-            model = spacy.load(str(TRAINED_MODEL_PATH))
-            logger.info("✓ Modèle entraîné chargé avec succès")
-            return model, True
-        except Exception as e:
-            logger.warning(f"Erreur lors du chargement du modèle entraîné: {e}")
-            logger.info(f"Fallback vers le modèle de base: {BASE_MODEL}")
-    
-    logger.info(f"Chargement du modèle de base: {BASE_MODEL}")
-    return spacy.load(BASE_MODEL), False
+    return get_model(MODEL_NAME), is_trained_model(MODEL_NAME)
+
 
-# Charge le modèle de langue français (entraîné ou base)
-nlp, IS_TRAINED_MODEL = load_spacy_model()
+def __getattr__(name):
+    # Accès paresseux à `nlp` / `IS_TRAINED_MODEL` : plus de chargement à l'import
+    if name == "nlp":
+        return get_model(MODEL_NAME)
+    if name == "IS_TRAINED_MODEL":
+        return is_trained_model(MODEL_NAME)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def extraire_entites(texte):
+def extraire_entites(texte, mode="ner"):
     """
     Extrait les entités (organisations, lieux, personnes, etc.) avec fallback regex.
     Gère à la fois les labels personnalisés (modèle entraîné) et les labels standards.
+    Par défaut seul le composant NER est exécuté (mode="ner") ; mode="full" lance tout le pipeline.
     """
-    doc = nlp(texte)
+    return extraire_entites_doc(parse(texte, MODEL_NAME, mode))
+
+
+def extraire_entites_doc(doc):
+    """Extrait les entités d'un Doc spaCy déjà calculé (voir extraire_entites)."""
+    texte = doc.text
     entites = {
         "noms": [],
         "organisations": [],
@@ -0,0 +1,197 @@
+"""
+Mesure du temps passé dans chaque étape du pipeline d'analyse.
+
+    with stage("lecture"):
+        texte = lire_document(...)
+
+    @traced("classification")
+    def classifier(...): ...
+
+Chaque étape enregistre son temps réel (wall) et son temps CPU (du thread).
+- Dans une trace ouverte par start_trace() (une par analyse), les durées sont
+  cumulées par étape : c'est le détail renvoyé dans la réponse de l'API.
+- Pour tout le processus, elles alimentent un histogramme par étape (stage_stats()).
+Les étapes peuvent être imbriquées : le temps de "spacy" est compris dans celui
+de "structuration".
+
+CV_TRACING=0 désactive la mesure : stage() renvoie un gestionnaire vide et
+traced() laisse la fonction telle quelle.
+"""
+
+import os
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Dict, Optional
+
+TRACING_ENABLED = os.environ.get("CV_TRACING", "1") == "1"
+
+# Bornes des histogrammes (secondes), comme les buckets Prometheus
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Répartition des durées d'une étape (compteurs cumulés par borne)."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.cpu_sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, wall: float, cpu: float = 0.0):
+        i = bisect_left(self.buckets, wall)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += wall
+            self.cpu_sum += cpu
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self.counts)
+            count, total, cpu = self.count, self.sum, self.cpu_sum
+        cumul, buckets = 0, []
+        for bound, n in zip(self.buckets + (float("inf"),), counts):
+            cumul += n
+            buckets.append((bound, cumul))
+        return {"count": count, "sum": total, "cpu_sum": cpu, "buckets": buckets}
+
+
+class Trace:
+    """Durées cumulées par étape pour une analyse."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    def add(self, name: str, wall: float, cpu: float, count: int = 1):
+        rec = self.stages.get(name)
+        if rec is None:
+            self.stages[name] = {"wall": wall, "cpu": cpu, "count": count}
+        else:
+            rec["wall"] += wall
+            rec["cpu"] += cpu
+            rec["count"] += count
+
+    def durations(self) -> Dict[str, float]:
+        """{étape: temps réel cumulé}."""
+        return {name: rec["wall"] for name, rec in self.stages.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": round(time.perf_counter() - self.started, 4),
+            "stages": {
+                name: {"wall": round(rec["wall"], 4), "cpu": round(rec["cpu"], 4), "count": rec["count"]}
+                for name, rec in self.stages.items()
+            },
+        }
+
+
+_current: ContextVar[Optional[Trace]] = ContextVar("cv_trace", default=None)
+_histograms: Dict[str, Histogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def _histogram(name: str) -> Histogram:
+    hist = _histograms.get(name)
+    if hist is None:
+        with _histograms_lock:
+            hist = _histograms.setdefault(name, Histogram())
+    return hist
+
+
+def record(name: str, wall: float, cpu: float = 0.0):
+    """Enregistre une durée mesurée ailleurs (trace courante + histogramme)."""
+    trace = _current.get()
+    if trace is not None:
+        trace.add(name, wall, cpu)
+    _histogram(name).observe(wall, cpu)
+
+
+def merge_trace(breakdown: Dict[str, Any]):
+    """
+    Reporte le détail d'une trace calculée dans un autre processus (Trace.to_dict())
+    dans la trace courante et les histogrammes de ce processus.
+    """
+    trace = _current.get()
+    for name, rec in (breakdown or {}).get("stages", {}).items():
+        if trace is not None:
+            trace.add(name, rec["wall"], rec["cpu"], rec["count"])
+        _histogram(name).observe(rec["wall"], rec["cpu"])
+
+
+class _Stage:
+    __slots__ = ("name", "wall", "cpu")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.thread_time()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.wall, time.thread_time() - self.cpu)
+        return False
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name: str):
+    """Gestionnaire de contexte mesurant l'étape `name`."""
+    if not TRACING_ENABLED:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+def traced(name: str = None):
+    """Décorateur : mesure chaque appel de la fonction (étape `name`, par défaut son nom)."""
+    def decorator(fn):
+        if not TRACING_ENABLED:
+            return fn
+        label = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Stage(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def start_trace():
+    """Ouvre une trace pour le bloc (une analyse) et la rend."""
+    trace = Trace()
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+def stage_stats() -> Dict[str, Dict[str, Any]]:
+    """Histogrammes de toutes les étapes mesurées dans ce processus."""
+    return {name: hist.snapshot() for name, hist in list(_histograms.items())}
@@ -348,6 +348,24 @@ def normalize_old_cv_to_new(cv_data: Dict, docx_path: str = None) -> Dict[str, A
     }
 
 
+def normalize_batch_item(cv_data: Dict) -> Dict[str, Any]:
+    """
+    Normalise un CV d'un lot (/api/cv/normalize-batch).
+    Exécuté dans les processus du pool de lots : la fonction doit rester
+    importable hors de api.py pour être retrouvée par les workers.
+    """
+    try:
+        return {
+            'success': True,
+            'cv_normalized': normalize_old_cv_to_new(cv_data)
+        }
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+
 def convert_v2_to_old_format(cv_template: Dict) -> Dict[str, Any]:
     """
     Convertit le format template Sopra vers le format ancien pour compatibilité avec generate_sopra_docx.
@@ -1,14 +1,336 @@
-import pythoncom
-from docx2pdf import convert
+"""
+Conversion DOCX → PDF avec un moteur interchangeable.
+
+Moteurs disponibles (variable CV_PDF_BACKEND, "auto" par défaut) :
+- "word"        : Microsoft Word via COM (docx2pdf), Windows uniquement.
+                  Word ne supporte pas les conversions simultanées : elles sont sérialisées.
+- "libreoffice" : pool de LibreOffice headless (Linux/macOS/Windows). Chaque
+                  convertisseur a son propre profil utilisateur, ce qui permet
+                  plusieurs conversions en parallèle. Si `unoserver` est installé,
+                  chaque convertisseur est un processus LibreOffice gardé chaud ;
+                  sinon soffice est relancé par conversion (profil déjà initialisé).
+Les demandes qui dépassent la taille du pool (CV_PDF_CONVERTERS) sont mises en file d'attente.
+"""
+
+import os
+import sys
+import atexit
 import time
+import queue
+import shutil
+import socket
+import logging
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+PDF_BACKEND = os.environ.get("CV_PDF_BACKEND", "auto")
+PDF_CONVERTERS = int(os.environ.get("CV_PDF_CONVERTERS", str(min(4, os.cpu_count() or 1))))
+CONVERSION_TIMEOUT = 120        # secondes par conversion
+UNOSERVER_START_TIMEOUT = 30    # secondes pour qu'un unoserver accepte les connexions
+
+
+# =============================================================================
+# MOTEUR WORD (WINDOWS)
+# =============================================================================
+
+class WordConverter:
+    """Conversion via Word (COM). Une seule conversion à la fois."""
+
+    name = "word"
+    size = 1
+
+    def __init__(self):
+        import pythoncom  # noqa: F401  (vérifie la disponibilité de COM)
+        from docx2pdf import convert  # noqa: F401
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self.conversions = 0
+
+    def convert(self, input_docx: str, output_pdf: str) -> str:
+        import pythoncom
+        from docx2pdf import convert
+
+        # Le verrou remplace l'ancienne pause fixe : la conversion suivante
+        # ne démarre qu'une fois Word refermé par la précédente.
+        self._waiting += 1
+        with self._lock:
+            self._waiting -= 1
+            pythoncom.CoInitialize()  # Ouvre COM Word (obligatoire sous Windows)
+            try:
+                convert(input_docx, output_pdf)  # Conversion DOCX → PDF
+            finally:
+                pythoncom.CoUninitialize()  # Ferme Word COM
+                self.conversions += 1
+        return output_pdf
+
+    def stats(self):
+        return {"size": 1, "busy": int(self._lock.locked()), "waiting": self._waiting,
+                "conversions": self.conversions}
+
+    def close(self):
+        pass
+
+
+# =============================================================================
+# MOTEUR LIBREOFFICE (POOL)
+# =============================================================================
+
+def _find_soffice() -> Optional[str]:
+    for candidate in ("soffice", "libreoffice"):
+        path = shutil.which(candidate)
+        if path:
+            return path
+    if sys.platform == "win32":
+        default = Path(r"C:\Program Files\LibreOffice\program\soffice.exe")
+        if default.exists():
+            return str(default)
+    return None
+
+
+def _free_port() -> int:
+    # Port libre attribué par l'OS : plusieurs processus API peuvent avoir leur pool
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+class _LibreOfficeSlot:
+    """Un convertisseur LibreOffice : profil dédié, processus unoserver optionnel."""
+
+    def __init__(self, index: int, soffice: str, use_unoserver: bool):
+        self.index = index
+        self.soffice = soffice
+        self.profile_dir = Path(tempfile.gettempdir()) / f"cv_lo_profile_{os.getpid()}_{index}"
+        self.profile_url = self.profile_dir.as_uri()
+        self.process = None
+        self.port = None
+        if use_unoserver:
+            try:
+                self._start_unoserver()
+            except (OSError, RuntimeError) as e:
+                # unoserver est optionnel : repli sur un soffice par conversion
+                logger.warning(f"Convertisseur LibreOffice #{self.index} sans unoserver: {e}")
+
+    def _start_unoserver(self):
+        self.port = _free_port()
+        unoserver_cmd = shutil.which("unoserver")
+        self.process = subprocess.Popen(
+            ([unoserver_cmd] if unoserver_cmd else [sys.executable, "-m", "unoserver.server"]) + [
+                "--interface", "127.0.0.1",
+                "--port", str(self.port),
+                "--uno-port", str(_free_port()),
+                "--executable", self.soffice,
+                "--user-installation", self.profile_url,
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        if not _wait_for_port(self.port, UNOSERVER_START_TIMEOUT):
+            self.close()
+            raise RuntimeError(f"unoserver n'a pas démarré sur le port {self.port}")
+        logger.info(f"✓ Convertisseur LibreOffice #{self.index} prêt (port {self.port})")
+
+    def convert(self, input_docx: str, output_pdf: str) -> str:
+        if self.process is not None and self.process.poll() is not None:
+            # Processus tombé : on le relance avant de convertir
+            logger.warning(f"Convertisseur LibreOffice #{self.index} arrêté, redémarrage")
+            self._start_unoserver()
+
+        if self.process is not None:
+            from unoserver.client import UnoClient
+            UnoClient(server="127.0.0.1", port=str(self.port)).convert(
+                inpath=str(input_docx), outpath=str(output_pdf), convert_to="pdf"
+            )
+            return output_pdf
+
+        # Sans unoserver : un soffice par conversion, sur le profil propre au slot
+        with tempfile.TemporaryDirectory(prefix="cv_lo_out_") as outdir:
+            subprocess.run(
+                [
+                    self.soffice, "--headless", "--norestore", "--nolockcheck",
+                    f"-env:UserInstallation={self.profile_url}",
+                    "--convert-to", "pdf", "--outdir", outdir, str(input_docx),
+                ],
+                check=True,
+                timeout=CONVERSION_TIMEOUT,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
+            produced = Path(outdir) / f"{Path(input_docx).stem}.pdf"
+            if not produced.exists():
+                raise RuntimeError(f"LibreOffice n'a pas produit de PDF pour {input_docx}")
+            shutil.move(str(produced), str(output_pdf))
+        return output_pdf
+
+    def close(self):
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
+
+
+class LibreOfficePool:
+    """Pool de convertisseurs LibreOffice ; les demandes en surplus attendent un slot libre."""
+
+    name = "libreoffice"
+
+    def __init__(self, size: int = PDF_CONVERTERS):
+        soffice = _find_soffice()
+        if soffice is None:
+            raise RuntimeError("LibreOffice (soffice) introuvable dans le PATH")
+        try:
+            import unoserver  # noqa: F401
+            use_unoserver = True
+        except ImportError:
+            use_unoserver = False
+
+        self.size = max(1, size)
+        self._slots = queue.Queue()
+        self._all_slots = []
+        self._waiting = 0
+        self.conversions = 0
+        self._count_lock = threading.Lock()
+        for i in range(self.size):
+            slot = _LibreOfficeSlot(i, soffice, use_unoserver)
+            self._all_slots.append(slot)
+            self._slots.put(slot)
+        logger.info(
+            f"Pool LibreOffice: {self.size} convertisseur(s)"
+            + (" (unoserver)" if use_unoserver else " (soffice à la demande)")
+        )
+
+    def convert(self, input_docx: str, output_pdf: str) -> str:
+        with self._count_lock:
+            self._waiting += 1
+        try:
+            slot = self._slots.get()  # file d'attente si tous les convertisseurs sont occupés
+        finally:
+            with self._count_lock:
+                self._waiting -= 1
+        try:
+            return slot.convert(input_docx, output_pdf)
+        finally:
+            self._slots.put(slot)
+            with self._count_lock:
+                self.conversions += 1
+
+    def stats(self):
+        """Occupation du pool : convertisseurs occupés et demandes en attente d'un slot."""
+        return {"size": self.size, "busy": self.size - self._slots.qsize(), "waiting": self._waiting,
+                "conversions": self.conversions}
+
+    def close(self):
+        for slot in self._all_slots:
+            slot.close()
+
+
+# =============================================================================
+# SÉLECTION DU MOTEUR
+# =============================================================================
+
+BACKENDS = {
+    "word": WordConverter,
+    "libreoffice": LibreOfficePool,
+}
+
+_converter = None
+_executor = None
+_converter_lock = threading.Lock()
+
+
+def get_converter(backend: str = None):
+    """Retourne le moteur de conversion partagé (créé au premier appel)."""
+    global _converter
+    if _converter is not None:
+        return _converter
+
+    with _converter_lock:
+        if _converter is not None:
+            return _converter
+
+        backend = backend or PDF_BACKEND
+        if backend == "auto":
+            candidates = ["word", "libreoffice"] if sys.platform == "win32" else ["libreoffice"]
+        elif backend in BACKENDS:
+            candidates = [backend]
+        else:
+            raise ValueError(f"Moteur de conversion inconnu: {backend} (attendu: auto, {', '.join(BACKENDS)})")
+
+        errors = []
+        for name in candidates:
+            try:
+                _converter = BACKENDS[name]()
+                logger.info(f"✓ Moteur DOCX → PDF: {name}")
+                return _converter
+            except Exception as e:
+                errors.append(f"{name}: {e}")
+        raise RuntimeError("Aucun moteur DOCX → PDF disponible (" + "; ".join(errors) + ")")
+
+
+def warm_up_converter(backend: str = None):
+    """Démarre les convertisseurs avant la première requête."""
+    return get_converter(backend)
+
 
 def convert_docx_to_pdf(input_docx, output_pdf):
-    pythoncom.CoInitialize() # Ouvre COM Word (obligatoire sous Windows)
+    """Convertit un DOCX en PDF avec le moteur configuré (bloquant)."""
+    return get_converter().convert(str(input_docx), str(output_pdf))
+
+
+def submit_docx_to_pdf(input_docx, output_pdf) -> Future:
+    """Version non bloquante : met la conversion en file et retourne un Future."""
+    global _executor
+    converter = get_converter()
+    with _converter_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(converter, "size", 1), thread_name_prefix="docx2pdf"
+            )
+    return _executor.submit(converter.convert, str(input_docx), str(output_pdf))
+
+
+def converter_stats():
+    """Occupation du moteur de conversion, ou None s'il n'a pas encore été démarré."""
+    converter = _converter
+    if converter is None:
+        return None
+    return {"backend": converter.name, **converter.stats()}
+
+
+def shutdown_converter():
+    """Arrête les convertisseurs (processus LibreOffice) et la file d'attente."""
+    global _converter, _executor
+    with _converter_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+        if _converter is not None:
+            _converter.close()
+            _converter = None
 
-    try:
-        convert(input_docx, output_pdf) # Conversion DOCX → PDF
-    finally:
-        pythoncom.CoUninitialize() # Ferme Word COM
-        time.sleep(0.8)   # important : laisse Word se fermer
 
-    return output_pdf
+atexit.register(shutdown_converter)
@@ -1,4 +1,8 @@
 import os
+import copy
+import threading
+from bisect import bisect_right
+from pathlib import Path
 from docx import Document
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml import OxmlElement
@@ -250,15 +254,122 @@ def format_contact(contact):
 
 
 # ---------------------------
-#   GENERATE DOCX FINAL
+#   TEMPLATE (CACHE PAR PROCESSUS)
 # ---------------------------
-def generate_sopra_docx(cv_data, output_path):
-    template_path = "templates/sopra_template.docx"
 
-    if not os.path.exists(template_path):
+TEMPLATE_PATH = Path(__file__).resolve().parent.parent / "templates" / "sopra_template.docx"
+
+_template_lock = threading.Lock()
+_template_cache = {}  # chemin -> (mtime, Document du template, index des placeholders)
+
+
+def index_placeholders(doc) -> Dict[str, list]:
+    """
+    Repère une fois pour toutes les paragraphes du template contenant un "{{...}}".
+    Retourne {"paragraphs": [indices dans doc.paragraphs],
+              "cells": [(table, ligne, cellule, paragraphe), ...]}.
+    """
+    index = {"paragraphs": [], "cells": []}
+    for i, p in enumerate(doc.paragraphs):
+        if "{{" in p.text:
+            index["paragraphs"].append(i)
+    for t, table in enumerate(doc.tables):
+        for r, row in enumerate(table.rows):
+            for c, cell in enumerate(row.cells):
+                for i, p in enumerate(cell.paragraphs):
+                    if "{{" in p.text:
+                        index["cells"].append((t, r, c, i))
+    return index
+
+
+def _clone(template):
+    """
+    Copie indépendante d'un Document.
+    deepcopy copie les éléments lxml sans mémo partagé : on repart donc du
+    DocumentPart copié (celui qui est sérialisé) plutôt que des caches du Document.
+    Le template d'origine n'est jamais lu directement, pour ne créer aucun cache.
+    """
+    return copy.deepcopy(template).part.document
+
+
+def load_template(template_path=TEMPLATE_PATH):
+    """
+    Retourne (copie du template, index des placeholders).
+    Le template est lu et indexé une seule fois par processus (relu s'il est
+    modifié sur disque) ; chaque appel reçoit une copie indépendante.
+    """
+    path = Path(template_path)
+    if not path.exists():
         raise FileNotFoundError("Template DOCX introuvable")
 
-    doc = Document(template_path)
+    mtime = path.stat().st_mtime
+    cached = _template_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        with _template_lock:
+            cached = _template_cache.get(path)
+            if cached is None or cached[0] != mtime:
+                template = Document(str(path))
+                cached = (mtime, template, index_placeholders(_clone(template)))
+                _template_cache[path] = cached
+
+    _, template, index = cached
+    # Copie de l'arbre XML déjà analysé : bien moins coûteux que relire le .docx
+    return _clone(template), index
+
+
+# ---------------------------
+#   SUBSTITUTION DES PLACEHOLDERS
+# ---------------------------
+
+PLACEHOLDER_RX = re.compile(r"\{\{[^{}]+\}\}")
+
+
+def substitute_placeholders(paragraph, mapping: Dict[str, str]) -> bool:
+    """
+    Remplace en une passe tous les placeholders connus d'un paragraphe.
+    Seuls les runs concernés sont réécrits, leur mise en forme est conservée ;
+    un placeholder coupé sur plusieurs runs est reconstitué dans le premier.
+    Retourne True si au moins un placeholder a été remplacé.
+    """
+    runs = paragraph.runs
+    texts = [r.text for r in runs]
+    full = "".join(texts)
+    matches = [m for m in PLACEHOLDER_RX.finditer(full) if m.group(0) in mapping]
+    if not matches:
+        return False
+
+    starts, pos = [], 0
+    for t in texts:
+        starts.append(pos)
+        pos += len(t)
+
+    new_texts = list(texts)
+    # De droite à gauche : les positions des placeholders précédents restent valides
+    for m in reversed(matches):
+        value = mapping[m.group(0)] or "Non renseigné"
+        first = bisect_right(starts, m.start()) - 1
+        last = bisect_right(starts, m.end() - 1) - 1
+        a, b = m.start() - starts[first], m.end() - starts[last]
+        if first == last:
+            t = new_texts[first]
+            new_texts[first] = t[:a] + value + t[b:]
+        else:
+            new_texts[first] = new_texts[first][:a] + value
+            for k in range(first + 1, last):
+                new_texts[k] = ""
+            new_texts[last] = new_texts[last][b:]
+
+    for run, old, new in zip(runs, texts, new_texts):
+        if new != old:
+            run.text = new
+    return True
+
+
+# ---------------------------
+#   GENERATE DOCX FINAL
+# ---------------------------
+def generate_sopra_docx(cv_data, output_path, template_path=TEMPLATE_PATH):
+    doc, placeholder_index = load_template(template_path)
 
     contact = cv_data.get("contact", {}) or {}
     titre_profil = cv_data.get("titre_profil") or "Profil Collaborateur"
@@ -320,23 +431,18 @@ def generate_sopra_docx(cv_data, output_path):
     }
 
     # -------------------------
-    # 3) REMPLACEMENT TEMPLATE COMPLET
+    # 3) REMPLACEMENT TEMPLATE (seulement les paragraphes indexés)
     # -------------------------
-    for p in doc.paragraphs:
-        original_text = p.text
-        for key, val in mapping.items():
-            if key in p.text:
-                p.text = p.text.replace(key, val if val else "Non renseigné")
-                p.alignment = WD_ALIGN_PARAGRAPH.LEFT
-    
-    # Parcourir aussi les tableaux si présents
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                for p in cell.paragraphs:
-                    for key, val in mapping.items():
-                        if key in p.text:
-                            p.text = p.text.replace(key, val if val else "Non renseigné")
+    paragraphs = doc.paragraphs
+    for i in placeholder_index["paragraphs"]:
+        p = paragraphs[i]
+        if substitute_placeholders(p, mapping):
+            p.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    
+    # Cellules de tableaux contenant des placeholders
+    tables = doc.tables
+    for t, r, c, i in placeholder_index["cells"]:
+        substitute_placeholders(tables[t].rows[r].cells[c].paragraphs[i], mapping)
 
 
     doc.save(output_path)
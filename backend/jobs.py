@@ -0,0 +1,171 @@
+"""
+Exécution asynchrone des traitements longs (analyse de CV, génération PDF).
+
+Une tâche est soumise à un pool de workers et reçoit immédiatement un identifiant.
+Son état (file d'attente, en cours, terminé, erreur), l'étape courante et le
+résultat sont consultables ensuite ; chaque changement d'étape est aussi publié
+comme événement, pour un suivi en direct (Server-Sent Events côté API).
+Les tâches terminées sont oubliées après JOB_TTL_SECONDS.
+"""
+
+import os
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.environ.get("CV_JOB_WORKERS", str(min(4, os.cpu_count() or 1))))
+JOB_TTL_SECONDS = int(os.environ.get("CV_JOB_TTL", "3600"))
+
+QUEUED, RUNNING, DONE, ERROR = "queued", "running", "done", "error"
+
+
+class Job:
+    """Une tâche soumise : état, étapes franchies et résultat."""
+
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.stage = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.events = []
+        self._cond = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, ERROR)
+
+    def _publish(self, event: str, **data):
+        with self._cond:
+            self.events.append({"event": event, "time": round(time.time(), 3), **data})
+            self._cond.notify_all()
+
+    def progress(self, stage: str):
+        """Callback passé au traitement pour signaler l'étape en cours."""
+        self.stage = stage
+        self._publish("stage", stage=stage)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "stage": self.stage,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration": (
+                round(self.finished_at - self.started_at, 3)
+                if self.finished_at and self.started_at else None
+            ),
+        }
+
+    def iter_events(self, start: int = 0, keepalive: float = 15.0) -> Iterator[Optional[Dict]]:
+        """
+        Événements à partir de l'indice `start`, jusqu'à la fin de la tâche.
+        Produit None toutes les `keepalive` secondes sans nouvel événement.
+        """
+        index = start
+        while True:
+            with self._cond:
+                if index >= len(self.events) and not self.finished:
+                    self._cond.wait(timeout=keepalive)
+                pending = self.events[index:]
+                finished = self.finished
+            if not pending:
+                if finished:
+                    return
+                yield None
+                continue
+            for event in pending:
+                yield event
+            index += len(pending)
+
+
+class JobManager:
+    """Pool de workers et registre des tâches du processus."""
+
+    def __init__(self, workers: int = JOB_WORKERS, ttl: int = JOB_TTL_SECONDS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cv-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self.ttl = ttl
+
+    def submit(self, kind: str, fn: Callable, *args, **kwargs) -> Job:
+        """
+        Soumet fn(*args, progress=job.progress, **kwargs) au pool.
+        La valeur retournée devient le résultat ; une exception, l'erreur de la tâche.
+        """
+        self._purge()
+        job = Job(kind)
+        with self._lock:
+            self._jobs[job.id] = job
+        job._publish("status", status=QUEUED)
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job: Job, fn: Callable, args, kwargs):
+        job.status = RUNNING
+        job.started_at = time.time()
+        job._publish("status", status=RUNNING)
+        try:
+            job.result = fn(*args, progress=job.progress, **kwargs)
+            status = DONE
+        except Exception as e:
+            logger.exception(f"Tâche {job.id} ({job.kind}) en erreur")
+            job.error = str(e)
+            status = ERROR
+        # État final et dernier événement publiés ensemble : un lecteur d'événements
+        # ne peut pas voir la tâche terminée sans recevoir ce dernier événement
+        with job._cond:
+            job.finished_at = time.time()
+            job.status = status
+            job._publish("status", status=status, error=job.error)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def _purge(self):
+        limit = time.time() - self.ttl
+        with self._lock:
+            expired = []
+            for job_id, job in self._jobs.items():
+                # Statut et date de fin sont écrits ensemble sous job._cond
+                with job._cond:
+                    if job.finished and job.finished_at < limit:
+                        expired.append(job_id)
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def stats(self) -> Dict[str, int]:
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, ERROR: 0}
+        for job in list(self._jobs.values()):
+            counts[job.status] += 1
+        return counts
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Gestionnaire de tâches partagé du processus."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = JobManager()
+    return _manager
@@ -0,0 +1,170 @@
+"""
+Métriques d'exploitation de l'API au format texte Prometheus (GET /metrics).
+
+Exposé, pour le processus courant :
+- nombre de requêtes et histogramme de latence par route,
+- durées des étapes du pipeline (extractors.tracing),
+- temps de chargement des modèles spaCy,
+- succès / échecs du cache de résultats,
+- tâches asynchrones par état, analyses en attente du pool de processus,
+- occupation des convertisseurs DOCX → PDF.
+Aucun service externe n'est nécessaire : la page est lue directement par le
+collecteur (Prometheus, agent, ou simple curl).
+"""
+
+import time
+import threading
+from typing import Dict, List, Tuple
+
+from flask import g, request
+
+from extractors.tracing import Histogram, stage_stats
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latences HTTP : bornes plus larges que celles des étapes (génération PDF incluse)
+REQUEST_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class RequestMetrics:
+    """Compteurs et latences par route (modèle d'URL, pas chemin réel : cardinalité bornée)."""
+
+    def __init__(self):
+        self.counts: Dict[Tuple[str, str, int], int] = {}
+        self.latencies: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, route: str, method: str, status: int, seconds: float):
+        with self._lock:
+            key = (route, method, status)
+            self.counts[key] = self.counts.get(key, 0) + 1
+            hist = self.latencies.get(route)
+            if hist is None:
+                hist = self.latencies[route] = Histogram(REQUEST_BUCKETS)
+        hist.observe(seconds)
+
+    def install(self, app):
+        """Mesure chaque requête de l'application Flask (hors /metrics)."""
+
+        @app.before_request
+        def _start_timer():
+            g._metrics_start = time.perf_counter()
+
+        @app.after_request
+        def _record(response):
+            start = g.pop("_metrics_start", None)
+            rule = request.url_rule.rule if request.url_rule else "<unmatched>"
+            if start is not None and rule != "/metrics":
+                # Réponses en flux (NDJSON, SSE) : latence jusqu'à l'envoi des en-têtes
+                self.observe(rule, request.method, response.status_code, time.perf_counter() - start)
+            return response
+
+
+REQUEST_METRICS = RequestMetrics()
+
+
+# =============================================================================
+# FORMAT D'EXPOSITION
+# =============================================================================
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _num(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Writer:
+    def __init__(self):
+        self.lines: List[str] = []
+        self._declared = set()
+
+    def declare(self, name: str, kind: str, help_text: str):
+        if name not in self._declared:
+            self._declared.add(name)
+            self.lines.append(f"# HELP {name} {help_text}")
+            self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, value, **labels):
+        self.lines.append(f"{name}{_labels(**labels)} {_num(value)}")
+
+    def metric(self, name: str, kind: str, help_text: str, value, **labels):
+        self.declare(name, kind, help_text)
+        self.sample(name, value, **labels)
+
+    def histogram(self, name: str, help_text: str, snapshot: Dict, **labels):
+        self.declare(name, "histogram", help_text)
+        for bound, count in snapshot["buckets"]:
+            self.sample(f"{name}_bucket", count, **labels, le=_num(bound))
+        self.sample(f"{name}_sum", snapshot["sum"], **labels)
+        self.sample(f"{name}_count", snapshot["count"], **labels)
+
+
+def render_metrics(model_stats=None, cache=None, jobs=None, worker_pool=None, converter=None) -> str:
+    """
+    Page /metrics. Chaque argument est l'état d'un composant (None : absent) :
+    model_stats (model_registry.model_stats()), cache (ResultCache.stats()),
+    jobs (JobManager.stats()), worker_pool (WorkerPool.stats()),
+    converter (docx_to_pdf.converter_stats()).
+    """
+    w = _Writer()
+
+    with REQUEST_METRICS._lock:
+        counts = dict(REQUEST_METRICS.counts)
+        latencies = dict(REQUEST_METRICS.latencies)
+    w.declare("cv_http_requests_total", "counter", "Requêtes HTTP traitées")
+    for (route, method, status), n in sorted(counts.items()):
+        w.sample("cv_http_requests_total", n, route=route, method=method, status=status)
+    for route, hist in sorted(latencies.items()):
+        w.histogram("cv_http_request_duration_seconds", "Latence des requêtes HTTP",
+                    hist.snapshot(), route=route)
+
+    # Une famille de métriques = un bloc contigu de lignes
+    stages = sorted(stage_stats().items())
+    for name, snap in stages:
+        w.histogram("cv_stage_duration_seconds", "Durée des étapes du pipeline (temps réel)",
+                    snap, stage=name)
+    for name, snap in stages:
+        w.metric("cv_stage_cpu_seconds_total", "counter", "Temps CPU cumulé par étape",
+                 snap["cpu_sum"], stage=name)
+
+    for name, stats in sorted((model_stats or {}).items()):
+        w.metric("cv_model_load_seconds", "gauge", "Durée de chargement du modèle spaCy",
+                 stats.get("load_seconds", 0.0), model=name, source=stats.get("source"),
+                 load_mode=stats.get("load_mode"))
+
+    if cache is not None:
+        lookups = cache["hits"] + cache["misses"]
+        w.metric("cv_cache_hits_total", "counter", "Analyses servies depuis le cache", cache["hits"])
+        w.metric("cv_cache_misses_total", "counter", "Analyses absentes du cache", cache["misses"])
+        w.metric("cv_cache_hit_ratio", "gauge", "Part des analyses servies depuis le cache",
+                 round(cache["hits"] / lookups, 4) if lookups else 0.0)
+        w.metric("cv_cache_size_bytes", "gauge", "Taille du cache sur disque", cache["size_bytes"])
+
+    for status, n in sorted((jobs or {}).items()):
+        w.metric("cv_jobs", "gauge", "Tâches asynchrones par état", n, status=status)
+
+    if worker_pool is not None:
+        w.metric("cv_worker_processes", "gauge", "Processus du pool d'analyse", worker_pool["processes"])
+        w.metric("cv_worker_pending", "gauge", "Analyses soumises au pool non terminées",
+                 worker_pool["pending"])
+
+    if converter is not None:
+        labels = {"backend": converter["backend"]}
+        w.metric("cv_pdf_converters", "gauge", "Convertisseurs DOCX → PDF", converter["size"], **labels)
+        w.metric("cv_pdf_converters_busy", "gauge", "Convertisseurs occupés", converter["busy"], **labels)
+        w.metric("cv_pdf_conversions_waiting", "gauge", "Conversions en attente d'un convertisseur",
+                 converter["waiting"], **labels)
+        w.metric("cv_pdf_conversions_total", "counter", "Conversions DOCX → PDF terminées",
+                 converter["conversions"], **labels)
+
+    return "\n".join(w.lines) + "\n"
@@ -0,0 +1,191 @@
+"""
+Cache disque des résultats d'analyse de CV, adressé par contenu.
+
+La clé combine :
+- le SHA-256 des octets du fichier envoyé,
+- la version des modèles (contenu des models/*/meta.json),
+- la version du code (empreinte des sources de l'extraction, de l'API et de la
+  génération du PDF).
+Un nouveau modèle ou une modification du code invalide donc le cache sans
+intervention. La taille totale est bornée : les entrées les moins récemment
+utilisées sont supprimées en premier (LRU, d'après la date de modification,
+rafraîchie à chaque lecture).
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent
+
+CACHE_DIR = Path(os.environ.get("CV_CACHE_DIR", BASE_DIR / "data" / "cache"))
+CACHE_MAX_MB = float(os.environ.get("CV_CACHE_MAX_MB", "512"))
+CACHE_ENABLED = os.environ.get("CV_CACHE_ENABLED", "1") == "1"
+
+MODELS_DIR = BASE_DIR / "models"
+# Sources dont dépendent le JSON (assemblé par api.py) et le PDF (generators/)
+# produits par /api/cv/analyze
+PIPELINE_SOURCES = [
+    BASE_DIR / "api.py",
+    *sorted((BASE_DIR / "extractors").glob("*.py")),
+    *sorted((BASE_DIR / "generators").glob("*.py")),
+]
+
+
+def _hash_files(paths) -> str:
+    h = hashlib.sha256()
+    for path in paths:
+        try:
+            h.update(path.name.encode("utf-8"))
+            h.update(path.read_bytes())
+        except OSError:
+            continue
+    return h.hexdigest()[:16]
+
+
+def model_version() -> str:
+    """Empreinte des métadonnées des modèles entraînés (models/*/meta.json)."""
+    return _hash_files(sorted(MODELS_DIR.glob("*/meta.json")))
+
+
+def pipeline_version() -> str:
+    """Empreinte du code qui produit le résultat et le PDF mis en cache."""
+    return _hash_files(PIPELINE_SOURCES)
+
+
+class ResultCache:
+    """Cache LRU sur disque : <dir>/<clé[:2]>/<clé>.json (+ <clé>.pdf optionnel)."""
+
+    def __init__(self, directory=CACHE_DIR, max_mb: float = CACHE_MAX_MB):
+        self.directory = Path(directory)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._version = f"{model_version()}:{pipeline_version()}"
+        self.hits = 0
+        self.misses = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._size = sum(f.stat().st_size for f in self._files())
+
+    def _files(self):
+        return (f for f in self.directory.glob("*/*") if f.suffix in (".json", ".pdf"))
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.directory / key[:2] / f"{key}{suffix}"
+
+    def key_for(self, data: bytes) -> str:
+        """Clé de cache d'un fichier : contenu + version modèles + version code."""
+        content = hashlib.sha256(data).hexdigest()
+        return hashlib.sha256(f"{content}:{self._version}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key, ".json")
+        try:
+            result = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        self._touch(path)
+        self._touch(self._path(key, ".pdf"))
+        return result
+
+    def record(self, hit: bool):
+        """Comptabilise une analyse servie depuis le cache (hit) ou recalculée."""
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def get_pdf(self, key: str) -> Optional[Path]:
+        path = self._path(key, ".pdf")
+        return path if path.exists() else None
+
+    def put(self, key: str, result: Dict[str, Any], pdf_path=None):
+        """Enregistre un résultat (et une copie du PDF généré), puis applique la limite de taille."""
+        path = self._path(key, ".json")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        added = self._write_atomic(path, data)
+        if pdf_path and Path(pdf_path).exists():
+            added += self._write_atomic(self._path(key, ".pdf"), Path(pdf_path).read_bytes())
+        with self._lock:
+            self._size += added
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _write_atomic(self, path: Path, data: bytes) -> int:
+        previous = path.stat().st_size if path.exists() else 0
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return len(data) - previous
+
+    @staticmethod
+    def _touch(path: Path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Supprime les entrées les plus anciennes jusqu'à 90 % de la taille maximale."""
+        target = int(self.max_bytes * 0.9)
+        entries = []
+        for f in self._files():
+            try:
+                st = f.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, f))
+        self._size = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, f in sorted(entries, key=lambda e: e[0]):
+            if self._size <= target:
+                break
+            try:
+                f.unlink()
+            except OSError:
+                continue
+            self._size -= size
+            removed += 1
+        logger.info(f"Cache résultats: {removed} fichier(s) supprimé(s), {self._size / 1e6:.1f} Mo")
+
+    def clear(self):
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "directory": str(self.directory),
+            "size_mb": round(self._size / (1024 * 1024), 2),
+            "max_mb": round(self.max_bytes / (1024 * 1024), 2),
+            "size_bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "version": self._version,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Cache partagé du processus (None si désactivé via CV_CACHE_ENABLED=0)."""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResultCache()
+    return _cache
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Non-régression de la recherche de la date la plus proche (DateIndex).
+
+find_closest_date_by_char() doit rendre la même date que l'ancienne double
+boucle organisations x dates, recopiée ci-dessous comme référence, y compris
+quand deux dates sont à égale distance.
+"""
+
+import random
+import re
+
+import pytest
+
+from benchmarks.corpus import LAYOUTS, LENGTHS, generate_cv
+from extractors.cv_context import AnalysisContext
+
+# section_classifier importe spaCy
+section_classifier = pytest.importorskip("extractors.section_classifier")
+DateIndex = section_classifier.DateIndex
+extract_date_spans = section_classifier.extract_date_spans
+find_closest_date_by_char = section_classifier.find_closest_date_by_char
+
+
+# Référence : parcours de toutes les dates pour chaque occurrence
+def ref_find_closest_date_by_char(org, text, date_spans):
+    org_positions = [(m.start(), m.end()) for m in re.finditer(re.escape(org), text, flags=re.IGNORECASE)]
+    if not org_positions:
+        return None
+    best, best_dist = None, 1200
+    for (o_start, o_end) in org_positions:
+        for raw, d_start, d_end, parsed in date_spans:
+            dist = abs(((o_start + o_end) / 2) - ((d_start + d_end) / 2))
+            if dist < best_dist:
+                best_dist, best = dist, (parsed or raw)
+    return best if best_dist < 1200 else None
+
+
+CV_EXEMPLE = """Jean Dupont
+EXPÉRIENCE
+Capgemini 2020 Sopra Steria 2021
+Mars 2019 - Présent : Développeur Python chez Orange
+2017 Stage chez Thales 2018
+FORMATION
+2015-2018 Licence Informatique - Université de Lille
+"""
+
+
+def _exemples():
+    rng = random.Random(3)
+    return [CV_EXEMPLE] + [
+        generate_cv(rng, rng.choice(list(LENGTHS)), rng.choice(list(LAYOUTS))) for _ in range(10)
+    ]
+
+
+EXEMPLES = _exemples()
+
+
+def _organisations(texte):
+    # Mots en majuscule et noms d'entreprise : beaucoup d'occurrences, à toutes les distances
+    mots = re.findall(r"\b[A-ZÀ-Ü][\wÀ-ÿ]+(?: [A-ZÀ-Ü][\wÀ-ÿ]+)?", texte)
+    return list(dict.fromkeys(mots + ["Capgemini", "Sopra Steria", "Inconnue"]))
+
+
+@pytest.mark.parametrize("texte", EXEMPLES)
+def test_find_closest_date_identique_a_la_reference(texte):
+    spans = extract_date_spans(texte)
+    ctx = AnalysisContext(texte)
+    for org in _organisations(texte):
+        attendu = ref_find_closest_date_by_char(org, texte, spans)
+        assert find_closest_date_by_char(org, texte, spans) == attendu
+        assert find_closest_date_by_char(org, ctx, ctx.date_index) == attendu
+
+
+def test_egalite_premiere_date_rencontree():
+    # Deux dates à égale distance de l'organisation : la première de la liste gagne
+    texte = "2019 ACME 2020"
+    spans = [("2020", 10, 14, "2020"), ("2019", 0, 4, "2019")]
+    assert find_closest_date_by_char("ACME", texte, spans) == "2020"
+    assert find_closest_date_by_char("ACME", texte, list(reversed(spans))) == "2019"
+
+
+def test_nearest_par_bisect_identique_au_parcours():
+    rng = random.Random(1)
+    spans = []
+    for i in range(200):
+        start = rng.randrange(0, 5000, 3)  # positions répétées : centres égaux
+        spans.append((f"d{i}", start, start + rng.choice((4, 7, 14)), None))
+    index = DateIndex(spans)
+    for pos in [rng.uniform(-100, 5100) for _ in range(500)] + [0, 2, 2.5, 5000]:
+        dist, rang, valeur = min(
+            (abs(pos - (s + e) / 2), i, raw) for i, (raw, s, e, _) in enumerate(spans)
+        )
+        assert index.nearest(pos) == (dist, rang, valeur)
+
+
+def test_index_vide():
+    assert DateIndex([]).nearest(10) is None
+    assert find_closest_date_by_char("ACME", "ACME", []) is None
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Non-régression de la normalisation des dates (date_normalizer).
+
+L'ancienne normalisation appelait dateparser.parse(raw, languages=['fr']) sur
+chaque date : le résultat est le même pour une date complète, et pour une date
+partielle normaliser_date() en garde seulement la partie présente dans le texte
+(dateparser complétait le jour et le mois avec ceux du jour).
+"""
+
+import random
+import re
+
+import pytest
+
+from benchmarks.corpus import LAYOUTS, LENGTHS, generate_cv
+from extractors.date_normalizer import normaliser_date
+
+# Formats de dates de extract_date_spans (section_classifier.DATE_REGEXES), hors plages
+DATE_REGEXES = [
+    r'\b\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4}\b',
+    r'\b\d{1,2}[\/\-]\d{4}\b',
+    r'\b(?:19|20)\d{2}\b',
+    r'\b(?:Janvier|Février|Fevrier|Mars|Avril|Mai|Juin|Juillet|Août|Aout|Septembre|Octobre|Novembre|Décembre)\s+\d{4}\b',
+]
+DATE_RX = [re.compile(p, re.IGNORECASE) for p in DATE_REGEXES]
+MM_AAAA_RX = re.compile(DATE_REGEXES[1])
+
+CV_EXEMPLE = """Jean Dupont
+Né le 15/09/1995 à Lille
+EXPÉRIENCE
+Septembre 2020 - Présent : Développeur Python
+03/2018 - 08/2019 : Stage chez Capgemini
+FORMATION
+2015-2018 Licence Informatique
+Diplômé le 1-7-2018, mention bien
+"""
+
+
+def _dates_brutes():
+    rng = random.Random(11)
+    textes = [CV_EXEMPLE] + [
+        generate_cv(rng, rng.choice(list(LENGTHS)), rng.choice(list(LAYOUTS))) for _ in range(10)
+    ]
+    brutes = [m.group(0) for texte in textes for rx in DATE_RX for m in rx.finditer(texte)]
+    return list(dict.fromkeys(brutes))
+
+
+DATES_BRUTES = _dates_brutes()
+
+
+@pytest.mark.parametrize("raw, attendu", [
+    ("15/09/2020", "2020-09-15"),
+    ("1-7-2018", "2018-07-01"),
+    ("15.09.20", "2020-09-15"),
+    ("31/02/2020", None),
+    ("09/2020", "2020-09"),
+    ("13/2020", None),
+    ("Septembre 2020", "2020-09"),
+    ("sept. 2020", "2020-09"),
+    ("Août 2019", "2019-08"),
+    ("2020", "2020"),
+    (" 2020 ", "2020"),
+])
+def test_formats_deterministes(raw, attendu):
+    assert normaliser_date(raw) == attendu
+
+
+@pytest.mark.parametrize("raw", DATES_BRUTES)
+def test_precision_du_texte_conservee(raw):
+    iso = normaliser_date(raw)
+    assert iso is not None
+    # Autant de parties que le texte en donne : année, année-mois ou date complète
+    assert len(iso.split("-")) == len(re.findall(r"\d+|[^\W\d_]+", raw))
+
+
+@pytest.mark.parametrize("raw", DATES_BRUTES)
+def test_identique_a_dateparser_a_la_precision_du_texte(raw):
+    dateparser = pytest.importorskip("dateparser")
+    ancien = dateparser.parse(raw, languages=['fr'])
+    assert ancien is not None
+    iso = normaliser_date(raw)
+    if MM_AAAA_RX.fullmatch(raw):
+        # dateparser lisait "09/2020" comme le 9 du mois en cours : seule l'année était juste
+        assert ancien.year == int(iso[:4])
+    else:
+        # L'ancien résultat, tronqué à la précision du texte
+        assert ancien.date().isoformat().startswith(iso)
+
+
+def test_sans_repli_dateparser(monkeypatch):
+    import extractors.date_normalizer as date_normalizer
+
+    # Le repli dateparser n'est jamais atteint pour les formats du pipeline
+    monkeypatch.setattr(date_normalizer, "_normaliser_dateparser", lambda raw: pytest.fail(raw))
+    for raw in DATES_BRUTES:
+        date_normalizer.normaliser_date(raw)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Non-régression du repérage des dates en une passe (date_scanner).
+
+extraire_dates(), extract_dates_heuristic() et extract_date_spans() doivent
+rendre exactement ce que rendaient leurs versions d'origine, qui relançaient
+chaque motif sur tout le texte. Ces versions sont recopiées ci-dessous comme
+référence et comparées sur des CV d'exemple et sur les cas limites connus.
+"""
+
+import random
+import re
+
+import pytest
+
+from benchmarks.corpus import LAYOUTS, LENGTHS, generate_cv
+from extractors.cv_context import AnalysisContext
+from extractors.date_scanner import scan_dates
+from extractors.extracteur import dedupliquer, extraire_dates
+from extractors.heuristic_rules import extract_dates_heuristic, extract_structured_cv_data
+
+# =============================================================================
+# RÉFÉRENCE : implémentations d'origine (un finditer par motif)
+# =============================================================================
+
+MOIS = r"(?:Janvier|Février|Fevrier|Mars|Avril|Mai|Juin|Juillet|Août|Aout|Septembre|Octobre|Novembre|Décembre|Decembre)"
+REF_PLAGE_ANNEES = re.compile(r'((?:19|20)\d{2})\s*[-–—]\s*((?:19|20)\d{2}|[Pp]résent|[Aa]ctuel(?:lement)?|[Aa]ujourd)')
+REF_PLAGE_MOIS = re.compile(
+    rf"({MOIS})\s*(\d{{4}})\s*[-–—]\s*(?:({MOIS})\s*(\d{{4}})|([Pp]résent|[Aa]ctuel(?:lement)?))", re.IGNORECASE
+)
+REF_MOIS_ANNEE = re.compile(rf"\b({MOIS})\s+((?:19|20)\d{{2}})\b", re.IGNORECASE)
+REF_JJ_MM_AAAA = re.compile(r'\b(0?[1-9]|[12][0-9]|3[01])[-/](0?[1-9]|1[012])[-/]((?:19|20)\d{2})\b')
+REF_MM_AAAA = re.compile(r'\b(0?[1-9]|1[012])[-/]((?:19|20)\d{2})\b')
+REF_ANNEE_SEULE = re.compile(r'(?<!\d)(?<!/)(?<![/-])((?:19|20)\d{2})(?!\d)(?!/|-)')
+REF_CODE_POSTAL = re.compile(r'\d{5}')
+
+
+def ref_extraire_dates(texte):
+    dates = []
+    for m in REF_PLAGE_ANNEES.finditer(texte):
+        debut, fin = m.group(1), m.group(2)
+        if fin.lower() in ('présent', 'present', 'actuel', 'actuellement', 'aujourd'):
+            dates.append(f"{debut} - Présent")
+        else:
+            dates.append(f"{debut}-{fin}")
+    for m in REF_PLAGE_MOIS.finditer(texte):
+        mois_deb, annee_deb = m.group(1), m.group(2)
+        if m.group(5):
+            dates.append(f"{mois_deb} {annee_deb} - Présent")
+        elif m.group(3) and m.group(4):
+            dates.append(f"{mois_deb} {annee_deb} - {m.group(3)} {m.group(4)}")
+    for m in REF_MOIS_ANNEE.finditer(texte):
+        date_str = f"{m.group(1)} {m.group(2)}"
+        if date_str not in dates and not any(date_str in d for d in dates):
+            dates.append(date_str)
+    for m in REF_JJ_MM_AAAA.finditer(texte):
+        start_pos = m.start()
+        if not REF_CODE_POSTAL.search(texte[max(0, start_pos - 10):start_pos + 15]):
+            dates.append(f"{m.group(1).zfill(2)}/{m.group(2).zfill(2)}/{m.group(3)}")
+    for m in REF_MM_AAAA.finditer(texte):
+        start_pos = m.start()
+        if not REF_CODE_POSTAL.search(texte[max(0, start_pos - 15):start_pos + 20]):
+            date_str = f"{m.group(1).zfill(2)}/{m.group(2)}"
+            if date_str not in dates:
+                dates.append(date_str)
+    for m in REF_ANNEE_SEULE.finditer(texte):
+        annee = m.group(1)
+        start_pos = m.start()
+        if not REF_CODE_POSTAL.search(texte[max(0, start_pos - 20):start_pos + 25]) and annee not in dates:
+            if not any(annee in d for d in dates):
+                dates.append(annee)
+    return dedupliquer(dates)
+
+
+REF_HEURISTIC = {
+    "range_year": re.compile(r"(?P<start>(?:19|20)\d{2})\s*[-–—]\s*(?P<end>(?:19|20)\d{2}|[Pp]résent|[Aa]ctuel(?:lement)?|[Aa]ujourd'?hui)", re.IGNORECASE),
+    "semester": re.compile(r"[Ss](?P<sem>\d)\s+(?P<year>(?:19|20)\d{2})", re.IGNORECASE),
+    "semester_range": re.compile(r"[Ss](?P<sem>\d)\s+(?P<start>(?:19|20)\d{2})\s*[-–—]\s*(?P<end>(?:19|20)\d{2})", re.IGNORECASE),
+    "since": re.compile(r"[Dd]epuis\s+(?:(?P<month>\w+)\s+)?(?P<year>(?:19|20)\d{2})", re.IGNORECASE),
+}
+
+
+def ref_extract_dates_heuristic(text):
+    results = []
+    for match in REF_HEURISTIC["range_year"].finditer(text):
+        results.append({"raw": match.group(0), "start_pos": match.start(), "end_pos": match.end(),
+                        "start_date": match.group("start"), "end_date": match.group("end"), "type": "range"})
+    for match in REF_HEURISTIC["semester"].finditer(text):
+        results.append({"raw": match.group(0), "start_pos": match.start(), "end_pos": match.end(),
+                        "semester": int(match.group("sem")), "year": match.group("year"), "type": "semester"})
+    for match in REF_HEURISTIC["semester_range"].finditer(text):
+        results.append({"raw": match.group(0), "start_pos": match.start(), "end_pos": match.end(),
+                        "semester": int(match.group("sem")), "start_date": match.group("start"),
+                        "end_date": match.group("end"), "type": "semester_range"})
+    for match in REF_HEURISTIC["since"].finditer(text):
+        results.append({"raw": match.group(0), "start_pos": match.start(), "end_pos": match.end(),
+                        "start_date": match.group("year"), "end_date": "Présent", "type": "since"})
+    seen_positions = set()
+    unique_results = []
+    for r in sorted(results, key=lambda x: -len(x["raw"])):
+        if r["start_pos"] not in seen_positions:
+            unique_results.append(r)
+            seen_positions.add(r["start_pos"])
+    return sorted(unique_results, key=lambda x: x["start_pos"])
+
+
+REF_SPANS = [re.compile(p, re.IGNORECASE) for p in [
+    r'\b\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4}\b',
+    r'\b\d{1,2}[\/\-]\d{4}\b',
+    r'\b(?:19|20)\d{2}\b',
+    r'\b(?:Janvier|Février|Fevrier|Mars|Avril|Mai|Juin|Juillet|Août|Aout|Septembre|Octobre|Novembre|Décembre)\s+\d{4}\b',
+    r'\b(?:\d{4})\s*[-–—]\s*(?:\d{4}|[Pp]résent|[Aa]ctuel(?:lement)?|[Aa]ujourd\'?hui)\b',
+]]
+REF_RANGE = re.compile(r"^(?:19|20)\d{2}\s*[-–—]\s*(?:(?:19|20)\d{2}|présent|actuel(?:lement)?|aujourd'?hui)$", re.IGNORECASE)
+REF_CODE_POSTAL_MOT = re.compile(r"\b\d{5}\b")
+REF_ANNEE = re.compile(r"(?:19|20)\d{2}")
+
+
+def ref_extract_date_spans(text, normaliser_date):
+    spans = []
+    for rx in REF_SPANS:
+        for m in rx.finditer(text):
+            raw = m.group(0).strip()
+            start, end = m.start(), m.end()
+            if REF_RANGE.match(raw):
+                spans.append((raw, start, end, raw))
+                continue
+            window = text[max(0, start - 8):min(len(text), end + 8)]
+            if REF_CODE_POSTAL_MOT.search(window) and REF_ANNEE.fullmatch(raw):
+                continue
+            parsed = normaliser_date(raw)
+            spans.append((raw, start, end, parsed or raw))
+    spans_sorted = sorted(spans, key=lambda x: x[1])
+    unique, seen = [], set()
+    for s in spans_sorted:
+        if s[1] not in seen:
+            unique.append(s)
+            seen.add(s[1])
+    return unique
+
+
+# =============================================================================
+# CV D'EXEMPLE
+# =============================================================================
+
+CAS_LIMITES = [
+    "Janvier 2019 - 2021 Licence Informatique",
+    "Août 2019-2020 Stage chez Capgemini",
+    "Né le 01/02/2021, diplômé en 03/2019",
+    "Mars 2020 - Présent Développeur Python",
+    "Janvier 2019 - Décembre 2020 Consultant",
+    "depuis 2019 - 2021 chez Orange",
+    "depuis Mars 2018 Ingénieur",
+    "S1 2021 - 2022 EPITA\nS2 2023 Paris",
+    "2015-2018 Licence\n2010 - actuellement Sopra Steria",
+    "2018-2019-2020\n2020 - PRÉSENT",
+    "12 rue Pierre Bourdan 75012 Paris 2019",
+    "CP 13008 Marseille 2017\nTél. 0612345678 2020",
+    "1999 2000 2001\n31/12/99\n12/2020 - 03/2021",
+]
+
+CV_EXEMPLE = """Jean Dupont
+12 rue Pierre Bourdan 75012 Paris
+jean.dupont@mail.com 06 12 34 56 78
+
+EXPÉRIENCE PROFESSIONNELLE
+Mars 2020 - Présent : Développeur Python - Sopra Steria
+Janvier 2019 - 2020 : Stage développeur web chez Capgemini
+S2 2018 : Projet de fin d'études
+
+FORMATION
+2015-2018 Licence Informatique - Université de Lille
+Août 2019-2020 Master 1 MIAGE
+
+LOISIRS
+Tennis, lecture, musique
+"""
+
+
+def _exemples():
+    rng = random.Random(7)
+    textes = [generate_cv(rng, rng.choice(list(LENGTHS)), rng.choice(list(LAYOUTS))) for _ in range(12)]
+    return CAS_LIMITES + [CV_EXEMPLE] + textes
+
+
+EXEMPLES = _exemples()
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+@pytest.mark.parametrize("texte", EXEMPLES)
+def test_extraire_dates_identique_a_la_reference(texte):
+    assert extraire_dates(texte) == ref_extraire_dates(texte)
+    assert extraire_dates(AnalysisContext(texte)) == ref_extraire_dates(texte)
+
+
+@pytest.mark.parametrize("texte", EXEMPLES)
+def test_extract_dates_heuristic_identique_a_la_reference(texte):
+    assert extract_dates_heuristic(texte) == ref_extract_dates_heuristic(texte)
+    assert extract_dates_heuristic(AnalysisContext(texte)) == ref_extract_dates_heuristic(texte)
+
+
+@pytest.mark.parametrize("texte", EXEMPLES)
+def test_extract_date_spans_identique_a_la_reference(texte):
+    # section_classifier importe spaCy
+    section_classifier = pytest.importorskip("extractors.section_classifier")
+    from extractors.date_normalizer import normaliser_date
+
+    attendu = ref_extract_date_spans(texte, normaliser_date)
+    assert section_classifier.extract_date_spans(texte) == attendu
+    assert section_classifier.extract_date_spans(AnalysisContext(texte)) == attendu
+
+
+@pytest.mark.parametrize("texte, attendu", [
+    ("Janvier 2019 - 2021", ["2019-2021", "Janvier 2019"]),
+    ("Août 2019-2020", ["2019-2020", "Août 2019"]),
+    ("01/02/2021", ["01/02/2021", "02/2021"]),
+    ("Mars 2020 - Présent", ["2020 - Présent", "Mars 2020 - Présent"]),
+    ("75012 Paris 2019", []),
+    # Déjà couverts par une date retenue : mois et années des plages, années des JJ/MM/AAAA
+    ("Mars 2020 - Juin 2021, Juin 2021, mars 2020, 2021", ["Mars 2020 - Juin 2021", "mars 2020"]),
+    ("12/05/2018 puis 2018 et 2019", ["12/05/2018", "05/2018", "2019"]),
+])
+def test_extraire_dates_cas_limites(texte, attendu):
+    assert extraire_dates(texte) == attendu
+
+
+def test_plage_apres_depuis():
+    dates = extract_dates_heuristic("depuis 2019 - 2021")
+    assert [(d["type"], d["raw"]) for d in dates] == [("since", "depuis 2019"), ("range", "2019 - 2021")]
+
+
+def test_scan_partage_par_le_contexte():
+    ctx = AnalysisContext(CV_EXEMPLE)
+    extraire_dates(ctx)
+    scan = ctx.date_scan
+    data = extract_structured_cv_data(ctx)
+    assert ctx.date_scan is scan
+    assert data["dates"] == ref_extract_dates_heuristic(CV_EXEMPLE)
+
+
+def test_codes_postaux():
+    scan = scan_dates("CP 13008 Marseille, tél. 0612345678")
+    assert scan.has_postal_code(0, 12)
+    assert scan.has_digits5(20, 40)
+    # Une fenêtre qui coupe un numéro de téléphone y voit un "code postal"
+    assert scan.has_postal_code(29, 34)
+    assert not scan.has_postal_code(20, 40)
+    assert not scan.has_digits5(0, 6)
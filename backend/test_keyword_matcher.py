@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Non-régression de la recherche de mots-clés en une passe (keyword_matcher).
+
+KeywordMatcher doit trouver exactement les mots-clés que trouvait l'ancienne
+boucle re.search(rf"\\b{re.escape(m)}\\b", texte), recopiée ci-dessous comme
+référence, et aux mêmes positions.
+"""
+
+import random
+import re
+
+import pytest
+
+from benchmarks.corpus import LAYOUTS, LENGTHS, generate_cv
+from extractors.keyword_matcher import KeywordMatcher
+
+# Copies des dictionnaires du pipeline (section_classifier, enhanced_extractor)
+COMPETENCE_KEYWORDS = [
+    "python", "java", "javascript", "typescript", "react", "angular", "vue",
+    "docker", "kubernetes", "sql", "mysql", "postgresql", "mongodb",
+    "aws", "azure", "gcp", "git", "github", "gitlab", "html", "css",
+    "flask", "django", "fastapi", "spring", "linux", "node", "nodejs",
+    "api", "rest", "graphql", "ci/cd", "devops", "agile", "scrum",
+    "cloud", "communication", "gestion de projet", "leadership", "autonomie",
+    "travail en équipe", "résolution de problèmes", "analyse", "c++", "c#",
+    ".net", "php", "ruby", "go", "rust", "swift", "kotlin", "scala"
+]
+LANGUES_KEYWORDS = [
+    "français", "francais", "anglais", "espagnol", "allemand", "italien",
+    "portugais", "chinois", "mandarin", "japonais", "arabe", "russe",
+    "néerlandais", "polonais", "coréen", "hindi"
+]
+TECHNICAL_SKILLS = [
+    "python", "java", "javascript", "typescript", "c++", "c#", "go", "rust",
+    "php", "ruby", "swift", "kotlin", "scala", "r", "matlab", "sql",
+    "react", "angular", "vue", "vue.js", "node.js", "django", "flask", "spring",
+    "express", ".net", "laravel", "rails", "fastapi",
+    "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "ansible",
+    "jenkins", "gitlab ci", "github actions", "circleci",
+    "postgresql", "mysql", "mongodb", "redis", "elasticsearch", "cassandra",
+    "git", "jira", "confluence", "notion", "figma", "slack"
+]
+# Mots-clés imbriqués : préfixes les uns des autres, ponctuation en bordure
+IMBRIQUES = ["gestion", "gestion de projet", "gestion de projet agile", "c", "c++", "c#",
+             "node", "node.js", "nodejs", "vue", "vue.js", ".net", "net", "a", "a b"]
+
+DICTIONNAIRES = [COMPETENCE_KEYWORDS, LANGUES_KEYWORDS, sorted(TECHNICAL_SKILLS), IMBRIQUES]
+
+CAS_LIMITES = [
+    "Python, Java et C++ ; C# / .NET ; Node.js, NodeJS et node",
+    "Gestion de projet agile, gestion de projet, gestion",
+    "CI/CD avec GitLab CI et GitHub Actions, vue.js et Vue",
+    "Langues : Français (natif), anglais courant, Néerlandais notions",
+    "golang, going, go ; R et Rust ; a b c",
+    "python_3 python3 python-3 (python)",
+]
+
+
+def _exemples():
+    rng = random.Random(5)
+    textes = [generate_cv(rng, rng.choice(list(LENGTHS)), rng.choice(list(LAYOUTS))) for _ in range(10)]
+    return [t.lower() for t in CAS_LIMITES + textes]
+
+
+EXEMPLES = _exemples()
+
+
+# Référence : une recherche par mot-clé
+def ref_matched_keywords(keywords, texte):
+    return [m for m in dict.fromkeys(keywords) if re.search(rf"\b{re.escape(m)}\b", texte)]
+
+
+def ref_finditer(keywords, texte):
+    return sorted(
+        (m, hit.start(), hit.end())
+        for m in dict.fromkeys(keywords)
+        for hit in re.finditer(rf"\b{re.escape(m)}\b", texte)
+    )
+
+
+@pytest.mark.parametrize("keywords", DICTIONNAIRES)
+@pytest.mark.parametrize("texte", EXEMPLES)
+def test_matched_keywords_identique_a_la_reference(keywords, texte):
+    assert KeywordMatcher(keywords).matched_keywords(texte) == ref_matched_keywords(keywords, texte)
+
+
+@pytest.mark.parametrize("keywords", DICTIONNAIRES)
+@pytest.mark.parametrize("texte", EXEMPLES)
+def test_finditer_memes_positions(keywords, texte):
+    assert sorted(KeywordMatcher(keywords).finditer(texte)) == ref_finditer(keywords, texte)
+
+
+def test_dictionnaires_du_pipeline():
+    # section_classifier importe spaCy
+    section_classifier = pytest.importorskip("extractors.section_classifier")
+    assert section_classifier.COMPETENCE_KEYWORDS == COMPETENCE_KEYWORDS
+    assert section_classifier.LANGUES_KEYWORDS == LANGUES_KEYWORDS
+    for texte in EXEMPLES:
+        competences, langues = section_classifier.extraire_competences_langues(texte)
+        attendu = list(dict.fromkeys(
+            m.title() if len(m) > 3 else m.upper() for m in ref_matched_keywords(COMPETENCE_KEYWORDS, texte)
+        ))
+        assert competences == attendu
+        assert langues == [m.capitalize() for m in ref_matched_keywords(LANGUES_KEYWORDS, texte)]
+
+
+def test_dictionnaire_vide():
+    matcher = KeywordMatcher([])
+    assert matcher.finditer("python") == []
+    assert matcher.matched_keywords("python") == []
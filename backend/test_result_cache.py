@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Non-régression du cache de résultats (result_cache).
+
+Un résultat servi depuis le cache doit être identique à celui que renvoie
+l'analyse sans cache (le comportement d'origine de /api/cv/analyze). Les
+résultats de référence sont calculés sur des CV d'exemple par les extracteurs
+qui ne dépendent pas de spaCy.
+"""
+
+import os
+import json
+import random
+import time
+
+import pytest
+
+from benchmarks.corpus import LAYOUTS, LENGTHS, generate_cv
+from extractors.extracteur import extraire_dates, extraire_email, extraire_telephone
+from extractors.heuristic_rules import extract_structured_cv_data
+import result_cache
+from result_cache import ResultCache
+
+
+def analyser_sans_cache(texte):
+    """Résultat JSON d'une analyse, tel que l'API le renvoyait sans cache."""
+    return {
+        "success": True,
+        "contact": {"email": extraire_email(texte), "telephone": extraire_telephone(texte)},
+        "dates": extraire_dates(texte),
+        "structured": extract_structured_cv_data(texte),
+        "json_filename": "cv.json",
+        "pdf_filename": None,
+    }
+
+
+def _exemples():
+    rng = random.Random(13)
+    return [generate_cv(rng, rng.choice(list(LENGTHS)), rng.choice(list(LAYOUTS))) for _ in range(8)]
+
+
+EXEMPLES = _exemples()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(tmp_path / "cache", max_mb=1)
+
+
+@pytest.mark.parametrize("texte", EXEMPLES)
+def test_resultat_en_cache_identique_a_l_analyse(cache, texte):
+    data = texte.encode("utf-8")
+    key = cache.key_for(data)
+    assert cache.get(key) is None
+
+    attendu = analyser_sans_cache(texte)
+    cache.put(key, attendu)
+    assert cache.get(key) == attendu
+    # Une deuxième instance (redémarrage du serveur) relit le même résultat
+    assert ResultCache(cache.directory).get(key) == attendu
+
+
+def test_cle_par_contenu_et_version(cache, monkeypatch):
+    a, b = EXEMPLES[0].encode("utf-8"), EXEMPLES[1].encode("utf-8")
+    assert cache.key_for(a) == cache.key_for(a)
+    assert cache.key_for(a) != cache.key_for(b)
+
+    key = cache.key_for(a)
+    cache.put(key, analyser_sans_cache(EXEMPLES[0]))
+    # Nouveau modèle ou nouveau code : l'ancienne entrée n'est plus adressée
+    monkeypatch.setattr(cache, "_version", "autre-modele:autre-code")
+    assert cache.key_for(a) != key
+
+
+def test_version_couvre_api_et_generation_pdf():
+    sources = {p.relative_to(result_cache.BASE_DIR).as_posix() for p in result_cache.PIPELINE_SOURCES}
+    # Le JSON est assemblé par api.py et le PDF produit par generators/
+    assert {"api.py", "generators/pdf_sopra_profile.py", "extractors/extracteur.py"} <= sources
+    assert "analyser_cv.py" not in sources
+
+
+def test_pdf_conserve(cache, tmp_path):
+    pdf = tmp_path / "cv.pdf"
+    pdf.write_bytes(b"%PDF-1.4 exemple")
+    key = cache.key_for(b"cv")
+    cache.put(key, {"pdf_filename": "cv.pdf"}, pdf_path=pdf)
+    assert cache.get_pdf(key).read_bytes() == pdf.read_bytes()
+    assert cache.get_pdf(cache.key_for(b"autre")) is None
+
+
+def test_taille_bornee_lru(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    resultats = [(cache.key_for(t.encode("utf-8")), analyser_sans_cache(t)) for t in EXEMPLES]
+    tailles = [len(json.dumps(r, ensure_ascii=False).encode("utf-8")) for _, r in resultats]
+    # Place pour les quatre premières entrées seulement
+    cache.max_bytes = sum(tailles[:4])
+
+    debut = time.time() - 1000
+    for i, (key, result) in enumerate(resultats[:4]):
+        cache.put(key, result)
+        # Dates de modification espacées : l'ordre LRU ne dépend pas de la résolution du disque
+        os.utime(cache._path(key, ".json"), (debut + i, debut + i))
+    assert cache.stats()["size_bytes"] == cache.max_bytes
+
+    # La première entrée, relue, devient la plus récente : la deuxième est supprimée
+    premier, deuxieme = resultats[0][0], resultats[1][0]
+    assert cache.get(premier) == resultats[0][1]
+    cache.put(*resultats[4])
+    assert cache.get(premier) == resultats[0][1]
+    assert cache.get(deuxieme) is None
+    assert cache.get(resultats[4][0]) == resultats[4][1]
+
+    assert cache.stats()["size_bytes"] <= int(cache.max_bytes * 0.9)
+    assert sum(f.stat().st_size for f in cache._files()) == cache.stats()["size_bytes"]
+
+
+def test_cache_desactive(monkeypatch):
+    monkeypatch.setattr(result_cache, "CACHE_ENABLED", False)
+    assert result_cache.get_result_cache() is None
+
+
+def test_clear(cache):
+    key = cache.key_for(b"cv")
+    cache.put(key, {"a": 1})
+    cache.clear()
+    assert cache.get(key) is None
+    assert cache.stats()["size_bytes"] == 0
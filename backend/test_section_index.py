@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Non-régression du découpage en sections (section_index).
+
+Sur des CV aux titres classiques, le contenu des sections et les listes
+extraites doivent être ceux des anciens motifs BLOC_*_RX / extract_section_text,
+recopiés ci-dessous comme référence. Les écarts voulus sont testés à part :
+fin des sections en liste à la ligne vide, libellés de compétences retirés,
+TextCat désactivé par défaut.
+"""
+
+import re
+
+import pytest
+
+from extractors import section_index
+from extractors.section_index import SectionIndex
+
+
+# Référence : un motif par section, jusqu'au titre suivant (ou à une ligne en majuscule)
+def ref_extract_section_text(texte, section_names):
+    pattern = r'(?:' + '|'.join(section_names) + r')\s*[:\-\n]+(.+?)(?=\n\s*(?:Formations?|Expériences?|Compétences?|Langues?|Projets?|Certifications?|Loisirs?|Centres?\s+d\'intérêt)\s*[:\-\n]|$)'
+    match = re.search(pattern, texte, re.IGNORECASE | re.DOTALL)
+    return match.group(1).strip() if match else None
+
+
+REF_BLOC_RX = {
+    "langues": re.compile(r"(?is)\bLangues?\b\s*[:\-\n]*(.+?)(?:\n\s*(?:Compétences?|Formations?|Expériences?|Certifications?)\b|$)"),
+    "competences": re.compile(r"(?is)\bCompétences?\b\s*[:\-\n]*(.+?)(?:\n\s*(?:Langues?|Formations?|Expériences?|Certifications?)\b|$)"),
+    "projets": re.compile(r"(?:Projets?|Réalisations?)[:\-\n]+([\s\S]+?)(?=\n[A-ZÉÈ]|$)", re.IGNORECASE),
+    "certifications": re.compile(r"(?:Certifications?|Certif)[\s:]+(.+?)(?=\n[A-ZÉÈ]|$)", re.IGNORECASE),
+    "loisirs": re.compile(r"(?:Loisirs?|Centres d’intérêt)[:\-\s]+(.+?)(?=\n[A-ZÉÈ]|$)", re.IGNORECASE),
+}
+REF_NIVEAUX = {
+    "natif": "C2", "bilingue": "C2", "courant": "C1", "professionnel": "C1",
+    "intermédiaire": "B2", "débutant": "A2", "notions": "A1"
+}
+REF_LANG_LIST = ["français", "francais", "anglais", "espagnol", "allemand", "italien", "portugais", "arabe"]
+
+
+def ref_parse_section_langues(texte):
+    m = REF_BLOC_RX["langues"].search(texte)
+    if not m:
+        return []
+    out = []
+    for it in re.split(r"[•\-\u2022,;/\n]+", m.group(1)):
+        t = it.strip()
+        if not t:
+            continue
+        low = t.lower()
+        if any(l in low for l in REF_LANG_LIST):
+            lvl = next((v for k, v in REF_NIVEAUX.items() if re.search(rf"\b{k}\b", low)), None)
+            out.append(t if not lvl else f"{t} ({lvl})")
+    return list(dict.fromkeys(out))
+
+
+def ref_parse_section_competences(texte):
+    m = REF_BLOC_RX["competences"].search(texte)
+    if not m:
+        return []
+    out = []
+    for it in re.split(r"[•\-\u2022,;/\n]+", m.group(1)):
+        t = re.sub(r"^[\-\•\d]+\s*", "", it.strip().lower())
+        if 2 <= len(t) <= 40 and not re.search(r"\d", t) and not re.search(r"principale", t, re.IGNORECASE):
+            out.append(t.capitalize())
+    return list(dict.fromkeys(out))
+
+
+def ref_parse_section_projets(texte):
+    matches = REF_BLOC_RX["projets"].findall(texte)
+    if not matches:
+        return []
+    items = re.split(r"[•\-\u2022,;\n]+", matches[0])
+    return list(dict.fromkeys(i.strip(" .") for i in items if 3 < len(i.strip()) < 80))
+
+
+def ref_parse_section_certifications(texte):
+    matches = REF_BLOC_RX["certifications"].findall(texte)
+    if not matches:
+        return []
+    items = re.split(r"[•\-\u2022,;\n]+", matches[0])
+    return list(dict.fromkeys(i.strip() for i in items if len(i.strip()) > 3))
+
+
+def ref_parse_section_loisirs(texte):
+    matches = REF_BLOC_RX["loisirs"].findall(texte)
+    if not matches:
+        return []
+    return [i.strip() for i in re.split(r"[,;/]+", matches[0]) if len(i.strip()) > 2]
+
+
+REF_FORMATION_KEYWORDS = ["FORMATION", "FORMATIONS", "ÉTUDES", "ETUDES", "ÉDUCATION", "EDUCATION", "CURSUS",
+                          "PARCOURS ACADÉMIQUE", "PARCOURS SCOLAIRE"]
+REF_EXPERIENCE_KEYWORDS = ["EXPÉRIENCE", "EXPERIENCE", "EXPÉRIENCES", "EXPERIENCES",
+                           "EXPÉRIENCE PROFESSIONNELLE", "EXPÉRIENCES PROFESSIONNELLES",
+                           "PARCOURS PROFESSIONNEL", "PROFESSIONAL EXPERIENCE"]
+
+
+CV_CLASSIQUE = """Jean Dupont
+Développeur Python
+jean.dupont@mail.com
+
+Expériences professionnelles
+2020 - Présent : Développeur Python chez Sopra Steria
+2018 - 2020 : Stage développeur chez Capgemini
+
+Formations
+2015-2018 : Licence Informatique - Université de Lille
+2018-2020 : Master Informatique - Université de Lille
+
+Compétences
+Python, Docker, Kubernetes
+Gestion de projet
+
+Langues
+Français (natif)
+Anglais (courant)
+
+Certifications
+AWS Solutions Architect
+Scrum Master PSM I
+
+Loisirs : Tennis, Lecture, Voyages
+"""
+
+CV_DEUX_POINTS = """Léa Martin
+Formation :
+2016-2019 : BTS SIO - Lycée Gustave Eiffel
+Expérience :
+2019 - 2022 : Technicienne support chez Orange
+Compétences :
+- Linux
+- Réseaux
+- SQL
+Langues :
+- Anglais intermédiaire
+- Espagnol notions
+Projets :
+- Application de gestion de stock
+- Site vitrine associatif
+"""
+
+CV_MAJUSCULES = """PAUL DURAND
+EXPÉRIENCE
+Mars 2019 - Présent : Consultant chez Accenture
+FORMATION
+2014-2019 : Diplôme d'ingénieur - INSA Lyon
+COMPÉTENCES
+Java, Spring, Angular
+LANGUES
+Anglais courant, Allemand débutant
+Projets: Refonte du site interne
+"""
+
+EXEMPLES = [CV_CLASSIQUE, CV_DEUX_POINTS, CV_MAJUSCULES]
+
+# Écarts voulus avec la référence, (CV, section) -> nouvelle liste :
+# - "Gestion de projet" n'ouvre plus une section projets ;
+# - une liste n'est plus coupée à la première ligne commençant par une majuscule.
+ECARTS = {
+    (0, "projets"): [],
+    (0, "certifications"): ["AWS Solutions Architect", "Scrum Master PSM I"],
+    (1, "projets"): ["Application de gestion de stock", "Site vitrine associatif"],
+}
+
+REF_PARSEURS = {
+    "langues": ref_parse_section_langues,
+    "competences": ref_parse_section_competences,
+    "projets": ref_parse_section_projets,
+    "certifications": ref_parse_section_certifications,
+    "loisirs": ref_parse_section_loisirs,
+}
+
+
+@pytest.mark.parametrize("texte", EXEMPLES)
+def test_formation_experience_identiques_a_la_reference(texte):
+    index = SectionIndex(texte)
+    assert index.section_text("formation") == ref_extract_section_text(texte, REF_FORMATION_KEYWORDS)
+    assert index.section_text("experience") == ref_extract_section_text(texte, REF_EXPERIENCE_KEYWORDS)
+
+
+@pytest.mark.parametrize("section", sorted(REF_PARSEURS))
+@pytest.mark.parametrize("i", range(len(EXEMPLES)))
+def test_listes_identiques_a_la_reference(i, section):
+    # Les parseurs de section_classifier importent spaCy
+    section_classifier = pytest.importorskip("extractors.section_classifier")
+    texte = EXEMPLES[i]
+    attendu = ECARTS.get((i, section), REF_PARSEURS[section](texte))
+    assert getattr(section_classifier, f"parse_section_{section}")(texte) == attendu
+
+
+@pytest.mark.parametrize("texte", EXEMPLES)
+def test_parseurs_formation_experience_sur_contexte(texte):
+    section_classifier = pytest.importorskip("extractors.section_classifier")
+    from extractors.cv_context import AnalysisContext
+
+    # Texte brut ou contexte partagé : mêmes limites de sections
+    ctx = AnalysisContext(texte)
+    assert section_classifier.parse_formation_section(ctx) == section_classifier.parse_formation_section(texte)
+    assert section_classifier.parse_experience_section(ctx) == section_classifier.parse_experience_section(texte)
+
+
+def test_liste_terminee_par_ligne_vide():
+    section_classifier = pytest.importorskip("extractors.section_classifier")
+    texte = "Compétences\nPython, Docker\n\nPermis B\nVéhicule personnel\n"
+    assert SectionIndex(texte).section_text("competences") == "Python, Docker"
+    assert section_classifier.parse_section_competences(texte) == ["Python", "Docker"]
+    # La référence absorbait la suite du CV dans les compétences
+    assert ref_parse_section_competences(texte) == ["Python", "Docker", "Permis b", "Véhicule personnel"]
+
+
+def test_section_non_liste_garde_ses_paragraphes():
+    texte = "Expérience\n2020 : Développeur chez Orange\n\n2018 : Stage chez Thales\nFormation\nMaster\n"
+    assert SectionIndex(texte).section_text("experience") == (
+        "2020 : Développeur chez Orange\n\n2018 : Stage chez Thales"
+    )
+
+
+def test_libelles_de_competences_retires():
+    section_classifier = pytest.importorskip("extractors.section_classifier")
+    texte = "Compétences\nLangages : Python, Java\nCI/CD: GitLab CI\nDocker\n"
+    assert section_classifier.parse_section_competences(texte) == ["Python", "Java", "Gitlab ci", "Docker"]
+
+
+def test_textcat_desactive_par_defaut(monkeypatch):
+    assert section_index.SECTION_TEXTCAT is False
+    # Sans CV_SECTION_TEXTCAT=1, le registre de modèles n'est jamais consulté
+    monkeypatch.setattr(section_index, "_registry", lambda: pytest.fail("registre consulté"))
+    index = SectionIndex("ENGAGEMENTS ASSOCIATIFS\nBénévole\nFORMATION\nMaster\n", model="cv_pipeline")
+    assert [h[0] for h in index.headers] == ["formation"]
+    assert index.section_text("formation") == "Master"
+
+
+def test_textcat_ignore_un_modele_sans_textcat(monkeypatch):
+    model_registry = pytest.importorskip("extractors.model_registry")
+    monkeypatch.setattr(section_index, "SECTION_TEXTCAT", True)
+    monkeypatch.setattr(model_registry, "_resolved", {})
+    monkeypatch.setattr(model_registry, "_read_config", lambda source: {"nlp": {"pipeline": ["tok2vec", "ner"]}})
+    # Le modèle n'a pas de TextCat : lu sur config.cfg, il n'est pas chargé
+    monkeypatch.setattr(model_registry, "get_model", lambda *a, **k: pytest.fail("modèle chargé"))
+
+    assert model_registry.has_component("cv_pipeline", section_index.TEXTCAT_PIPES) is False
+    index = SectionIndex("ENGAGEMENTS ASSOCIATIFS\nBénévole\nFORMATION\nMaster\n", model="cv_pipeline")
+    assert [h[0] for h in index.headers] == ["formation"]
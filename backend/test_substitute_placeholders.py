@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Non-régression du remplacement des placeholders DOCX (substitute_placeholders).
+
+Le texte de chaque paragraphe doit être celui que donnait l'ancien
+remplacement clé par clé sur p.text, recopié ci-dessous comme référence ;
+la mise en forme des runs, que l'ancien remplacement perdait, est conservée.
+"""
+
+import copy
+
+import pytest
+
+pytest.importorskip("docx")
+from docx import Document
+
+from generators.generate_sopra_docx import (
+    TEMPLATE_PATH, bullets, classify_competences, format_contact, format_experiences, format_formations,
+    load_template, substitute_placeholders,
+)
+
+
+# Référence : une réécriture de p.text par clé présente
+def ref_substitute(paragraph, mapping):
+    for key, val in mapping.items():
+        if key in paragraph.text:
+            paragraph.text = paragraph.text.replace(key, val if val else "Non renseigné")
+
+
+CV_EXEMPLES = [
+    {
+        "contact": {"nom": "Jean Dupont", "email": "jean.dupont@mail.com", "telephone": "06 12 34 56 78",
+                    "adresse": "12 rue Pierre Bourdan, 75012 Paris"},
+        "titre_profil": "Développeur Python",
+        "competences": ["Python", "Docker", "Gestion de projet"],
+        "langues": ["Anglais (C1)", "Espagnol"],
+        "experiences": [{"poste": "Développeur", "entreprise": "Sopra Steria", "dates": "2020 - Présent",
+                         "description": "API Flask"}],
+        "formations": [{"diplome": "Master Informatique", "etablissement": "Université de Lille", "dates": "2018-2020"}],
+        "certifications": ["AWS Solutions Architect"],
+        "loisirs": ["Tennis", "Lecture"],
+    },
+    {
+        "contact": {"nom": "Léa Martin"},
+        "competences": [],
+        "langues": [],
+        "experiences": [],
+        "formations": [],
+    },
+]
+
+
+def _mapping(cv):
+    contact = cv.get("contact", {})
+    comp_fonct, comp_tech = classify_competences(cv.get("competences", []))
+    return {
+        "{{NOM}}": contact.get("nom") or "Nom Prénom",
+        "{{TITRE_PROFIL}}": cv.get("titre_profil") or "Profil Collaborateur",
+        "{{CONTACT}}": format_contact(contact),
+        "{{EMAIL}}": contact.get("email") or "Non renseigné",
+        "{{TELEPHONE}}": contact.get("telephone") or "",
+        "{{COMP_FONCT}}": bullets(comp_fonct, "Aucune compétence fonctionnelle"),
+        "{{COMP_TECH}}": bullets(comp_tech, "Aucune compétence technique"),
+        "{{COMPETENCES}}": bullets(cv.get("competences", []), "Aucune compétence"),
+        "{{EXPERIENCES}}": format_experiences(cv.get("experiences")),
+        "{{FORMATIONS}}": format_formations(cv.get("formations")),
+        "{{LANGUES}}": bullets(cv.get("langues", []), "Non renseigné"),
+        "{{CERTIFICATIONS}}": bullets(cv.get("certifications", []), "Aucune certification"),
+        "{{LOISIRS}}": bullets(cv.get("loisirs", []), "Non renseigné"),
+    }
+
+
+def _paragraph(doc, *runs):
+    p = doc.add_paragraph()
+    for text, bold in runs:
+        p.add_run(text).bold = bold
+    return p
+
+
+# Paragraphes de test : placeholders entiers, coupés sur plusieurs runs, inconnus
+RUNS_EXEMPLES = [
+    [("Nom : {{NOM}}", False)],
+    [("Contact : ", True), ("{{EMAIL}} / {{TELEPHONE}}", False)],
+    [("{{NO", False), ("M}} - {", True), ("{TITRE_", False), ("PROFIL}}", False), (" fin", True)],
+    [("{{COMPETENCES}}", False), ("{{LANGUES}}", True)],
+    [("{{INCONNU}} et {{EMAIL}}", False)],
+    [("Aucun placeholder", True)],
+    [("{", False), ("{", False), ("EXPERIENCES", True), ("}", False), ("}", False)],
+]
+
+
+@pytest.mark.parametrize("cv", CV_EXEMPLES)
+@pytest.mark.parametrize("runs", RUNS_EXEMPLES)
+def test_texte_identique_a_la_reference(cv, runs):
+    mapping = _mapping(cv)
+    doc = Document()
+    p_new, p_ref = _paragraph(doc, *runs), _paragraph(doc, *runs)
+    remplace = substitute_placeholders(p_new, mapping)
+    ref_substitute(p_ref, mapping)
+    assert p_new.text == p_ref.text
+    assert remplace == (p_ref.text != "".join(t for t, _ in runs))
+
+
+def test_mise_en_forme_des_runs_conservee():
+    doc = Document()
+    p = _paragraph(doc, ("Contact : ", True), ("{{EMAIL}}", False), (" (pro)", True))
+    substitute_placeholders(p, {"{{EMAIL}}": "jean@mail.com"})
+    assert [(r.text, r.bold) for r in p.runs] == [
+        ("Contact : ", True), ("jean@mail.com", False), (" (pro)", True)
+    ]
+
+
+@pytest.mark.parametrize("cv", CV_EXEMPLES)
+def test_template_sopra_identique_a_la_reference(cv):
+    mapping = _mapping(cv)
+    doc, index = load_template(TEMPLATE_PATH)
+    ref = copy.deepcopy(doc)
+
+    for i in index["paragraphs"]:
+        substitute_placeholders(doc.paragraphs[i], mapping)
+        ref_substitute(ref.paragraphs[i], mapping)
+    for t, r, c, i in index["cells"]:
+        substitute_placeholders(doc.tables[t].rows[r].cells[c].paragraphs[i], mapping)
+        ref_substitute(ref.tables[t].rows[r].cells[c].paragraphs[i], mapping)
+
+    assert [p.text for p in doc.paragraphs] == [p.text for p in ref.paragraphs]
+    assert [
+        cell.text for table in doc.tables for row in table.rows for cell in row.cells
+    ] == [
+        cell.text for table in ref.tables for row in table.rows for cell in row.cells
+    ]
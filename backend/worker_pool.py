@@ -0,0 +1,194 @@
+"""
+Pool de processus pour les analyses de CV (mode production multi-cœurs).
+
+Les workers sont créés par un serveur forkserver qui charge les modèles spaCy
+une seule fois (module worker_preload) : ils partagent la mémoire des modèles en
+copie-sur-écriture au lieu de charger chacun leur copie. Chaque worker est
+recyclé après CV_WORKER_MAX_TASKS analyses (limite les fuites mémoire) ; son
+remplaçant part lui aussi du forkserver, jamais d'un fork du serveur Flask
+multi-thread. Sur les plateformes sans forkserver (Windows), les workers sont
+lancés en "spawn" et chargent leurs modèles au démarrage.
+"""
+
+import os
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+WORKER_PROCESSES = int(os.environ.get("CV_WORKER_PROCESSES", "0"))
+MAX_TASKS_PER_WORKER = int(os.environ.get("CV_WORKER_MAX_TASKS", "200"))
+
+# Traitements par lots (sans modèle) : taille du pool et plafond de concurrence par requête
+BATCH_WORKERS = int(os.environ.get("CV_BATCH_WORKERS", str(os.cpu_count() or 1)))
+BATCH_MAX_CONCURRENCY = int(os.environ.get("CV_BATCH_MAX_CONCURRENCY", "64"))
+
+# Modules chargés une fois par le serveur forkserver : les workers en héritent.
+# Pour le pool d'analyse, worker_preload y charge aussi les modèles.
+BATCH_PRELOAD = ["extractors.version_mapper"]
+WORKER_PRELOAD = ["extractors.model_registry", "worker_preload"]
+
+
+def _init_worker():
+    # Sans effet si le forkserver a déjà chargé les modèles (spawn : chargement ici)
+    from extractors.model_registry import warm_up
+    warm_up()
+
+
+def _forkserver_context(preload):
+    """Contexte forkserver (spawn à défaut) dont le serveur importe `preload` au démarrage."""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        # Un seul serveur par processus : la liste du premier pool démarré s'applique
+        ctx.set_forkserver_preload(preload)
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+class WorkerPool:
+    """Processus d'analyse partageant les modèles préchargés par le forkserver."""
+
+    def __init__(self, processes: int = None, max_tasks: int = MAX_TASKS_PER_WORKER):
+        self.processes = processes or os.cpu_count() or 1
+        # Pas de fork direct : le pool recrée ses workers depuis un thread, pendant
+        # que le serveur Flask (threaded=True) tourne, et un verrou tenu par un autre
+        # thread au moment du fork resterait pris pour toujours dans le worker.
+        ctx = _forkserver_context(BATCH_PRELOAD + WORKER_PRELOAD)
+        self.start_method = ctx.get_start_method()
+
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._pool = ctx.Pool(
+            processes=self.processes,
+            initializer=_init_worker,
+            maxtasksperchild=max_tasks or None,
+        )
+        logger.info(
+            f"✓ Pool d'analyse: {self.processes} processus ({self.start_method}), "
+            f"recyclage après {max_tasks or '∞'} tâche(s)"
+        )
+
+    def submit(self, fn: Callable, *args, **kwargs):
+        """Envoie fn(*args, **kwargs) à un worker ; retourne un AsyncResult."""
+        with self._pending_lock:
+            self._pending += 1
+        return self._pool.apply_async(fn, args, kwargs, callback=self._done, error_callback=self._done)
+
+    def _done(self, _):
+        with self._pending_lock:
+            self._pending -= 1
+
+    def stats(self):
+        """Processus et analyses soumises non terminées (en cours ou en file)."""
+        return {"processes": self.processes, "pending": self._pending}
+
+    def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Exécute fn dans un worker et attend son résultat."""
+        return self.submit(fn, *args, **kwargs).get(timeout)
+
+    def imap_unordered(self, fn: Callable, iterable: Iterable, chunksize: int = 1) -> Iterator:
+        """Applique fn à chaque élément ; les résultats arrivent dans l'ordre de fin."""
+        return self._pool.imap_unordered(fn, iterable, chunksize)
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def start_worker_pool(processes: int = None, max_tasks: int = MAX_TASKS_PER_WORKER) -> Optional[WorkerPool]:
+    """
+    Démarre le pool partagé (à appeler au démarrage, avant de servir des requêtes).
+    Sans argument, utilise CV_WORKER_PROCESSES ; 0 laisse les analyses dans le processus courant.
+    """
+    global _pool
+    processes = WORKER_PROCESSES if processes is None else processes
+    if processes <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool(processes, max_tasks)
+    return _pool
+
+
+def get_worker_pool() -> Optional[WorkerPool]:
+    """Pool démarré par start_worker_pool(), ou None (analyse dans le processus courant)."""
+    return _pool
+
+
+def stop_worker_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+# =============================================================================
+# TRAITEMENTS PAR LOTS
+# =============================================================================
+
+_batch_executor = None
+
+
+def _batch_context():
+    # Le pool de lots est créé à la première requête, depuis un thread Flask et
+    # après le chargement des modèles : un fork de ce processus multi-thread peut
+    # se bloquer. Les workers partent donc d'un serveur forkserver (ou spawn),
+    # lancé proprement, sans les modèles spaCy (sauf si le pool d'analyse l'a
+    # démarré avant, avec ses modèles).
+    return _forkserver_context(BATCH_PRELOAD)
+
+
+def get_batch_executor() -> ProcessPoolExecutor:
+    """Pool de processus partagé pour les traitements par lots (créé au premier appel)."""
+    global _batch_executor
+    if _batch_executor is None:
+        with _pool_lock:
+            if _batch_executor is None:
+                _batch_executor = ProcessPoolExecutor(max_workers=BATCH_WORKERS, mp_context=_batch_context())
+    return _batch_executor
+
+
+def iter_completed(fn: Callable, items: Iterable, concurrency: int = None,
+                   executor=None) -> Iterator[Tuple[int, Any]]:
+    """
+    Applique fn à chaque élément dans le pool de lots (ou `executor`) et produit
+    (indice, résultat) dès qu'un élément est terminé. Au plus `concurrency` éléments
+    sont en cours à la fois, et `items` n'est parcouru qu'au fur et à mesure : les lots
+    volumineux ne sont ni chargés ni copiés vers les workers d'un coup.
+    """
+    concurrency = max(1, min(concurrency or 2 * BATCH_WORKERS, BATCH_MAX_CONCURRENCY))
+    executor = executor or get_batch_executor()
+    source = iter(enumerate(items))
+    pending = {}
+
+    def fill():
+        while len(pending) < concurrency:
+            try:
+                index, item = next(source)
+            except StopIteration:
+                return
+            pending[executor.submit(fn, item)] = index
+
+    fill()
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield pending.pop(future), future.result()
+        fill()
+
+
+def map_ordered(fn: Callable, items, concurrency: int = None) -> list:
+    """Comme iter_completed(), mais retourne la liste des résultats dans l'ordre d'entrée."""
+    items = list(items)
+    results = [None] * len(items)
+    for index, result in iter_completed(fn, items, concurrency):
+        results[index] = result
+    return results
@@ -0,0 +1,26 @@
+"""
+Préchargement des modèles dans le serveur forkserver du pool d'analyse.
+
+Importé par le forkserver (WORKER_PRELOAD de worker_pool), jamais par le
+serveur Flask : les modèles y sont chargés une fois, puis partagés en
+copie-sur-écriture par chaque worker créé ensuite, y compris ceux qui
+remplacent un worker recyclé.
+"""
+
+import gc
+import logging
+
+from extractors.model_registry import warm_up
+
+logger = logging.getLogger(__name__)
+
+try:
+    stats = warm_up()
+except Exception as e:
+    # Le forkserver doit rester utilisable : chaque worker chargera ses modèles
+    logger.warning(f"Préchargement des modèles impossible dans le forkserver: {e}")
+else:
+    # Les objets déjà chargés ne sont plus parcourus par le GC : leurs pages
+    # mémoire ne sont pas recopiées dans les workers par simple lecture
+    gc.freeze()
+    logger.info(f"Modèles préchargés dans le forkserver: {', '.join(stats)}")